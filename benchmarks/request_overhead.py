@@ -0,0 +1,48 @@
+"""
+Micro-benchmark of the per-request CPU overhead of :class:`~syncano.connection.Connection`.
+
+Requests are routed to :class:`~syncano.transports.InMemoryTransport`, so no network
+is involved and the numbers show only the time spent inside the library.
+
+Usage::
+
+    PYTHONPATH=. python benchmarks/request_overhead.py [number]
+"""
+import sys
+import timeit
+
+from syncano.connection import Connection
+from syncano.transports import InMemoryTransport, Response
+
+RESPONSE = Response(200, {'id': 1, 'name': 'test-one'})
+PARAMS = {
+    'params': {'page_size': 100, 'query': '{"id": {"_gt": 100}}'},
+    'data': {'name': 'test-one', 'tags': ['a', 'b', 'c'], 'nested': {'a': {'b': [1, 2, 3]}}},
+    'headers': {'X-TEMPLATE-RESPONSE': 'test'},
+}
+
+
+def handler(method_name, url, **params):
+    return RESPONSE
+
+
+def run(number):
+    connections = {
+        'admin': Connection(api_key='api_key', transport=InMemoryTransport(handler)),
+        'user': Connection(api_key='api_key', user_key='user_key', instance_name='test-one',
+                           transport=InMemoryTransport(handler)),
+    }
+
+    for name, connection in sorted(connections.items()):
+        cases = [
+            ('build_params', lambda: connection.build_params(PARAMS)),
+            ('request GET', lambda: connection.request('GET', 'v1.1/instances/test-one/', params=PARAMS['params'])),
+            ('request POST', lambda: connection.request('POST', 'v1.1/instances/', data=PARAMS['data'])),
+        ]
+        for case, func in cases:
+            best = min(timeit.repeat(func, number=number, repeat=5))
+            print('{0:>6} {1:<13} {2:8.2f} us/call'.format(name, case, best / number * 10 ** 6))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
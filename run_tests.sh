@@ -2,7 +2,12 @@
 
 set -e
 
-flake8 .
+# syncano/aio.py uses async syntax, which older interpreters can't parse
+if python -c 'import sys; sys.exit(sys.version_info < (3, 6))'; then
+    flake8 .
+else
+    flake8 --exclude=.svn,CVS,.bzr,.hg,.git,__pycache__,.tox,.eggs,*.egg,syncano/aio.py .
+fi
 isort --recursive --check-only .
 
 coverage run -m unittest discover -p 'test*.py'
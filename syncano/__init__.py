@@ -34,6 +34,7 @@ PASSWORD = os.getenv('SYNCANO_PASSWORD')
 APIKEY = os.getenv('SYNCANO_APIKEY')
 INSTANCE = os.getenv('SYNCANO_INSTANCE')
 PUSH_ENV = os.getenv('SYNCANO_PUSH_ENV', 'production')
+JSON_CODEC = os.getenv('SYNCANO_JSON_CODEC', 'json')
 
 
 def connect(*args, **kwargs):
@@ -61,6 +62,39 @@ def connect(*args, **kwargs):
     :type verify_ssl: boolean
     :param verify_ssl: Verify SSL certificate
 
+    :type transport: :class:`~syncano.transports.BaseTransport`
+    :param transport: HTTP transport, defaults to :class:`~syncano.transports.RequestsTransport`
+
+    :type pool_maxsize: int
+    :param pool_maxsize: Maximum number of connections kept alive per host, defaults to 10;
+        ``pool_connections``, ``pool_block``, ``keep_alive`` and ``idle_timeout``
+        are also accepted, see :class:`~syncano.transports.PooledTransport`
+
+    :type throttle: :class:`~syncano.throttling.ThrottleCoordinator`
+    :param throttle: Coordinates retries of throttled requests, shared by all connections by default
+
+    :type rate_limiter: :class:`~syncano.throttling.RateLimiter`
+    :param rate_limiter: Client-side token bucket limiting requests per API key and instance
+
+    :type concurrency: :class:`~syncano.concurrency.ConcurrencyRegistry`
+    :param concurrency: Adaptive concurrency limits of parallel operations, shared by all connections by default
+
+    :type cache: :class:`~syncano.cache.ResponseCache`
+    :param cache: Opt-in cache of GET responses
+
+    :type validators: :class:`~syncano.cache.ValidatorCache`
+    :param validators: Enables conditional GET requests with ETag / Last-Modified validators
+
+    :type compression: string
+    :param compression: Compresses request bodies larger than ``compression_threshold`` bytes
+        (1024 by default) with ``gzip`` or ``deflate``
+
+    :type multipart_uploads: bool
+    :param multipart_uploads: Sends fields and files of a request in a single streaming multipart request
+
+    :type single_flight: bool
+    :param single_flight: Opt-in sharing of a single network call by concurrent identical GET requests
+
     :rtype: :class:`syncano.models.registry.Registry`
     :return: A models registry
 
@@ -0,0 +1,329 @@
+"""
+Native :mod:`asyncio` support.
+
+This module requires Python 3.6+ and `aiohttp <http://aiohttp.readthedocs.io/>`_,
+it is never imported by the rest of the library unless an
+:class:`~syncano.aio.AsyncConnection` is in use.
+
+Usage::
+
+    import syncano.aio
+    from syncano.models import Object
+
+    async def main():
+        connection = syncano.aio.connect(api_key='', instance_name='')
+
+        obj = await Object.please.get(class_name='books', id=1)
+
+        async for book in Object.please.list(class_name='books'):
+            print(book)
+
+        await Object.please.batch(
+            Object.please.as_batch().delete(class_name='books', id=2),
+            Object.please.as_batch().delete(class_name='books', id=3),
+        )
+
+        await connection.close()
+
+Only :class:`~syncano.models.manager.Manager` terminals which return the result of
+a single API call (``get``, ``detail``, ``delete``, ``update``, ``batch``) and
+iteration (``async for``) are awaitable, model instance methods (``save``, ``reload``, ...)
+still require a blocking :class:`~syncano.connection.Connection`.
+"""
+import asyncio
+
+import syncano
+from syncano import json_codec
+from syncano.connection import Connection, DefaultConnection
+from syncano.exceptions import SyncanoRequestError, SyncanoValueError
+from syncano.models.registry import registry
+from syncano.multipart import encode_field
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+__all__ = ['AsyncConnection', 'connect']
+
+
+class AsyncConnection(Connection):
+    """Connection which sends requests through ``aiohttp`` on the running event loop.
+
+    It accepts the same arguments as :class:`~syncano.connection.Connection` and:
+
+    :ivar limit: Maximum number of simultaneous connections in the ``aiohttp`` pool
+    """
+
+    is_async = True
+
+    # aiohttp.ClientSession needs a running event loop, it is created on first request;
+    session = None
+
+    METHODS = {'get', 'post', 'put', 'patch', 'delete', 'head', 'options'}
+
+    def __init__(self, host=None, **kwargs):
+        if aiohttp is None:
+            raise SyncanoValueError('"aiohttp" is required to use AsyncConnection.')
+
+        self.limit = kwargs.pop('limit', 100)
+        super(AsyncConnection, self).__init__(host, **kwargs)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def get_session(self):
+        """Returns ``aiohttp.ClientSession`` shared by all requests made through this connection."""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    async def close(self):
+        """Closes underlying ``aiohttp`` session."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def request(self, method_name, path, **kwargs):
+        """Awaitable version of :func:`~syncano.connection.Connection.request`."""
+        if not self.is_authenticated():
+            await self.authenticate()
+        return await self.make_request(method_name, path, **kwargs)
+
+    async def make_request(self, method_name, path, **kwargs):
+        """Awaitable version of :func:`~syncano.connection.Connection.make_request`."""
+        priority = kwargs.pop('priority', None)
+        cache_ttl = kwargs.pop('cache_ttl', None)
+        compress = kwargs.pop('compress', None)
+        multipart = kwargs.pop('multipart', None)
+        files = self._pop_request_files(kwargs)
+        params = self.build_params(kwargs)
+
+        self._log_request(method_name, path, params, files)
+
+        if method_name.lower() not in self.METHODS:
+            raise SyncanoValueError('Invalid request method: {0}.'.format(method_name))
+
+        if self._is_multipart(method_name, files, multipart):
+            self._encode_multipart_data(params, files)
+            files = {}
+        else:
+            self._encode_request_data(params)
+
+        url = self.build_url(path)
+        cache_key = self._get_cache_key(method_name, url, params, files)
+        if cache_key is not None:
+            content = self.cache.get(cache_key)
+            if content is not None:
+                return content
+
+        try:
+            status_code, headers, content = await self.send_request(
+                method_name, url, self.compress_params(params, compress), priority)
+        finally:
+            self._invalidate_cache(method_name, url, params)
+        content = self.check_response_content(url, status_code, content)
+
+        if cache_key is not None:
+            self.cache.set(cache_key, url, content, cache_ttl)
+
+        if files:
+            # remove 'data' and 'content-type' to avoid sending JSON body together with files
+            params.pop('data')
+            params['headers'].pop('content-type')
+            params['data'] = self._get_form_data(self._process_apns_cert_files(files))
+
+            if status_code == 201:
+                url = '{}{}/'.format(url, content['id'])
+
+            # second request is needed to upload a file
+            status_code, headers, content = await self.send_request('PATCH', url, params, priority)
+            content = self.check_response_content(url, status_code, content)
+
+        return content
+
+    async def send_request(self, method_name, url, params, priority=None):
+        """Awaitable version of :func:`~syncano.connection.Connection.send_request`,
+        returns ``(status_code, headers, content)`` tuple.
+        """
+        retries = 0
+        while True:
+            if self.rate_limiter is not None:
+                delay = self.rate_limiter.reserve(self.get_rate_limit_key(url), priority)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            delay = self.throttle.reserve(self.api_key)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            status_code, headers, content = await self._send(method_name, url, params)
+
+            if status_code != 429 or retries >= self.throttle.max_retries:  # throttling;
+                return status_code, headers, content
+
+            self.throttle.throttled(self.api_key, float(headers.get('retry-after', 1)))
+            retries += 1
+
+    async def _send(self, method_name, url, params):
+        async with self.get_session().request(method_name, url, **self._get_aiohttp_params(params)) as response:
+            body = await response.read()
+            return response.status, response.headers, self._decode_content(body)
+
+    @classmethod
+    def _get_aiohttp_params(cls, params):
+        aiohttp_params = {
+            'headers': params['headers'],
+            'timeout': aiohttp.ClientTimeout(total=params['timeout']),
+        }
+
+        if not params['verify']:
+            aiohttp_params['ssl'] = False
+
+        if 'data' in params:
+            aiohttp_params['data'] = params['data']
+
+        if params.get('params'):
+            # aiohttp does not accept None and bool values in query string, requests skips None values;
+            aiohttp_params['params'] = {k: str(v) for k, v in params['params'].items() if v is not None}
+
+        return aiohttp_params
+
+    @classmethod
+    def _decode_content(cls, body):
+        try:
+            return json_codec.loads(body)
+        except ValueError:
+            return body.decode('utf-8')
+
+    def _encode_multipart_data(self, params, files):
+        # aiohttp sets content-type with the boundary of the form
+        params['headers'].pop('content-type', None)
+        params['data'] = self._get_form_data(self._process_apns_cert_files(files), params.get('data'))
+
+    @classmethod
+    def _get_form_data(cls, files, fields=None):
+        form_data = aiohttp.FormData()
+        for name, value in (fields or {}).items():
+            if value is not None:
+                form_data.add_field(name, encode_field(value))
+        for name, value in files.items():
+            if isinstance(value, tuple):  # (filename, file, content_type, headers)
+                form_data.add_field(name, value[1], filename=value[0], content_type=value[2])
+            else:
+                form_data.add_field(name, value, filename=getattr(value, 'name', name))
+        return form_data
+
+    async def authenticate(self, **kwargs):
+        """Awaitable version of :func:`~syncano.connection.Connection.authenticate`."""
+        if self.is_authenticated():
+            msg = 'Connection already authenticated: {}'
+        else:
+            msg = 'Authentication successful: {}'
+            self.logger.debug('Authenticating')
+            await self.auth_method(**kwargs)
+        key = self.auth_key
+        self.logger.debug(msg.format(key))
+        return key
+
+    async def authenticate_admin(self, **kwargs):
+        request_args = self._get_admin_auth_args(kwargs)
+        response = await self.make_request('POST', self.AUTH_SUFFIX, data=request_args)
+        self.api_key = response.get('account_key')
+        return self.api_key
+
+    async def authenticate_user(self, **kwargs):
+        request_args, headers = self._get_user_auth_args(kwargs)
+        response = await self.make_request('POST', self.AUTH_SUFFIX, data=request_args, headers=headers)
+        self.user_key = response.get('user_key')
+        return self.user_key
+
+    async def register(self, email, password, first_name=None, last_name=None, invitation_key=None):
+        register_data = {
+            'email': email,
+            'password': password,
+        }
+        for name, value in zip(['first_name', 'last_name', 'invitation_key'],
+                               [first_name, last_name, invitation_key]):
+            if value:
+                register_data.update({name: value})
+        response = await self.make_request('POST', self.REGISTER_SUFFIX, data=register_data)
+
+        self.api_key = response['account_key']
+        return self.api_key
+
+
+def connect(*args, **kwargs):
+    """
+    Asynchronous counterpart of :func:`syncano.connect`, opens a default
+    :class:`~syncano.aio.AsyncConnection` so all managers become awaitable.
+
+    :rtype: :class:`~syncano.aio.AsyncConnection`
+    :return: A connection which should be closed with ``await connection.close()``
+    """
+    registry.set_default_connection(DefaultConnection(connection_class=AsyncConnection))
+    connection = registry.connection.open(*args, **kwargs)
+    instance = kwargs.get('instance_name', syncano.INSTANCE)
+
+    if instance is not None:
+        registry.set_used_instance(instance)
+    return connection
+
+
+async def manager_request(manager, method, path, **request):
+    """Awaitable counterpart of :func:`~syncano.models.manager.Manager.request`."""
+    try:
+        response = await manager.connection.request(method, path, **request)
+    except SyncanoRequestError as e:
+        manager._handle_request_error(e, path)
+        raise
+
+    return manager._process_response(response)
+
+
+async def manager_batch(manager, meta, requests):
+    """Awaitable counterpart of :func:`~syncano.models.manager.Manager.batch`,
+    chunks of a large batch are sent concurrently.
+    """
+    chunks = [requests[offset:offset + manager.BATCH_SIZE] for offset in range(0, len(requests), manager.BATCH_SIZE)]
+    if len(chunks) == 1:  # errors of a single batch request are raised as they are
+        return manager._populate_batch_response(meta, await manager._send_batch_request(chunks[0]))
+
+    responses = await asyncio.gather(*[manager._send_batch_request(chunk) for chunk in chunks],
+                                     return_exceptions=True)
+    response = []
+    for chunk, chunk_response in zip(chunks, responses):
+        if isinstance(chunk_response, SyncanoRequestError):
+            chunk_response = [{'code': chunk_response.status_code, 'content': {'detail': chunk_response.reason}}
+                              for _ in chunk]
+        elif isinstance(chunk_response, Exception):
+            raise chunk_response
+        response.extend(chunk_response)
+    return manager._populate_batch_response(meta, response)
+
+
+async def manager_iterator(manager):
+    """Asynchronous counterpart of :func:`~syncano.models.manager.Manager.iterator`."""
+    response = manager._initial_response or await manager.request()
+    results = 0
+    while True:
+        if manager._template:
+            yield response
+            break
+        objects = response.get('objects')
+        next_url = response.get('next')
+
+        for o in objects:
+            if manager._limit and results >= manager._limit:
+                break
+
+            results += 1
+            yield manager.serialize(o)
+
+        if not objects or not next_url or (manager._limit and results >= manager._limit):
+            break
+
+        response = await manager.request(path=next_url)
@@ -0,0 +1,242 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import six
+from syncano import json_codec
+
+if six.PY3:
+    from urllib.parse import urlsplit
+else:
+    from urlparse import urlsplit
+
+__all__ = ['ResponseCache', 'MemoryCache', 'SqliteCache', 'ValidatorCache']
+
+
+def get_ancestor_paths(path):
+    """Returns paths of collections which contain the given resource path, e.g.
+    ``/v1.1/instances/test/classes/`` and ``/v1.1/instances/test/`` for ``/v1.1/instances/test/classes/books/``.
+    """
+    parts = path.strip('/').split('/')
+    return ['/{0}/'.format('/'.join(parts[:i])) for i in range(1, len(parts))]
+
+
+class MemoryCache(object):
+    """LRU cache of serialized responses kept in memory.
+
+    :ivar max_entries: Maximum number of entries
+    :ivar max_bytes: Maximum total size of entries, unlimited by default
+    """
+
+    def __init__(self, max_entries=1000, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, path, value = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                return None
+
+            # move entry to the end, as the most recently used
+            del self._entries[key]
+            self._entries[key] = entry
+            return value
+
+    def set(self, key, path, value, expires_at):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (expires_at, path, value)
+            self.size += len(value)
+
+            while self._entries and (len(self._entries) > self.max_entries or
+                                     self.max_bytes is not None and self.size > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, path):
+        ancestors = set(get_ancestor_paths(path))
+        with self._lock:
+            for key, (_, entry_path, _) in list(six.iteritems(self._entries)):
+                if entry_path.startswith(path) or entry_path in ancestors:
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key):
+        self.size -= len(self._entries.pop(key)[2])
+
+
+class SqliteCache(object):
+    """Cache of serialized responses kept in a sqlite database, which survives restarts
+    and can be shared by many processes.
+
+    :ivar filename: Database file path
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(filename, check_same_thread=False, isolation_level=None)
+        self._db.execute('CREATE TABLE IF NOT EXISTS responses '
+                         '(key TEXT PRIMARY KEY, path TEXT, value TEXT, expires_at REAL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_path ON responses (path)')
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute('SELECT value, expires_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= time.time():
+                self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                return None
+            return row[0]
+
+    def set(self, key, path, value, expires_at):
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO responses (key, path, value, expires_at) VALUES (?, ?, ?, ?)',
+                             (key, path, value, expires_at))
+
+    def invalidate(self, path):
+        ancestors = get_ancestor_paths(path)
+        with self._lock:
+            self._db.execute(
+                'DELETE FROM responses WHERE substr(path, 1, ?) = ? OR path IN ({0})'.format(
+                    ', '.join('?' * len(ancestors)) or "''"),
+                [len(path), path] + ancestors
+            )
+
+    def clear(self):
+        with self._lock:
+            self._db.execute('DELETE FROM responses')
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class ResponseCache(object):
+    """Opt-in cache of successful GET responses, keyed by URL, query params and auth headers.
+
+    Entries live in an in-memory LRU tier and, optionally, in a disk tier.
+    Any other request sent by a connection using the cache invalidates cached responses
+    of the same resource path, its sub-resources and the collections it belongs to.
+    Batch requests invalidate paths of all their write requests.
+
+    TTL can be overridden per model with ``cache_ttl`` option of the model ``Meta``
+    (``Class._meta.cache_ttl = 600``) or per request with ``cache_ttl`` argument,
+    ``0`` disables caching.
+
+    Usage::
+
+        cache = ResponseCache(ttl=30, max_entries=5000, disk=SqliteCache('/tmp/syncano.db'))
+        connection = syncano.connect(api_key='', cache=cache)
+
+    :ivar ttl: Default time to live of entries in seconds
+    :ivar memory: :class:`~syncano.cache.MemoryCache` tier
+    :ivar disk: Optional :class:`~syncano.cache.SqliteCache` tier
+    """
+
+    def __init__(self, ttl=60, max_entries=1000, max_bytes=None, disk=None):
+        self.ttl = ttl
+        self.memory = MemoryCache(max_entries=max_entries, max_bytes=max_bytes)
+        self.disk = disk
+
+    @classmethod
+    def get_key(cls, method_name, url, params):
+        """Returns cache key of the request, based on its method, URL, query params, body and headers."""
+        key = json.dumps([method_name.upper(), url, params.get('params'), params.get('data'), params.get('headers')],
+                         sort_keys=True, default=str)
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Returns cached content or ``None``."""
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+
+        if value is None:
+            return None
+        return json_codec.loads(value)
+
+    def set(self, key, url, content, ttl=None):
+        """Caches content of the response for ``ttl`` seconds."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        path = urlsplit(url).path
+        value = json_codec.dumps(content)
+        expires_at = time.time() + ttl
+        self.memory.set(key, path, value, expires_at)
+        if self.disk is not None:
+            self.disk.set(key, path, value, expires_at)
+
+    def invalidate(self, url):
+        """Drops cached responses of the resource, its sub-resources and parent collections."""
+        path = urlsplit(url).path
+        if not path.endswith('/'):
+            path += '/'
+
+        self.memory.invalidate(path)
+        if self.disk is not None:
+            self.disk.invalidate(path)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+
+class ValidatorCache(object):
+    """LRU store of ``ETag`` and ``Last-Modified`` validators of GET responses together with their bodies,
+    used by :class:`~syncano.connection.Connection` to send conditional requests and serve
+    ``304 Not Modified`` responses from the stored body.
+
+    Usage::
+
+        connection = syncano.connect(api_key='', validators=ValidatorCache(max_entries=500))
+
+    :ivar max_entries: Maximum number of entries
+    """
+
+    get_key = ResponseCache.get_key
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Returns ``(etag, last_modified, body)`` tuple or ``None``."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+            return entry
+
+    def set(self, key, etag, last_modified, body):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (etag, last_modified, body)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
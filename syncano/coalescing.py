@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from functools import wraps
+
+from syncano.exceptions import SyncanoRequestError, SyncanoValueError
+
+__all__ = ['GetCoalescer']
+
+
+class _PendingGet(object):
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class GetCoalescer(object):
+    """Collects GET requests of single objects issued by concurrent threads and sends them
+    as one batch request, DataLoader-style.
+
+    The first request of a window waits up to ``window`` seconds for other requests
+    of the same instance; the window is sent earlier as soon as ``max_size`` distinct paths are pending.
+    Requests of the same path within a window are sent once, but every caller gets its own copy
+    of the response, or the :class:`~syncano.exceptions.SyncanoRequestError` of its sub-request.
+    A window with a single path is sent as a regular GET request.
+
+    Coalescers are created by :meth:`~syncano.connection.Connection.coalesce`, which makes
+    ``get`` calls of managers using the connection go through them, in threads which joined its scope::
+
+        with connection.coalesce() as coalescer:
+            pool.map(coalescer.wrap(lambda pk: Object.please.get(class_name='books', id=pk)), ids)
+
+    :ivar connection: :class:`~syncano.connection.Connection` used to send requests
+    :ivar window: Maximum time in seconds a request waits for others
+    :ivar max_size: Maximum number of paths in a single batch request
+    """
+
+    def __init__(self, connection, window=0.005, max_size=50):
+        if not 1 <= max_size <= 50:
+            raise SyncanoValueError('Coalesced batch size needs to be between 1 and 50.')
+
+        self.connection = connection
+        self.window = window
+        self.max_size = max_size
+        self._windows = {}
+        self._condition = threading.Condition()
+
+    def wrap(self, func):
+        """Returns ``func`` wrapped to run within the scope of this coalescer in any thread, e.g. of a pool."""
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.connection.coalesce(coalescer=self):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def get(self, batch_path, path):
+        """Returns content of a GET request of ``path``, sent within a batch request of ``batch_path``.
+
+        :type batch_path: string
+        :param batch_path: Batch endpoint of the instance the path belongs to
+
+        :type path: string
+        :param path: Path of the requested object
+
+        :rtype: dict
+        """
+        ready = None
+        with self._condition:
+            pending = self._windows.setdefault(batch_path, OrderedDict())
+            opened = not pending
+            entry = pending.get(path)
+            if entry is None:
+                entry = pending[path] = _PendingGet()
+
+            if len(pending) >= self.max_size:
+                ready = self._close_window(batch_path)
+            elif opened:
+                deadline = time.time() + self.window
+                while self._windows.get(batch_path) is pending and time.time() < deadline:
+                    self._condition.wait(deadline - time.time())
+                if self._windows.get(batch_path) is pending:
+                    ready = self._close_window(batch_path)
+
+        if ready is not None:
+            self._dispatch(batch_path, ready)
+
+        entry.event.wait()
+        if entry.error is not None:
+            raise entry.error
+        return deepcopy(entry.response)
+
+    def _close_window(self, batch_path):
+        pending = self._windows.pop(batch_path)
+        self._condition.notify_all()
+        return pending
+
+    def _dispatch(self, batch_path, pending):
+        entries = list(pending.values())
+        try:
+            if len(pending) == 1:
+                path = next(iter(pending))
+                responses = [{'code': 200, 'content': self.connection.request('GET', path)}]
+            else:
+                requests = [{'method': 'GET', 'path': path} for path in pending]
+                responses = self.connection.request('POST', batch_path, data={'requests': requests})
+
+            for entry, response in zip(entries, responses):
+                if response['code'] == 200:
+                    entry.response = response['content']
+                else:
+                    entry.error = SyncanoRequestError(response['code'], response.get('content') or '')
+        except Exception as e:
+            for entry in entries:
+                entry.error = e
+        finally:
+            for entry in entries:
+                if entry.response is None and entry.error is None:
+                    entry.error = SyncanoValueError('Batch response is missing a result.')
+                entry.event.set()
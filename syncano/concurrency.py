@@ -0,0 +1,315 @@
+import threading
+import time
+from contextlib import contextmanager
+from copy import deepcopy
+
+from six.moves import queue
+from syncano.exceptions import SyncanoValueError
+
+__all__ = ['AdaptiveConcurrency', 'ConcurrencyRegistry', 'SingleFlight', 'default_concurrency']
+
+
+_DONE = object()
+
+
+def is_overload_error(error):
+    """Checks if error means that the server is overloaded: throttling, server errors and network failures."""
+    status_code = getattr(error, 'status_code', None)
+    if status_code is not None:
+        return status_code == 429 or status_code >= 500
+    return isinstance(error, (IOError, OSError))
+
+
+class AdaptiveConcurrency(object):
+    """Limits number of requests in flight and tunes the limit with AIMD
+    (additive increase, multiplicative decrease).
+
+    Every successful request raises the limit by ``increase / limit``, so about ``increase``
+    per round of requests, while latency stays under ``latency_tolerance`` times its moving average.
+    Throttled requests, server errors, network failures and latency spikes multiply the limit
+    by ``decrease``, at most once per round, as requests started before a cut don't cut it again.
+
+    Usage::
+
+        controller = connection.get_concurrency_controller('my-instance')
+
+        with controller.slot():
+            connection.request('GET', path)
+
+        for index, result in controller.imap(upload, files):
+            ...
+
+    :ivar initial: Initial limit
+    :ivar minimum: Lower bound of the limit
+    :ivar maximum: Upper bound of the limit
+    :ivar increase: Additive increase per round
+    :ivar decrease: Multiplicative decrease factor
+    :ivar latency_tolerance: Latency to average latency ratio treated as a spike
+    :ivar smoothing: Weight of the newest sample in the moving average of latency
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=32, increase=1, decrease=0.5,
+                 latency_tolerance=2.0, smoothing=0.2):
+        if not 1 <= minimum <= initial <= maximum:
+            raise SyncanoValueError('Concurrency limits need to satisfy 1 <= minimum <= initial <= maximum.')
+        if not 0 < decrease < 1:
+            raise SyncanoValueError('Decrease factor needs to be between 0 and 1.')
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+
+        self.latency = None
+        self.in_flight = 0
+        self._limit = float(initial)
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+        # worker threads of imap are kept for later calls, so are their transports and connection pools
+        self._tasks = queue.Queue()
+        self._idle_workers = 0
+        self._workers_lock = threading.Lock()
+
+    @property
+    def limit(self):
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    def acquire(self):
+        """Blocks until a request can be sent.
+
+        :rtype: float
+        :return: Start time, to be passed to :meth:`release`
+        """
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+        return time.time()
+
+    def release(self, started_at, failed=False):
+        """Frees the slot taken by :meth:`acquire` and adjusts the limit.
+
+        :type started_at: float
+        :param started_at: Value returned by :meth:`acquire`
+
+        :type failed: bool
+        :param failed: ``True`` if the request failed because of server overload
+        """
+        now = time.time()
+        latency = now - started_at
+
+        with self._condition:
+            self.in_flight -= 1
+
+            spike = self.latency is not None and latency > self.latency * self.latency_tolerance
+            if not failed:
+                if self.latency is None:
+                    self.latency = latency
+                else:
+                    self.latency += self.smoothing * (latency - self.latency)
+
+            if failed or spike:
+                if started_at >= self._last_decrease:
+                    self._limit = max(self.minimum, self._limit * self.decrease)
+                    self._last_decrease = now
+            else:
+                self._limit = min(self.maximum, self._limit + float(self.increase) / self._limit)
+
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """Context manager which holds a slot for the duration of a request."""
+        started_at = self.acquire()
+        try:
+            yield
+        except Exception as e:
+            self.release(started_at, failed=is_overload_error(e))
+            raise
+        self.release(started_at)
+
+    def imap(self, func, items, ordered=True):
+        """Calls ``func`` for every item in worker threads, keeping at most ``limit`` calls in flight.
+        Workers are taken from threads of the controller, which are reused by later calls.
+
+        :type ordered: bool
+        :param ordered: Yield results in order of items, otherwise as soon as they are ready
+
+        :rtype: generator
+        :return: ``(index, result)`` tuples; the first exception raised by ``func`` stops the workers
+            and is re-raised
+        """
+        items = enumerate(items)
+        items_lock = threading.Lock()
+        results = queue.Queue()
+        stop = threading.Event()
+
+        running = 0
+        exhausted = False
+        buffered = {}
+        next_index = 0
+        try:
+            while True:
+                # workers are added as the limit grows, until any of them runs out of items
+                while not exhausted and running < self.limit:
+                    self._submit(self._imap_worker, func, items, items_lock, results, stop)
+                    running += 1
+                if not running:
+                    return
+
+                entry = results.get()
+                if entry is _DONE:
+                    running -= 1
+                    exhausted = True
+                    continue
+
+                index, result, error = entry
+                if error is not None:
+                    raise error
+
+                if not ordered:
+                    yield index, result
+                    continue
+
+                buffered[index] = result
+                while next_index in buffered:
+                    yield next_index, buffered.pop(next_index)
+                    next_index += 1
+        finally:
+            stop.set()
+
+    def _imap_worker(self, func, items, items_lock, results, stop):
+        try:
+            while not stop.is_set():
+                with items_lock:
+                    try:
+                        index, item = next(items, (None, None))
+                    except Exception as e:  # items can be a generator, e.g. of batch chunks
+                        results.put((None, None, e))
+                        return
+                if index is None:
+                    return
+                try:
+                    with self.slot():
+                        result = func(item)
+                except Exception as e:
+                    results.put((index, None, e))
+                else:
+                    results.put((index, result, None))
+        finally:
+            results.put(_DONE)
+
+    def _submit(self, func, *args):
+        with self._workers_lock:
+            if self._idle_workers:
+                self._idle_workers -= 1
+            else:  # every task gets a worker, so nested calls can't wait for each other
+                thread = threading.Thread(target=self._worker)
+                thread.daemon = True
+                thread.start()
+        self._tasks.put((func, args))
+
+    def _worker(self):
+        while True:
+            func, args = self._tasks.get()
+            func(*args)
+            with self._workers_lock:
+                self._idle_workers += 1
+
+
+class ConcurrencyRegistry(object):
+    """Keeps one :class:`~syncano.concurrency.AdaptiveConcurrency` per key, e.g. per instance,
+    so all parallel operations on the same instance share and tune the same limit.
+
+    :ivar options: Arguments of created controllers
+    """
+
+    def __init__(self, **options):
+        self.options = options
+        self._lock = threading.Lock()
+        self._controllers = {}
+
+    def get(self, key):
+        """Returns controller of the given key, creates it if needed.
+
+        :rtype: :class:`~syncano.concurrency.AdaptiveConcurrency`
+        """
+        with self._lock:
+            controller = self._controllers.get(key)
+            if controller is None:
+                controller = self._controllers[key] = AdaptiveConcurrency(**self.options)
+            return controller
+
+
+class _Flight(object):
+
+    def __init__(self):
+        # created by the first follower, most flights have none
+        self.event = None
+        self.followers = 0
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Shares a single call among concurrent calls of the same key, e.g. identical GET requests
+    sent by many threads at the same moment, so only the first one hits the network.
+
+    Calls made while the first one is in flight wait for it and get their own deep copy of its result,
+    or its exception; calls made after it finished start a new flight.
+
+    Usage::
+
+        flights = SingleFlight()
+        content = flights.do(key, partial(connection.request, 'GET', path))
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def do(self, key, func):
+        """Calls ``func``, unless a call of the same ``key`` is in flight, and returns its result."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.followers += 1
+                if flight.event is None:
+                    flight.event = threading.Event()
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return deepcopy(flight.result)
+
+        try:
+            result = func()
+        except BaseException as e:
+            self._land(key, flight, error=e)
+            raise
+        self._land(key, flight, result=result)
+        return result
+
+    def _land(self, key, flight, result=None, error=None):
+        with self._lock:
+            del self._flights[key]
+
+        # no one can join the flight anymore, followers get copies of a copy, which the leader can't change
+        if flight.event is None:
+            return
+        if error is None:
+            flight.result = deepcopy(result)
+        flight.error = error
+        flight.event.set()
+
+
+# Shared by all connections of the process, unless other registry is passed to the connection;
+default_concurrency = ConcurrencyRegistry()
@@ -1,11 +1,20 @@
 import json
-import time
-from copy import deepcopy
+import os
+import threading
+import weakref
+import zlib
+from contextlib import contextmanager
+from functools import partial
 
-import requests
 import six
 import syncano
+from syncano import json_codec
+from syncano.coalescing import GetCoalescer
+from syncano.concurrency import SingleFlight, default_concurrency
 from syncano.exceptions import RevisionMismatchException, SyncanoRequestError, SyncanoValueError
+from syncano.multipart import MultipartEncoder
+from syncano.throttling import default_throttle
+from syncano.transports import BaseTransport, RequestsTransport
 
 if six.PY3:
     from urllib.parse import urljoin
@@ -32,10 +41,14 @@ def is_server_error(code):
 
 
 class DefaultConnection(object):
-    """Singleton class which holds default connection."""
+    """Singleton class which holds default connection.
 
-    def __init__(self):
+    :ivar connection_class: Class used to open connections, defaults to :class:`~syncano.connection.Connection`
+    """
+
+    def __init__(self, connection_class=None):
         self._connection = None
+        self.connection_class = connection_class
 
     def __call__(self):
         if not self._connection:
@@ -43,7 +56,8 @@ class DefaultConnection(object):
         return self._connection
 
     def open(self, *args, **kwargs):
-        connection = Connection(*args, **kwargs)
+        connection_class = self.connection_class or Connection
+        connection = connection_class(*args, **kwargs)
         if not self._connection:
             self._connection = connection
         return connection
@@ -61,10 +75,40 @@ class Connection(object):
     :ivar logger: Python logger instance
     :ivar timeout: Default request timeout
     :ivar verify_ssl: Verify SSL certificate
+    :ivar transport: :class:`~syncano.transports.BaseTransport` which sends HTTP requests
+    :ivar throttle: :class:`~syncano.throttling.ThrottleCoordinator` which handles throttled responses,
+        by default one coordinator is shared by all connections of the process
+    :ivar rate_limiter: Optional :class:`~syncano.throttling.RateLimiter` which keeps requests
+        under a client-side limit per API key and instance
+    :ivar concurrency: :class:`~syncano.concurrency.ConcurrencyRegistry` of adaptive concurrency
+        limits used by parallel operations, by default one registry is shared by all connections of the process
+    :ivar cache: Optional :class:`~syncano.cache.ResponseCache` of GET responses
+    :ivar validators: Optional :class:`~syncano.cache.ValidatorCache`; if set, GET requests are sent
+        with ``If-None-Match`` / ``If-Modified-Since`` headers and ``304`` responses are served from it
+    :ivar compression: Opt-in compression of request bodies, ``gzip`` or ``deflate``
+    :ivar compression_threshold: Minimal size in bytes of compressed request bodies
+    :ivar multipart_uploads: Send fields and files of a request in a single streaming ``multipart/form-data``
+        request, instead of a JSON request followed by a ``PATCH`` with the files
+    :ivar single_flight: Optional :class:`~syncano.concurrency.SingleFlight` which shares concurrent
+        identical GET requests, enabled with ``single_flight=True`` argument
+    :ivar coalescer: :class:`~syncano.coalescing.GetCoalescer` of the :meth:`coalesce` scope
+        active in the current thread
+
+    ``transport`` argument accepts either a :class:`~syncano.transports.BaseTransport` instance,
+    which is shared as it is, or a callable returning one (e.g. a transport class). Transports
+    built by a callable (the default one included) are kept per thread and rebuilt after ``os.fork()``,
+    so a single connection can be used safely by many threads and pre-forked worker processes.
+
+    Connection pool of the default transport can be tuned with ``pool_connections``,
+    ``pool_maxsize``, ``pool_block``, ``keep_alive`` and ``idle_timeout`` arguments,
+    see :class:`~syncano.transports.PooledTransport`.
     """
 
     CONTENT_TYPE = 'application/json'
 
+    # Tells managers whether ``request`` returns an awaitable, see :mod:`syncano.aio`
+    is_async = False
+
     AUTH_SUFFIX = 'v1.1/account/auth'
     ACCOUNT_SUFFIX = 'v1.1/account/'
     SOCIAL_AUTH_SUFFIX = AUTH_SUFFIX + '/{social_backend}/'
@@ -89,12 +133,40 @@ class Connection(object):
     SOCIAL_LOGIN_PARAMS = {'token',
                            'social_backend'}
 
+    CONTEXT_PARAMS = LOGIN_PARAMS.union(ALT_LOGIN_PARAMS,
+                                        USER_LOGIN_PARAMS,
+                                        USER_ALT_LOGIN_PARAMS,
+                                        SOCIAL_LOGIN_PARAMS)
+
+    # wbits of zlib compressors producing given content-encoding
+    COMPRESSION_WBITS = {'gzip': 16 + zlib.MAX_WBITS,
+                         'deflate': zlib.MAX_WBITS}
+
+    POOL_PARAMS = {'pool_connections',
+                   'pool_maxsize',
+                   'pool_block',
+                   'keep_alive',
+                   'idle_timeout'}
+
     def __init__(self, host=None, **kwargs):
         self.host = host or syncano.API_ROOT
         self.logger = kwargs.get('logger', syncano.logger)
         self.timeout = kwargs.get('timeout', 30)
         # We don't need to check SSL cert in DEBUG mode
         self.verify_ssl = kwargs.pop('verify_ssl', True)
+        self.throttle = kwargs.get('throttle') or default_throttle
+        self.rate_limiter = kwargs.get('rate_limiter')
+        self.concurrency = kwargs.get('concurrency') or default_concurrency
+        self.cache = kwargs.get('cache')
+        self.validators = kwargs.get('validators')
+        self.compression = kwargs.get('compression')
+        self.compression_threshold = kwargs.get('compression_threshold', 1024)
+        if self.compression is not None and self.compression not in self.COMPRESSION_WBITS:
+            raise SyncanoValueError('Unsupported compression: {0}.'.format(self.compression))
+        self.multipart_uploads = kwargs.get('multipart_uploads', False)
+        self.single_flight = SingleFlight() if kwargs.get('single_flight') else None
+        # scopes of ``coalesce`` are per thread, worker threads join them explicitly
+        self._coalescing = threading.local()
 
         self._init_login_params(kwargs)
 
@@ -106,13 +178,82 @@ class Connection(object):
                 self.AUTH_SUFFIX = self.SOCIAL_AUTH_SUFFIX.format(social_backend=self.social_backend)
             self.auth_method = self.authenticate_admin
 
-        self.session = requests.Session()
+        self.transport = kwargs.get('transport') or partial(
+            RequestsTransport,
+            **{k: v for k, v in six.iteritems(kwargs) if k in self.POOL_PARAMS}
+        )
+
+    @property
+    def transport(self):
+        if self._shared_transport is not None:
+            return self._shared_transport
+
+        pid = os.getpid()
+        if pid != self._pid:
+            # Forked process: sockets inherited from the parent can't be reused,
+            # they are dropped without closing them as it would affect the parent.
+            self._reset_transports()
+
+        transport = getattr(self._local, 'transport', None)
+        if transport is None:
+            transport = self._transport_factory()
+            self._local.transport = transport
+            with self._transports_lock:
+                self._transports.add(transport)
+        return transport
+
+    @transport.setter
+    def transport(self, value):
+        if isinstance(value, BaseTransport):
+            self._shared_transport = value
+            self._transport_factory = None
+        else:
+            self._shared_transport = None
+            self._transport_factory = value
+        self._reset_transports()
+
+    def _reset_transports(self):
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._transports_lock = threading.Lock()
+        self._transports = weakref.WeakSet()
+
+    def get_transports(self):
+        """Returns all live transports of this connection, one per thread which used it.
+
+        :rtype: list
+        """
+        if self._shared_transport is not None:
+            return [self._shared_transport]
+
+        with self._transports_lock:
+            return list(self._transports)
+
+    @property
+    def session(self):
+        """``requests.Session`` of the current thread, ``None`` for transports other than the default one."""
+        return getattr(self.transport, 'session', None)
+
+    def pool_stats(self):
+        """Reports connection pool utilisation of all transports,
+        see :func:`~syncano.transports.BaseTransport.pool_stats`.
+
+        :rtype: list
+        """
+        stats = []
+        for transport in self.get_transports():
+            stats.extend(transport.pool_stats())
+        return stats
+
+    def close(self):
+        """Closes connection pools of all transports."""
+        for transport in self.get_transports():
+            transport.close()
+        if self._shared_transport is None:
+            self._reset_transports()
 
     def _init_login_params(self, login_kwargs):
-        for param in self.LOGIN_PARAMS.union(self.ALT_LOGIN_PARAMS,
-                                             self.USER_LOGIN_PARAMS,
-                                             self.USER_ALT_LOGIN_PARAMS,
-                                             self.SOCIAL_LOGIN_PARAMS):
+        for param in self.CONTEXT_PARAMS:
             def_name = param.replace('_', '').upper()
             value = login_kwargs.get(param, getattr(syncano, def_name, None))
             setattr(self, param, value)
@@ -142,6 +283,45 @@ class Connection(object):
             return self.user_key
         return self.api_key
 
+    def __setattr__(self, name, value):
+        super(Connection, self).__setattr__(name, value)
+        if name in self.CONTEXT_PARAMS:
+            # keys changed, headers need to be computed again
+            super(Connection, self).__setattr__('_request_context', None)
+
+    def get_request_context(self):
+        """Returns authentication state and headers shared by all requests.
+        It is computed once and cached until any of the login params changes.
+
+        :rtype: dict
+        :return: Request context with ``is_user``, ``is_authenticated``,
+            ``headers`` (defaults) and ``forced_headers`` (override per request headers) keys
+        """
+        context = getattr(self, '_request_context', None)
+        if context is not None:
+            return context
+
+        is_user = self.is_user
+        headers = {'content-type': self.CONTENT_TYPE}
+        forced_headers = {}
+
+        if is_user:
+            forced_headers.update({
+                'X-USER-KEY': self.user_key,
+                'X-API-KEY': self.api_key
+            })
+        elif self.api_key:
+            headers['Authorization'] = 'token {}'.format(self.api_key)
+
+        context = {
+            'is_user': is_user,
+            'is_authenticated': (self.user_key if is_user else self.api_key) is not None,
+            'headers': headers,
+            'forced_headers': forced_headers,
+        }
+        self._request_context = context
+        return context
+
     def build_params(self, params):
         """
         :type params: dict
@@ -150,26 +330,17 @@ class Connection(object):
         :rtype: dict
         :return: Request params
         """
-        params = deepcopy(params)
-        params['timeout'] = params.get('timeout', self.timeout)
-        params['headers'] = params.get('headers', {})
-        params['verify'] = self.verify_ssl
+        context = self.get_request_context()
 
-        if 'content-type' not in params['headers']:
-            params['headers']['content-type'] = self.CONTENT_TYPE
-
-        if self.is_user:
-            params['headers'].update({
-                'X-USER-KEY': self.user_key,
-                'X-API-KEY': self.api_key
-            })
-        elif self.api_key and 'Authorization' not in params['headers']:
-            params['headers']['Authorization'] = 'token {}'.format(self.api_key)
+        headers = context['headers'].copy()
+        headers.update(params.get('headers', ()))
+        headers.update(context['forced_headers'])
 
+        params = params.copy()
+        params['timeout'] = params.get('timeout', self.timeout)
+        params['headers'] = headers
         # We don't need to check SSL cert in DEBUG mode
-        if syncano.DEBUG or not self.verify_ssl:
-            params['verify'] = False
-
+        params['verify'] = self.verify_ssl and not syncano.DEBUG
         return params
 
     def build_url(self, path):
@@ -201,6 +372,11 @@ class Connection(object):
         if query:
             path = '{0}?{1}'.format(path, query)
 
+        # urljoin is the most expensive part of building a request, for plain
+        # relative paths it is equivalent to a concatenation
+        if self.host.endswith('/') and not path.startswith('/') and ':' not in path and './' not in path:
+            return self.host + path
+
         return urljoin(self.host, path)
 
     def request(self, method_name, path, **kwargs):
@@ -229,13 +405,281 @@ class Connection(object):
         :type path: string
         :param path: Request path or full URL
 
+        :type priority: string
+        :param priority: Priority class used by the rate limiter, ``interactive`` or ``bulk``
+
+        :type cache_ttl: int
+        :param cache_ttl: Time to live of the cached response, overrides the response cache default
+
+        :type compress: bool or string
+        :param compress: Overrides compression of the request body: ``False`` disables it,
+            ``True``, ``gzip`` or ``deflate`` compresses the body regardless of its size
+
+        :type multipart: bool
+        :param multipart: Overrides ``multipart_uploads`` of the connection for a request with files
+
         :rtype: dict
         :return: JSON response
 
         :raises SyncanoValueError: if invalid request method was chosen
         :raises SyncanoRequestError: if something went wrong during the request
         """
+        return self._make_request(method_name, path, kwargs)[0]
+
+    def conditional_request(self, path, etag=None, **kwargs):
+        """Sends authenticated GET request with ``If-None-Match`` header of the given ETag.
+
+        Usage::
+
+            content, etag = connection.conditional_request(path)
+            ...
+            content, etag = connection.conditional_request(path, etag=etag)
+            if content is None:
+                # resource didn't change
+
+        :type path: string
+        :param path: Request path or full URL
+
+        :type etag: string
+        :param etag: ETag of the resource version known to the caller
+
+        :rtype: tuple
+        :return: ``(content, etag)``, content is ``None`` if the resource didn't change since ``etag``
+        """
+        if not self.is_authenticated():
+            self.authenticate()
+        return self._make_request('GET', path, kwargs, conditional=True, etag=etag)
+
+    def stream_request(self, method_name, path, **kwargs):
+        """Sends authenticated request and returns the HTTP response without reading its body,
+        which can be consumed with ``iter_content``, e.g. by :class:`~syncano.json_codec.PageParser`.
+
+        :type method_name: string
+        :param method_name: HTTP request method e.g: GET
+
+        :type path: string
+        :param path: Request path or full URL
+
+        :rtype: HTTP response
+
+        :raises SyncanoRequestError: if something went wrong during the request
+        """
+        if not self.is_authenticated():
+            self.authenticate()
+
+        priority = kwargs.pop('priority', None)
+        kwargs.pop('cache_ttl', None)
+        params = self.build_params(kwargs)
+        params['stream'] = True
+
+        self._log_request(method_name, path, params, {})
+
+        if method_name.lower() not in self.transport.METHODS:
+            raise SyncanoValueError('Invalid request method: {0}.'.format(method_name))
+
+        self._encode_request_data(params)
+
+        url = self.build_url(path)
+        response = self.send_request(method_name, url, params, priority)
+        if not is_success(response.status_code):
+            self.get_response_content(url, response)
+        return response
+
+    def _make_request(self, method_name, path, kwargs, conditional=False, etag=None):
+        priority = kwargs.pop('priority', None)
+        cache_ttl = kwargs.pop('cache_ttl', None)
+        compress = kwargs.pop('compress', None)
+        multipart = kwargs.pop('multipart', None)
+        files = self._pop_request_files(kwargs)
+        params = self.build_params(kwargs)
+
+        self._log_request(method_name, path, params, files)
+
+        if method_name.lower() not in self.transport.METHODS:
+            raise SyncanoValueError('Invalid request method: {0}.'.format(method_name))
+
+        if self._is_multipart(method_name, files, multipart):
+            self._encode_multipart_data(params, files)
+            files = {}
+        else:
+            self._encode_request_data(params)
+
+        url = self.build_url(path)
+        cache_key = self._get_cache_key(method_name, url, params, files)
+        # conditional requests revalidate, e.g. by Model.reload, so they always reach the server and refresh the cache
+        if cache_key is not None and not conditional:
+            content = self.cache.get(cache_key)
+            if content is not None:
+                return content, None
+
+        flight_key = self._get_flight_key(method_name, url, params, files, conditional, etag)
+        if flight_key is None:
+            content, etag = self._send_request(method_name, url, params, priority, files, compress, conditional, etag)
+        else:
+            send = partial(self._send_request, method_name, url, params, priority, files, compress, conditional, etag)
+            content, etag = self.single_flight.do(flight_key, send)
+
+        if cache_key is not None and content is not None:
+            self.cache.set(cache_key, url, content, cache_ttl)
+
+        return content, etag
+
+    def _send_request(self, method_name, url, params, priority, files, compress, conditional, etag):
+        if method_name.upper() == 'GET' and not files and (conditional or self.validators is not None):
+            return self._send_conditional_request(url, params, priority, etag)
+        return self._send_request_with_files(method_name, url, params, priority, files, compress), etag
+
+    def _get_flight_key(self, method_name, url, params, files, conditional, etag):
+        # only idempotent requests can share a response
+        if self.single_flight is None or files or method_name.upper() != 'GET':
+            return None
+
+        # headers carry the auth key
+        key = (url, tuple(sorted(six.iteritems(params.get('params') or {}))), params.get('data'),
+               tuple(sorted(six.iteritems(params['headers']))), conditional, etag)
+        try:
+            hash(key)
+        except TypeError:  # e.g. list values of query params
+            return None
+        return key
+
+    def _send_conditional_request(self, url, params, priority, etag):
+        key = stored = None
+        if self.validators is not None:
+            key = self.validators.get_key('GET', url, params)
+            stored = self.validators.get(key)
+
+        # build_params returns new headers dict, so they can be changed here
+        if etag is not None:
+            params['headers']['If-None-Match'] = etag
+        elif stored is not None:
+            if stored[0]:
+                params['headers']['If-None-Match'] = stored[0]
+            if stored[1]:
+                params['headers']['If-Modified-Since'] = stored[1]
+
+        response = self.send_request('GET', url, params, priority)
+        if response.status_code == 304:
+            if etag is not None:
+                return None, etag
+            if stored is not None:
+                return json_codec.loads(stored[2]), stored[0]
+
+        content = self.get_response_content(url, response)
+        etag = response.headers.get('etag')
+        last_modified = response.headers.get('last-modified')
+        if key is not None and (etag or last_modified):
+            self.validators.set(key, etag, last_modified, response.text)
+        return content, etag
+
+    def _send_request_with_files(self, method_name, url, params, priority, files, compress=None):
+        try:
+            response = self.send_request(method_name, url, self.compress_params(params, compress), priority)
+        finally:
+            self._invalidate_cache(method_name, url, params)
+        content = self.get_response_content(url, response)
+
+        if files:
+            # remove 'data' and 'content-type' to avoid "ValueError: Data must not be a string."
+            params.pop('data')
+            params['headers'].pop('content-type')
+            params['files'] = self._process_apns_cert_files(files)
+
+            if response.status_code == 201:
+                url = '{}{}/'.format(url, content['id'])
+
+            # second request is needed to upload a file
+            response = self.send_request('PATCH', url, params, priority)
+            content = self.get_response_content(url, response)
+
+        return content
+
+    def send_request(self, method_name, url, params, priority=None):
+        """Sends prepared request through the transport, throttled responses are retried
+        according to :class:`~syncano.throttling.ThrottleCoordinator` of the connection.
+
+        :rtype: HTTP response
+        """
+        retries = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.wait(self.get_rate_limit_key(url), priority)
+            self.throttle.wait(self.api_key)
+            response = self.transport.request(method_name, url, **params)
+
+            if response.status_code != 429 or retries >= self.throttle.max_retries:  # throttling;
+                return response
+
+            response.close()
+            self.throttle.throttled(self.api_key, float(response.headers.get('retry-after', 1)))
+            self._rewind_request_data(params)
+            retries += 1
+
+    def _get_cache_key(self, method_name, url, params, files):
+        if self.cache is None or files or method_name.upper() != 'GET':
+            return None
+        return self.cache.get_key(method_name, url, params)
+
+    def _invalidate_cache(self, method_name, url, params):
+        if self.cache is None or method_name.upper() == 'GET':
+            return
+
+        self.cache.invalidate(url)
+        if url.rstrip('/').endswith('/batch') and params.get('data'):
+            for request in json_codec.loads(params['data']).get('requests', []):
+                if request.get('method', 'GET').upper() != 'GET':
+                    self.cache.invalidate(self.build_url(request['path']))
+
+    def get_rate_limit_key(self, url):
+        """Returns rate limiter bucket key of the request, API key and instance name."""
+        _, _, path = url.partition('/instances/')
+        return '{0}:{1}'.format(self.api_key, path.split('/', 1)[0])
+
+    def get_concurrency_controller(self, instance_name=None):
+        """Returns adaptive concurrency limit shared by parallel operations on the given instance.
+
+        :rtype: :class:`~syncano.concurrency.AdaptiveConcurrency`
+        """
+        return self.concurrency.get('{0}:{1}'.format(self.api_key, instance_name or ''))
+
+    @property
+    def coalescer(self):
+        return getattr(self._coalescing, 'coalescer', None)
+
+    @contextmanager
+    def coalesce(self, window=0.005, max_size=50, coalescer=None):
+        """Scope in which ``get`` calls of managers, made concurrently by many threads,
+        are collected and sent as batch requests, see :class:`~syncano.coalescing.GetCoalescer`.
+
+        The scope is active only in the thread which entered it; other threads join it
+        with :meth:`~syncano.coalescing.GetCoalescer.wrap`, or by passing its coalescer.
+
+        Usage::
+
+            with connection.coalesce() as coalescer:
+                get_book = coalescer.wrap(lambda pk: Object.please.get(class_name='books', id=pk))
+                books = pool.map(get_book, ids)
+
+        :type window: float
+        :param window: Maximum time in seconds a ``get`` call waits for others
+
+        :type max_size: int
+        :param max_size: Number of pending ``get`` calls which are sent at once
+
+        :type coalescer: :class:`~syncano.coalescing.GetCoalescer`
+        :param coalescer: Coalescer of another scope to join, instead of creating a new one
+        """
+        previous = self.coalescer
+        self._coalescing.coalescer = coalescer or GetCoalescer(self, window=window, max_size=max_size)
+        try:
+            yield self._coalescing.coalescer
+        finally:
+            self._coalescing.coalescer = previous
+
+    def _pop_request_files(self, kwargs):
         data = kwargs.get('data', {})
+        if isinstance(data, MultipartEncoder):  # already encoded body
+            return {}
         files = data.pop('files', None)
 
         self._check_batch_files(data)
@@ -244,14 +688,15 @@ class Connection(object):
             files = {k: v for k, v in six.iteritems(data) if hasattr(v, 'read')}
             if data:
                 kwargs['data'] = {k: v for k, v in six.iteritems(data) if k not in files}
+        return files
 
-        params = self.build_params(kwargs)
-        method = getattr(self.session, method_name.lower(), None)
-
+    def _log_request(self, method_name, path, params, files):
         # JSON dump can be expensive
         if syncano.DEBUG:
             debug_params = params.copy()
             debug_params.update({'files': [f for f in files]})  # show files in debug info;
+            if isinstance(debug_params.get('data'), MultipartEncoder):
+                debug_params['data'] = '<multipart body of {0} bytes>'.format(len(debug_params['data']))
             formatted_params = json.dumps(
                 debug_params,
                 sort_keys=True,
@@ -261,59 +706,104 @@ class Connection(object):
             self.logger.debug('API Root: %s', self.host)
             self.logger.debug('Request: %s %s\n%s', method_name, path, formatted_params)
 
-        if method is None:
-            raise SyncanoValueError('Invalid request method: {0}.'.format(method_name))
+    def compress_params(self, params, compress=None):
+        """Returns request params with compressed body, if compression applies to the request.
 
-        # Encode request payload
-        if 'data' in params and not isinstance(params['data'], six.string_types):
-            params['data'] = json.dumps(params['data'])
+        :type compress: bool or string
+        :param compress: ``None`` follows ``compression`` and ``compression_threshold`` of the connection,
+            ``False`` disables compression, ``True``, ``gzip`` or ``deflate`` forces it
 
-        url = self.build_url(path)
-        response = method(url, **params)
-
-        while response.status_code == 429:  # throttling;
-            retry_after = response.headers.get('retry-after', 1)
-            time.sleep(float(retry_after))
-            response = method(url, **params)
-        content = self.get_response_content(url, response)
+        :rtype: dict
+        """
+        data = params.get('data')
+        if compress is False or not data or params['headers'].get('content-encoding'):
+            return params
+
+        # streamed bodies, e.g. multipart uploads, are sent as they are
+        if not isinstance(data, (six.text_type, six.binary_type)):
+            return params
+
+        if compress is None:
+            if self.compression is None or len(data) < self.compression_threshold:
+                return params
+            compress = self.compression
+        elif compress is True:
+            compress = self.compression or 'gzip'
+
+        wbits = self.COMPRESSION_WBITS.get(compress)
+        if wbits is None:
+            raise SyncanoValueError('Unsupported compression: {0}.'.format(compress))
+
+        if isinstance(data, six.text_type):
+            data = data.encode('utf-8')
+
+        compressor = zlib.compressobj(6, zlib.DEFLATED, wbits)
+        params = params.copy()
+        params['data'] = compressor.compress(data) + compressor.flush()
+        params['headers'] = dict(params['headers'], **{'content-encoding': compress})
+        return params
 
-        if files:
-            # remove 'data' and 'content-type' to avoid "ValueError: Data must not be a string."
-            params.pop('data')
-            params['headers'].pop('content-type')
-            params['files'] = self._process_apns_cert_files(files)
+    @classmethod
+    def _encode_request_data(cls, params):
+        # Encode request payload
+        if 'data' in params and not isinstance(params['data'], six.string_types + (MultipartEncoder,)):
+            params['data'] = json_codec.dumps(params['data'])
 
-            if response.status_code == 201:
-                url = '{}{}/'.format(url, content['id'])
+    def _is_multipart(self, method_name, files, multipart=None):
+        if not files or method_name.upper() not in ('POST', 'PUT', 'PATCH'):
+            return False
+        return self.multipart_uploads if multipart is None else multipart
 
-            patch = getattr(self.session, 'patch')
-            # second request is needed to upload a file
-            response = patch(url, **params)
-            content = self.get_response_content(url, response)
+    def _encode_multipart_data(self, params, files):
+        # Fields and files go together in a single request, files are streamed from disk
+        encoder = MultipartEncoder(params.get('data'), self._process_apns_cert_files(files))
+        params['data'] = encoder
+        params['headers']['content-type'] = encoder.content_type
+        params['headers']['content-length'] = str(len(encoder))
 
-        return content
+    @classmethod
+    def _rewind_request_data(cls, params):
+        # streamed body has to be read again when the request is retried
+        if isinstance(params.get('data'), MultipartEncoder):
+            params['data'].reset()
 
     def get_response_content(self, url, response):
         try:
-            content = response.json()
+            content = json_codec.get_codec().load_response(response)
         except ValueError:
             content = response.text
 
-        if is_server_error(response.status_code):
-            raise SyncanoRequestError(response.status_code, 'Server error.')
+        return self.check_response_content(url, response.status_code, content)
+
+    def check_response_content(self, url, status_code, content):
+        """Maps unsuccessful response status codes to Syncano exceptions.
+
+        :type url: string
+        :param url: Request URL
+
+        :type status_code: int
+        :param status_code: HTTP response status code
+
+        :param content: Decoded response content
+
+        :return: Unchanged response content
+        :raises SyncanoRequestError: if response status code is not successful
+        """
+        if is_server_error(status_code):
+            raise SyncanoRequestError(status_code, 'Server error.')
 
         # Validation error
-        if is_client_error(response.status_code):
-            if response.status_code == 400 and 'expected_revision' in content:
-                raise RevisionMismatchException(response.status_code, content)
-            raise SyncanoRequestError(response.status_code, content)
+        if is_client_error(status_code):
+            if status_code == 400 and 'expected_revision' in content:
+                raise RevisionMismatchException(status_code, content)
+            raise SyncanoRequestError(status_code, content)
 
         # Other errors
-        if not is_success(response.status_code):
+        if not is_success(status_code):
             self.logger.debug('Request Error: %s', url)
-            self.logger.debug('Status code: %d', response.status_code)
+            self.logger.debug('Status code: %d', status_code)
             self.logger.debug('Response: %s', content)
-            raise SyncanoRequestError(response.status_code, content)
+            raise SyncanoRequestError(status_code, content)
 
         return content
 
@@ -323,9 +813,7 @@ class Connection(object):
         :rtype: boolean
         :return: Session authentication state
         """
-        if self.is_user:
-            return self.user_key is not None
-        return self.api_key is not None
+        return self.get_request_context()['is_authenticated']
 
     def authenticate(self, **kwargs):
         """
@@ -362,6 +850,18 @@ class Connection(object):
         return kwargs
 
     def authenticate_admin(self, **kwargs):
+        request_args = self._get_admin_auth_args(kwargs)
+        response = self.make_request('POST', self.AUTH_SUFFIX, data=request_args)
+        self.api_key = response.get('account_key')
+        return self.api_key
+
+    def authenticate_user(self, **kwargs):
+        request_args, headers = self._get_user_auth_args(kwargs)
+        response = self.make_request('POST', self.AUTH_SUFFIX, data=request_args, headers=headers)
+        self.user_key = response.get('user_key')
+        return self.user_key
+
+    def _get_admin_auth_args(self, kwargs):
         if self.is_alt_login:
             request_args = self.validate_params(kwargs,
                                                 self.ALT_LOGIN_PARAMS)
@@ -373,12 +873,9 @@ class Connection(object):
             else:
                 request_args = self.validate_params(kwargs,
                                                     self.LOGIN_PARAMS)
+        return request_args
 
-        response = self.make_request('POST', self.AUTH_SUFFIX, data=request_args)
-        self.api_key = response.get('account_key')
-        return self.api_key
-
-    def authenticate_user(self, **kwargs):
+    def _get_user_auth_args(self, kwargs):
         if self.is_alt_login:
             request_args = self.validate_params(kwargs,
                                                 self.USER_ALT_LOGIN_PARAMS)
@@ -389,9 +886,7 @@ class Connection(object):
             'content-type': self.CONTENT_TYPE,
             'X-API-KEY': request_args.pop('api_key')
         }
-        response = self.make_request('POST', self.AUTH_SUFFIX, data=request_args, headers=headers)
-        self.user_key = response.get('user_key')
-        return self.user_key
+        return request_args, headers
 
     def get_account_info(self, api_key=None):
         self.api_key = api_key or self.api_key
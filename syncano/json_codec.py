@@ -0,0 +1,370 @@
+import codecs
+import json
+import re
+
+import six
+import syncano
+from syncano.exceptions import SyncanoValueError
+
+__all__ = ['JSONCodec', 'OrjsonCodec', 'RapidjsonCodec', 'UjsonCodec', 'PageParser',
+           'get_codec', 'set_codec', 'dumps', 'loads']
+
+
+class JSONCodec(object):
+    """Standard library JSON codec, base class for all codecs.
+
+    Codecs dump values to text and load both text and bytes; fast codecs parse
+    response bodies directly from bytes, without decoding them to text first.
+    """
+
+    name = 'json'
+
+    @classmethod
+    def is_available(cls):
+        return True
+
+    def dumps(self, value):
+        return json.dumps(value)
+
+    def loads(self, value):
+        if six.PY3 and isinstance(value, six.binary_type):
+            value = value.decode('utf-8')
+        return json.loads(value)
+
+    def load_response(self, response):
+        """Parses body of the HTTP response.
+
+        :raises ValueError: if body is not a valid JSON
+        """
+        return response.json()
+
+
+class FastJSONCodec(JSONCodec):
+    """Base class of codecs backed by third party libraries."""
+
+    def load_response(self, response):
+        return self.loads(response.content)
+
+
+class OrjsonCodec(FastJSONCodec):
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    @classmethod
+    def is_available(cls):
+        return _is_installed('orjson')
+
+    def dumps(self, value):
+        return self._dumps(value, option=self._options).decode('utf-8')
+
+    def loads(self, value):
+        return self._loads(value)
+
+
+class RapidjsonCodec(FastJSONCodec):
+    name = 'rapidjson'
+
+    def __init__(self):
+        import rapidjson
+        self._dumps = rapidjson.dumps
+        self._loads = rapidjson.loads
+
+    @classmethod
+    def is_available(cls):
+        return _is_installed('rapidjson')
+
+    def dumps(self, value):
+        return self._dumps(value)
+
+    def loads(self, value):
+        return self._loads(value)
+
+
+class UjsonCodec(FastJSONCodec):
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._dumps = ujson.dumps
+        self._loads = ujson.loads
+
+    @classmethod
+    def is_available(cls):
+        return _is_installed('ujson')
+
+    def dumps(self, value):
+        return self._dumps(value, escape_forward_slashes=False)
+
+    def loads(self, value):
+        return self._loads(value)
+
+
+# Order of preference of the ``auto`` codec;
+CODECS = [OrjsonCodec, RapidjsonCodec, UjsonCodec, JSONCodec]
+
+_codec = None
+
+
+def _is_installed(module_name):
+    try:
+        __import__(module_name)
+    except ImportError:
+        return False
+    return True
+
+
+def set_codec(codec):
+    """Sets codec used to encode request payloads and decode responses.
+
+    Usage::
+
+        set_codec('orjson')
+        # OR
+        set_codec(MyCodec())
+
+    :type codec: string or :class:`~syncano.json_codec.JSONCodec`
+    :param codec: Codec instance, codec name or ``auto`` for the fastest installed one
+    """
+    global _codec
+
+    if isinstance(codec, JSONCodec):
+        _codec = codec
+        return
+
+    if codec == 'auto':
+        codec_class = next(c for c in CODECS if c.is_available())
+    else:
+        codec_class = next((c for c in CODECS if c.name == codec), None)
+        if codec_class is None or not codec_class.is_available():
+            raise SyncanoValueError('JSON codec "{0}" is not available.'.format(codec))
+
+    _codec = codec_class()
+
+
+def get_codec():
+    """Returns current codec, picks it on the first use according to ``SYNCANO_JSON_CODEC``
+    environment variable: ``json`` (default, standard library), ``orjson``, ``rapidjson``, ``ujson``
+    or ``auto`` for the fastest installed one, falling back to the standard library.
+
+    :rtype: :class:`~syncano.json_codec.JSONCodec`
+    """
+    if _codec is None:
+        set_codec(syncano.JSON_CODEC)
+    return _codec
+
+
+def dumps(value):
+    """Serializes value to JSON text with the current codec."""
+    return get_codec().dumps(value)
+
+
+def loads(value):
+    """Parses JSON text or bytes with the current codec.
+
+    :raises ValueError: if value is not a valid JSON
+    """
+    return get_codec().loads(value)
+
+
+class PageParser(object):
+    """Incrementally parses a list page, e.g. ``{"objects": [...], "next": "..."}``, from chunks of bytes.
+
+    Iterating the parser yields items of the ``objects`` array one by one, as soon as they are
+    downloaded, so only a single item and a single chunk are held in memory at once.
+    Other keys of the page are available in ``fields`` after the iteration.
+
+    Usage::
+
+        parser = PageParser(response.iter_content(8192))
+        for obj in parser:
+            ...
+        next_url = parser.fields.get('next')
+
+    :ivar fields: Keys of the page other than ``objects``
+    """
+
+    WHITESPACE = ' \t\n\r'
+
+    def __init__(self, chunks, array_key='objects'):
+        self.chunks = iter(chunks)
+        self.array_key = array_key
+        self.fields = {}
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._position = 0
+        self._exhausted = False
+
+    def __iter__(self):
+        self._expect('{')
+        if self._peek() == '}':
+            return
+
+        while True:
+            key = self._read_value()
+            self._expect(':')
+
+            if key == self.array_key and self._peek() == '[':
+                self._expect('[')
+                for item in self._read_array():
+                    yield item
+            else:
+                self.fields[key] = self._read_value()
+
+            if self._expect(',}') == '}':
+                return
+
+    def _read_array(self):
+        if self._peek() == ']':
+            self._expect(']')
+            return
+
+        while True:
+            yield self._read_value()
+            if self._expect(',]') == ']':
+                return
+
+    def _read_text(self):
+        if self._exhausted:
+            return None
+
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self._exhausted = True
+            return self._text_decoder.decode(b'', final=True)
+        return self._text_decoder.decode(chunk)
+
+    def _read_chunk(self):
+        text = self._read_text()
+        if self._exhausted:
+            self._buffer += text or ''
+            return False
+
+        # drop consumed part of the buffer, so it doesn't grow with the page
+        self._buffer = self._buffer[self._position:] + text
+        self._position = 0
+        return True
+
+    def _peek(self):
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in self.WHITESPACE:
+                self._position += 1
+
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+
+            if not self._read_chunk():
+                raise ValueError('Unexpected end of JSON page.')
+
+    def _expect(self, characters):
+        character = self._peek()
+        if character not in characters:
+            raise ValueError('Expected one of "{0}" at {1}, got "{2}".'.format(characters, self._position, character))
+        self._position += 1
+        return character
+
+    def _read_value(self):
+        # the value is scanned for its end chunk by chunk and decoded once,
+        # so each character is read twice at most, however many chunks the value spans
+        scanner = _ValueScanner(self._peek())
+        buffer, start = self._buffer, self._position
+        parts = []
+        while True:
+            end = scanner.scan(buffer, start)
+            if end is not None:
+                break
+
+            parts.append(buffer[start:])
+            buffer, start = self._read_text(), 0
+            if buffer is None:
+                if not scanner.scalar:
+                    raise ValueError('Unexpected end of JSON page.')
+                buffer, end = '', 0  # a scalar can end with the page, e.g. a number
+                break
+
+        if parts:
+            parts.append(buffer[start:end])
+            text, start, value_end = ''.join(parts), 0, None
+            self._buffer, self._position = buffer[end:], 0
+        else:
+            text, value_end = buffer, end
+            self._position = end
+
+        value, decoded_end = self._decoder.raw_decode(text, start)
+        if decoded_end != (len(text) if value_end is None else value_end):
+            raise ValueError('Unexpected data at {0} of JSON page.'.format(decoded_end))
+        return value
+
+
+class _ValueScanner(object):
+    """Finds the end of a JSON value split into chunks of text, keeping its state between chunks."""
+
+    # whole strings are skipped at once, unless they continue in the next chunk
+    STRUCTURE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|["\[\]{}]', re.DOTALL)
+    STRING_SPECIAL = re.compile(r'["\\]')
+    SCALAR_END = re.compile(r'[\s,\]}]')
+
+    def __init__(self, first_character):
+        self.scalar = first_character not in '"[{'
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def scan(self, text, position):
+        """Returns end of the value in ``text``, or ``None`` if the value continues in the next chunk."""
+        if self.scalar:
+            match = self.SCALAR_END.search(text, position)
+            return match.start() if match else None
+
+        if self.in_string:
+            position = self._scan_string(text, position)
+            if position is None or self.depth == 0:
+                return position
+        return self._scan_structure(text, position)
+
+    def _scan_structure(self, text, position):
+        while True:
+            match = self.STRUCTURE.search(text, position)
+            if match is None:
+                return None
+            position = match.end()
+            token = match.group()
+            if token == '"':  # only an unterminated string isn't matched whole, it continues in the next chunk
+                self.in_string = True
+                self._scan_string(text, position)
+                return None
+
+            if token in '[{':
+                self.depth += 1
+            elif token in ']}':
+                self.depth -= 1
+                if self.depth <= 0:
+                    return position
+            elif self.depth == 0:  # a whole string
+                return position
+
+    def _scan_string(self, text, position):
+        if self.escaped:
+            if position >= len(text):
+                return None
+            position += 1
+            self.escaped = False
+
+        while True:
+            match = self.STRING_SPECIAL.search(text, position)
+            if match is None:
+                return None
+            position = match.end()
+            if match.group() == '"':
+                self.in_string = False
+                return position
+
+            if position >= len(text):
+                self.escaped = True
+                return None
+            position += 1
@@ -1,6 +1,7 @@
 
 
 import inspect
+import json
 
 import six
 from syncano.exceptions import SyncanoDoesNotExist, SyncanoValidationError
@@ -84,6 +85,9 @@ class Model(six.with_metaclass(ModelMetaclass)):
     """Base class for all models.
     """
 
+    # (ETag, serialized snapshot of field values) of the last reload, see :meth:`reload`
+    _etag = None
+
     def __init__(self, **kwargs):
         self.is_lazy = kwargs.pop('is_lazy', False)
         self._raw_data = {}
@@ -181,6 +185,10 @@ class Model(six.with_metaclass(ModelMetaclass)):
 
     def reload(self, **kwargs):
         """Reloads the current instance.
+
+        If the server sends ETags, the next reload is a conditional request and
+        re-hydration is skipped when the object didn't change, unless fields
+        of the instance were assigned in the meantime.
         """
         if self.is_new():
             raise SyncanoValidationError('Method allowed only on existing model.')
@@ -189,8 +197,28 @@ class Model(six.with_metaclass(ModelMetaclass)):
         http_method = 'GET'
         endpoint = self._meta.resolve_endpoint('detail', properties, http_method)
         connection = self._get_connection(**kwargs)
-        response = connection.request(http_method, endpoint)
+        response, etag = connection.conditional_request(endpoint, etag=self._get_etag())
+        if response is None:  # not modified;
+            return
+
         self.to_python(response)
+        self._etag = (etag, self._get_snapshot()) if etag else None
+
+    def _get_etag(self):
+        if self._etag is None:
+            return None
+
+        etag, snapshot = self._etag
+        return etag if snapshot == self._get_snapshot() else None
+
+    def _get_snapshot(self):
+        # values are serialized, so in-place changes of dicts and lists are detected too
+        fields = {field.name: field for field in self._meta.fields}
+        data = {}
+        for name, value in six.iteritems(self._raw_data):
+            field = fields.get(name)
+            data[name] = field.to_native(value) if field is not None and value is not None else value
+        return json.dumps(data, sort_keys=True, default=repr)
 
     def validate(self):
         """
@@ -11,8 +11,13 @@ class BaseBulkCreate(six.with_metaclass(ABCMeta)):
 
     Usage:
         instances = ObjectBulkCreate(objects, manager).process()
+
+        for index, instance in ObjectBulkCreate(objects, manager).iter_process():
+            ...
+
+    Any number of objects can be created, :meth:`~syncano.models.manager.Manager.batch`
+    splits them into batch calls of 50 requests.
     """
-    MAX_BATCH_SIZE = 50
 
     @abstractmethod
     def __init__(self, objects, manager):
@@ -22,8 +27,7 @@ class BaseBulkCreate(six.with_metaclass(ABCMeta)):
         self.validated = False
 
     def validate(self):
-        if len(self.objects) > self.MAX_BATCH_SIZE:
-            raise SyncanoValueError('Only 50 objects can be created at once.')
+        pass
 
     def make_batch_request(self):
         if not self.validated:
@@ -38,6 +42,10 @@ class BaseBulkCreate(six.with_metaclass(ABCMeta)):
         self.make_batch_request()
         return self.response
 
+    def iter_process(self):
+        self.validate()
+        return self.manager.iter_batch(*[o.save() for o in self.objects])
+
 
 class ObjectBulkCreate(BaseBulkCreate):
 
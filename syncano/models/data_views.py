@@ -1,6 +1,6 @@
-import json
 
 import six
+from syncano import json_codec
 from syncano.exceptions import SyncanoValueError
 from syncano.models.incentives import ResponseTemplate
 
@@ -94,7 +94,7 @@ class DataEndpoint(Model):
 
         kwargs = {}
         params = {}
-        params.update({'query': json.dumps(query)})
+        params.update({'query': json_codec.dumps(query)})
 
         if cache_key is not None:
             params = {'cache_key': cache_key}
@@ -4,7 +4,7 @@ from datetime import date, datetime
 
 import six
 import validictory
-from syncano import PUSH_ENV, logger
+from syncano import PUSH_ENV, json_codec, logger
 from syncano.exceptions import SyncanoFieldError, SyncanoValueError
 from syncano.utils import force_text
 
@@ -22,7 +22,7 @@ class JSONToPythonMixin(object):
 
         if isinstance(value, six.string_types):
             try:
-                value = json.loads(value)
+                value = json_codec.loads(value)
             except (ValueError, TypeError):
                 raise SyncanoValueError('Invalid value: can not be parsed')
         return value
@@ -573,7 +573,7 @@ class JSONField(JSONToPythonMixin, WritableField):
             return
 
         if not isinstance(value, six.string_types):
-            value = json.dumps(value)
+            value = json_codec.dumps(value)
         return value
 
 
@@ -714,7 +714,7 @@ class PushJSONField(JSONField):
                 value.update({
                     'environment': PUSH_ENV,
                 })
-            value = json.dumps(value)
+            value = json_codec.dumps(value)
         return value
 
 
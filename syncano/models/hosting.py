@@ -1,4 +1,12 @@
 # -*- coding: utf-8 -*-
+import hashlib
+import os
+import time
+from functools import partial
+
+from syncano.concurrency import is_overload_error
+from syncano.exceptions import SyncanoRequestError
+from syncano.multipart import MultipartEncoder
 
 from . import fields
 from .base import Model
@@ -33,28 +41,27 @@ class Hosting(Model):
             }
         }
 
-    def upload_file(self, path, file):
+    # Failed uploads are retried after 1, 2, 4... seconds
+    UPLOAD_RETRY_DELAY = 1
+
+    def upload_file(self, path, file, progress=None, retries=2):
         """
         Upload a new file to the hosting.
         :param path: the file path;
         :param file: the file to be uploaded;
+        :param progress: optional callback called with bytes sent so far and total size of the upload;
+        :param retries: how many times an upload failed on a network or server error is retried;
         :return: the response from the API;
         """
-        files_path = self.links.files
-        data = {'path': path}
-        connection = self._get_connection()
-        headers = self._prepare_header(connection)
-        response = connection.session.post('{}{}'.format(connection.host, files_path), headers=headers,
-                                           data=data, files=[('file', file)])
-        if response.status_code != 201:
-            return
-        return HostingFile(**response.json())
-
-    def update_file(self, path, file):
+        return self._send_file('POST', self.links.files, file, {'path': path}, progress, retries)
+
+    def update_file(self, path, file, progress=None, retries=2):
         """
         Updates an existing file.
         :param path: the file path;
         :param file: the file to be uploaded;
+        :param progress: optional callback called with bytes sent so far and total size of the upload;
+        :param retries: how many times an upload failed on a network or server error is retried;
         :return: the response from the API;
         """
         hosting_files = self._get_files()
@@ -67,20 +74,59 @@ class Hosting(Model):
 
         if not is_found:
             # create if not found;
-            hosting_file = self.upload_file(path, file)
+            hosting_file = self.upload_file(path, file, progress, retries)
             return hosting_file
 
-        connection = self._get_connection()
-        headers = self._prepare_header(connection)
-        response = connection.session.patch('{}{}'.format(connection.host, hosting_file.links.self), headers=headers,
-                                            files=[('file', file)])
-        if response.status_code != 200:
-            return
-        return HostingFile(**response.json())
+        return self._send_file('PATCH', hosting_file.links.self, file, None, progress, retries)
 
     def list_files(self):
         return self._get_files()
 
+    def sync_directory(self, local_dir, delete=False, retries=2):
+        """
+        Uploads new and changed files of a local directory to the hosting.
+        Remote files are listed once, files with the same checksum as the local ones are skipped,
+        other files are uploaded in parallel, within the adaptive concurrency limit of the instance.
+        :param local_dir: the directory to sync, its relative paths become paths of hosting files;
+        :param delete: delete hosting files which don't exist in the directory;
+        :param retries: how many times an upload failed on a network or server error is retried;
+        :return: a summary dict with ``created``, ``updated``, ``unchanged``, ``deleted`` and ``failed`` paths,
+            ``bytes_uploaded``, ``bytes_skipped`` and ``requests_saved``, that is uploads skipped
+            and file listings avoided, compared to calling ``update_file`` for every file;
+        """
+        remote_files = {hosting_file.path: hosting_file for hosting_file in self._get_files()}
+        local_files = self._get_local_files(local_dir)
+        summary = {'created': [], 'updated': [], 'unchanged': [], 'deleted': [], 'failed': [],
+                   'bytes_uploaded': 0, 'bytes_skipped': 0}
+
+        uploads = []
+        for path, filename in sorted(local_files.items()):
+            hosting_file = remote_files.get(path)
+            size = os.path.getsize(filename)
+            if hosting_file is not None and hosting_file.checksum is not None and \
+                    hosting_file.checksum == self._get_checksum(filename):
+                summary['unchanged'].append(path)
+                summary['bytes_skipped'] += size
+            else:
+                uploads.append((path, filename, size, hosting_file))
+
+        controller = self._get_connection().get_concurrency_controller(self.instance_name)
+        for index, result in controller.imap(partial(self._sync_file, retries=retries), uploads):
+            path, _, size, hosting_file = uploads[index]
+            if result is None:
+                summary['failed'].append(path)
+                continue
+            summary['updated' if hosting_file is not None else 'created'].append(path)
+            summary['bytes_uploaded'] += size
+
+        if delete:
+            orphans = [hosting_file for path, hosting_file in sorted(remote_files.items()) if path not in local_files]
+            for index, deleted in controller.imap(self._delete_file, orphans):
+                summary['deleted' if deleted else 'failed'].append(orphans[index].path)
+
+        summary['requests_saved'] = len(summary['unchanged']) + max(len(local_files) - 1, 0)
+        return summary
+
     def set_default(self):
         default_path = self.links.set_default
         connection = self._get_connection()
@@ -89,15 +135,66 @@ class Hosting(Model):
         self.to_python(response)
         return self
 
-    def _prepare_header(self, connection):
-        params = connection.build_params(params={})
-        headers = params['headers']
-        headers.pop('content-type')
-        return headers
+    def _send_file(self, method_name, path, file, data, progress, retries):
+        # the file is streamed in chunks instead of being loaded into memory,
+        # a retry rewinds the same body instead of opening and encoding the file again
+        body = MultipartEncoder(data, {'file': file}, callback=progress)
+        headers = {'content-type': body.content_type, 'content-length': str(len(body))}
+        connection = self._get_connection()
+
+        attempt = 0
+        while True:
+            body.reset()
+            try:
+                content = connection.request(method_name, path, data=body, headers=headers)
+            except Exception as e:
+                if attempt < retries and is_overload_error(e):
+                    time.sleep(self.UPLOAD_RETRY_DELAY * 2 ** attempt)
+                    attempt += 1
+                    continue
+                if isinstance(e, SyncanoRequestError):
+                    return
+                raise
+            return HostingFile(**content)
 
     def _get_files(self):
         return [hfile for hfile in HostingFile.please.list(hosting_id=self.id)]
 
+    def _sync_file(self, upload, retries):
+        path, filename, _, hosting_file = upload
+        # network errors fail only this file, so the rest of the directory is still synced
+        try:
+            with open(filename, 'rb') as file:
+                if hosting_file is None:
+                    return self._send_file('POST', self.links.files, file, {'path': path}, None, retries)
+                return self._send_file('PATCH', hosting_file.links.self, file, None, None, retries)
+        except (IOError, OSError):
+            return None
+
+    def _delete_file(self, hosting_file):
+        try:
+            self._get_connection().request('DELETE', hosting_file.links.self)
+        except (SyncanoRequestError, IOError, OSError):
+            return False
+        return True
+
+    @classmethod
+    def _get_local_files(cls, local_dir):
+        local_files = {}
+        for root, _, filenames in os.walk(local_dir):
+            for filename in filenames:
+                filename = os.path.join(root, filename)
+                local_files[os.path.relpath(filename, local_dir).replace(os.sep, '/')] = filename
+        return local_files
+
+    @classmethod
+    def _get_checksum(cls, filename):
+        checksum = hashlib.md5()
+        with open(filename, 'rb') as file:
+            for chunk in iter(lambda: file.read(64 * 1024), b''):
+                checksum.update(chunk)
+        return checksum.hexdigest()
+
 
 class HostingFile(Model):
     """
@@ -106,6 +203,8 @@ class HostingFile(Model):
 
     path = fields.StringField(max_length=300)
     file = fields.FileField()
+    size = fields.IntegerField(read_only=True, required=False)
+    checksum = fields.StringField(read_only=True, required=False)
     links = fields.LinksField()
 
     class Meta:
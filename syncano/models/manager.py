@@ -1,7 +1,13 @@
 import json
+import threading
+from collections import OrderedDict
 from copy import deepcopy
+from functools import partial
+from itertools import chain, islice
 
 import six
+from six.moves import queue
+from syncano import json_codec
 from syncano.connection import ConnectionMixin
 from syncano.exceptions import SyncanoRequestError, SyncanoValidationError, SyncanoValueError
 from syncano.models.bulk import ModelBulkCreate, ObjectBulkCreate
@@ -9,6 +15,11 @@ from syncano.models.manager_mixins import ArrayOperationsMixin, IncrementMixin,
 
 from .registry import registry
 
+if six.PY3:
+    from urllib.parse import urlencode
+else:
+    from urllib import urlencode
+
 # The maximum number of items to display in a Manager.__repr__
 REPR_OUTPUT_SIZE = 20
 
@@ -24,10 +35,29 @@ class ManagerDescriptor(object):
         return self.manager.all()
 
 
+class BulkResponse(dict):
+    """
+    Result of :meth:`~syncano.models.manager.Manager.in_bulk`, a dict of all requested ids.
+
+    :ivar found: A dict of found ids and their objects
+    :ivar missing: A dict of ids which don't exist and their 404 responses
+    :ivar failed: A dict of ids which couldn't be fetched, e.g. throttled or failed batch requests,
+        and their error responses
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(BulkResponse, self).__init__(*args, **kwargs)
+        self.found = {}
+        self.missing = {}
+        self.failed = {}
+
+
 class Manager(ConnectionMixin):
     """Base class responsible for all ORM (``please``) actions."""
 
     BATCH_URI = '/v1.1/instances/{name}/batch/'
+    # Maximum number of requests in a single batch call
+    BATCH_SIZE = 50
 
     def __init__(self):
         self.name = None
@@ -46,6 +76,9 @@ class Manager(ConnectionMixin):
         self._serialize = True
         self._connection = None
         self._template = None
+        self._stream = None
+        self._prefetch = None
+        self._initial_response = None
 
     def __repr__(self):  # pragma: no cover
         data = list(self[:REPR_OUTPUT_SIZE + 1])
@@ -65,6 +98,11 @@ class Manager(ConnectionMixin):
     def __iter__(self):  # pragma: no cover
         return iter(self.iterator())
 
+    def __aiter__(self):  # pragma: no cover
+        # Workaround for Python 2 syntax compatibility
+        from syncano.aio import manager_iterator
+        return manager_iterator(self)
+
     def __nonzero__(self):
         try:
             self[0]
@@ -100,6 +138,11 @@ class Manager(ConnectionMixin):
         manager.limit(k + 1)
         return list(manager)[k]
 
+    @property
+    def is_async(self):
+        """Tells if manager terminals return awaitables, see :mod:`syncano.aio`."""
+        return getattr(self.connection, 'is_async', False) is True
+
     def _set_default_properties(self, endpoint_properties):
         for field in self.model._meta.fields:
 
@@ -116,7 +159,10 @@ class Manager(ConnectionMixin):
     def batch(self, *args):
         """
         A convenience method for making a batch request. Only create, update and delete manager method are supported.
-        Batch request are limited to 50. So the args length should be equal or less than 50.
+        The API handles up to 50 requests per batch, so larger batches are split into chunks of 50 requests,
+        sent concurrently within the adaptive concurrency limit of the instance. Results are always in order
+        of the arguments; a failed chunk request of a split batch is reported as an error response
+        of each of its requests.
 
         Usage::
 
@@ -185,6 +231,88 @@ class Manager(ConnectionMixin):
         # firstly turn off lazy mode:
         self.is_lazy = False
 
+        meta, requests = self._get_batch_requests(args)
+
+        if self.is_async:
+            # Workaround for Python 2 syntax compatibility
+            from syncano.aio import manager_batch
+            return manager_batch(self, meta, requests)
+
+        response = []
+        for _, _, chunk_response in self._send_batch_chunks(requests):
+            response.extend(chunk_response)
+        return self._populate_batch_response(meta, response)
+
+    def iter_batch(self, *args):
+        """
+        Streaming variant of :meth:`batch`, which yields results as soon as their chunk of the batch completes,
+        so processing can start before the whole batch is done. Every result is populated only when it is
+        yielded, and none of them is kept, so huge batches don't hold all results in memory.
+
+        Usage::
+
+            requests = [klass.objects.as_batch().create(arg=i) for i in range(500)]
+            for index, result in Object.please.iter_batch(*requests):
+                ...
+
+        :rtype: generator
+        :return: ``(index, result)`` tuples, where ``index`` is the position of the related batch argument
+        """
+        if self.is_async:
+            raise SyncanoValueError('iter_batch is not supported by asynchronous connections.')
+
+        self.is_lazy = False
+
+        meta, requests = self._get_batch_requests(args)
+        for offset, _, chunk_response in self._send_batch_chunks(requests, ordered=False):
+            for index, result in enumerate(chunk_response, offset):
+                yield index, self._populate_batch_result(meta[index], result)
+
+    def _send_batch_chunks(self, requests, ordered=True, instance_name=None):
+        # requests can be a generator, chunks are taken from it only when they are about to be sent
+        instance_name = instance_name or registry.instance_name
+        chunks = self._get_batch_chunks(requests)
+        first, second = next(chunks, None), next(chunks, None)
+        if first is None:
+            return
+
+        if second is None:  # errors of a single batch request are raised as they are
+            offset, chunk = first
+            yield offset, chunk, self._send_batch_request(chunk, instance_name)
+            return
+
+        controller = self.connection.get_concurrency_controller(instance_name)
+        send_chunk = partial(self._send_batch_chunk, instance_name=instance_name)
+        for _, result in controller.imap(send_chunk, chain([first, second], chunks), ordered=ordered):
+            yield result
+
+    @classmethod
+    def _get_batch_chunks(cls, requests):
+        requests = iter(requests)
+        offset = 0
+        while True:
+            chunk = list(islice(requests, cls.BATCH_SIZE))
+            if not chunk:
+                return
+            yield offset, chunk
+            offset += len(chunk)
+
+    def _send_batch_chunk(self, chunk, instance_name=None):
+        offset, requests = chunk
+        try:
+            return offset, requests, self._send_batch_request(requests, instance_name)
+        except SyncanoRequestError as e:
+            return offset, requests, [{'code': e.status_code, 'content': {'detail': e.reason}} for _ in requests]
+
+    def _send_batch_request(self, requests, instance_name=None):
+        return self.connection.request(
+            'POST',
+            self.BATCH_URI.format(name=instance_name or registry.instance_name),
+            **{'data': {'requests': requests}}
+        )
+
+    @classmethod
+    def _get_batch_requests(cls, args):
         meta = []
         requests = []
         for arg in args:
@@ -195,26 +323,19 @@ class Manager(ConnectionMixin):
             else:
                 meta.append(arg['meta'])
                 requests.append(arg['body'])
+        return meta, requests
 
-        response = self.connection.request(
-            'POST',
-            self.BATCH_URI.format(name=registry.instance_name),
-            **{'data': {'requests': requests}}
-        )
-
-        populated_response = []
-
-        for meta, res in zip(meta, response):
-            if res['code'] in [200, 201]:  # success response: update or create;
-                content = res['content']
-                model = meta['model']
-                properties = meta['properties']
-                content.update(properties)
-                populated_response.append(model(**content))
-            else:
-                populated_response.append(res)
+    @classmethod
+    def _populate_batch_response(cls, meta, response):
+        return [cls._populate_batch_result(item_meta, result) for item_meta, result in zip(meta, response)]
 
-        return populated_response
+    @classmethod
+    def _populate_batch_result(cls, meta, result):
+        if result['code'] in [200, 201]:  # success response: update or create;
+            content = result['content']
+            content.update(meta['properties'])
+            return meta['model'](**content)
+        return result
 
     # Object actions
     def create(self, **kwargs):
@@ -257,12 +378,24 @@ class Manager(ConnectionMixin):
                 User(username='user_b', password='4321')
             )
 
-        Warning::
-
-            This method is restricted to handle 50 objects at once.
+        Objects are created with :meth:`batch`, so any number of them can be created at once.
         """
         return ModelBulkCreate(objects, self).process()
 
+    def iter_bulk_create(self, *objects):
+        """
+        Streaming variant of :meth:`bulk_create`, see :meth:`iter_batch`.
+
+        Usage::
+
+            for index, user in instance.users.iter_bulk_create(*users):
+                ...
+
+        :rtype: generator
+        :return: ``(index, result)`` tuples, where ``index`` is the position of the related object
+        """
+        return ModelBulkCreate(objects, self).iter_process()
+
     @clone
     def get(self, *args, **kwargs):
         """
@@ -279,7 +412,7 @@ class Manager(ConnectionMixin):
         return self.request()
 
     @clone
-    def in_bulk(self, object_ids_list, **kwargs):
+    def in_bulk(self, object_ids_list, raw=False, **kwargs):
         """
         A method which allows to bulk get objects;
 
@@ -303,34 +436,53 @@ class Manager(ConnectionMixin):
 
             {1: <SyncanoTestClassObject: 1>, 2: {u'content': {u'detail': u'Not found.'}, u'code': 404}}
 
+        Any number of ids can be passed, they are split into batch calls of 50 ids sent concurrently.
+        Found, missing and failed ids are also available separately::
+
+            res.found
+            > {1: <SyncanoTestClassObject: 1>}
+            res.missing
+            > {2: {u'content': {u'detail': u'Not found.'}, u'code': 404}}
+            res.failed
+            > {}
 
         :param object_ids_list: This list expects the primary keys - id in api, a names, ids can be used here;
-        :return: a dict in which keys are the object_ids_list elements, and values are a populated objects;
+        :param raw: If ``True`` found objects are returned as raw dicts instead of populated objects;
+        :return: a :class:`~syncano.models.manager.BulkResponse` in which keys are the object_ids_list elements,
+         and values are a populated objects;
         """
         self.properties.update(kwargs)
         path, defaults = self._get_endpoint_properties()
+        # duplicated ids would only waste batch requests
+        object_ids = list(OrderedDict.fromkeys(object_ids_list))
         requests = [
-            {'method': 'GET', 'path': '{path}{id}/'.format(path=path, id=object_id)} for object_id in object_ids_list
+            {'method': 'GET', 'path': '{path}{id}/'.format(path=path, id=object_id)} for object_id in object_ids
         ]
 
-        response = self.connection.request(
-            'POST',
-            self.BATCH_URI.format(name=registry.instance_name),
-            **{'data': {'requests': requests}}
-        )
-
-        bulk_response = {}
-
-        for object_id, object in zip(object_ids_list, response):
-            if object['code'] == 200:
-                data = object['content'].copy()
-                data.update(self.properties)
-                bulk_response[object_id] = self.model(**data)
-            else:
-                bulk_response[object_id] = object
-
+        bulk_response = BulkResponse()
+        for offset, _, chunk_response in self._send_batch_chunks(requests, ordered=False):
+            for object_id, object in zip(object_ids[offset:], chunk_response):
+                if object['code'] == 200:
+                    bulk_response.found[object_id] = self._get_bulk_object(object['content'], raw)
+                elif object['code'] == 404:
+                    bulk_response.missing[object_id] = object
+                else:  # e.g. a throttled request or a failed batch chunk, the object may exist
+                    bulk_response.failed[object_id] = object
+
+        for object_id in object_ids:
+            for results in (bulk_response.found, bulk_response.missing, bulk_response.failed):
+                if object_id in results:
+                    bulk_response[object_id] = results[object_id]
+                    break
         return bulk_response
 
+    def _get_bulk_object(self, content, raw):
+        if raw:
+            return content
+        data = content.copy()
+        data.update(self.properties)
+        return self.model(**data)
+
     def detail(self, *args, **kwargs):
         """
         Wrapper around ``get`` method.
@@ -449,21 +601,8 @@ class Manager(ConnectionMixin):
             path, defaults = self._get_endpoint_properties()
             return [self.model.batch_object(method=self.method, path=path, body=serialized, properties=defaults)]
 
-        instances = []  # ObjectManager context;
-        for obj in self:
-            self._filter(*(), **kwargs)
-            serialized = self._get_serialized_data()
-            self.properties.update({'id': obj.id})
-            path, defaults = self._get_endpoint_properties()
-            updated_instance = self.model.batch_object(method=self.method, path=path, body=serialized,
-                                                       properties=defaults)
-
-        instances.append(updated_instance)  # always a batch structure here;
-
-        if not self.is_lazy:
-            instances = self.batch(instances)
-
-        return instances
+        # update of objects matching a query, see ObjectManager;
+        raise SyncanoValueError('Only data objects can be updated by a query.')
 
     @clone
     def old_update(self, *args, **kwargs):
@@ -661,6 +800,43 @@ class Manager(ConnectionMixin):
         self._template = name
         return self
 
+    @clone
+    def stream(self, chunk_size=8192):
+        """
+        Enables streaming iteration: list pages are parsed incrementally while they are downloaded,
+        so the first object is available before the whole page arrives and only one object
+        is held in memory at once instead of the whole page.
+
+        Usage::
+
+            for book in Object.please.list(class_name='books').page_size(500).stream():
+                ...
+        """
+        if not chunk_size or not isinstance(chunk_size, six.integer_types):
+            raise SyncanoValueError('chunk_size value needs to be an int.')
+
+        self._stream = chunk_size
+        return self
+
+    @clone
+    def prefetch(self, pages=1):
+        """
+        Enables prefetching: next pages of the list are requested in a background thread
+        while objects of the current page are yielded, so network latency overlaps with their processing.
+        At most ``pages`` pages are fetched ahead of the iteration and pages past the ``limit`` are never requested.
+        Streaming iteration, if enabled, takes precedence over prefetching.
+
+        Usage::
+
+            for book in Object.please.list(class_name='books').page_size(500).prefetch(pages=2):
+                ...
+        """
+        if not pages or not isinstance(pages, six.integer_types):
+            raise SyncanoValueError('pages value needs to be an int.')
+
+        self._prefetch = pages
+        return self
+
     @clone
     def using(self, connection):
         """
@@ -712,6 +888,9 @@ class Manager(ConnectionMixin):
         manager.model = self.model
         manager._connection = self._connection
         manager._template = self._template
+        manager._stream = self._stream
+        manager._prefetch = self._prefetch
+        # a fetched first page belongs only to the manager it was fetched for, clones can change the query
         manager.endpoint = self.endpoint
         manager.properties = deepcopy(self.properties)
         manager._limit = self._limit
@@ -755,6 +934,37 @@ class Manager(ConnectionMixin):
 
     def request(self, method=None, path=None, **request):
         """Internal method, which calls Syncano API and returns serialized data."""
+        method, path = self._prepare_request(method, path, request)
+
+        if self.is_async:
+            # Workaround for Python 2 syntax compatibility
+            from syncano.aio import manager_request
+            return manager_request(self, method, path, **request)
+
+        try:
+            batch_path = self._get_coalesced_batch_path(method, request)
+            if batch_path is not None:
+                response = self.connection.coalescer.get(batch_path, path)
+            else:
+                response = self.connection.request(method, path, **request)
+        except SyncanoRequestError as e:
+            self._handle_request_error(e, path)
+            raise
+
+        return self._process_response(response)
+
+    def _get_coalesced_batch_path(self, method, request):
+        # only plain ``get`` requests of objects within an instance can be sent in a batch
+        if self.connection.coalescer is None or method.upper() != 'GET' or self.endpoint != 'detail':
+            return
+        if request.get('params') or request.get('data') or request['headers']:
+            return
+
+        instance_name = self._get_endpoint_properties()[1].get('instance_name')
+        if instance_name:
+            return self.BATCH_URI.format(name=instance_name)
+
+    def _prepare_request(self, method, path, request):
         meta = self.model._meta
         method = method or self.method
         allowed_methods = meta.get_endpoint_methods(self.endpoint)
@@ -768,14 +978,16 @@ class Manager(ConnectionMixin):
 
         self.build_request(request)
 
-        try:
-            response = self.connection.request(method, path, **request)
-        except SyncanoRequestError as e:
-            if e.status_code == 404:
-                obj_id = path.rsplit('/')[-2]
-                raise self.model.DoesNotExist("{} not found.".format(obj_id))
-            raise
+        if meta.cache_ttl is not None and method.upper() == 'GET':
+            request.setdefault('cache_ttl', meta.cache_ttl)
+        return method, path
+
+    def _handle_request_error(self, error, path):
+        if error.status_code == 404:
+            obj_id = path.rsplit('/')[-2]
+            raise self.model.DoesNotExist("{} not found.".format(obj_id))
 
+    def _process_response(self, response):
         if 'next' not in response and not self._template:
             return self.serialize(response)
 
@@ -795,6 +1007,16 @@ class Manager(ConnectionMixin):
     def iterator(self):
         """Pagination handler"""
 
+        if self._can_stream():
+            for obj in self._stream_iterator():
+                yield obj
+            return
+
+        if self._prefetch and not self._template:
+            for obj in self._prefetch_iterator():
+                yield obj
+            return
+
         response = self._get_response()
         results = 0
         while True:
@@ -817,7 +1039,109 @@ class Manager(ConnectionMixin):
             response = self.request(path=next_url)
 
     def _get_response(self):
-        return self.request()
+        return self._initial_response or self.request()
+
+    def _get_page_request(self):
+        # batch requests can't carry headers, so templates are not supported
+        if self._template:
+            raise SyncanoValueError('Template responses can not be fetched in a batch request.')
+
+        request = {}
+        method, path = self._prepare_request('GET', None, request)
+        query = [(k, v) for k, v in sorted(six.iteritems(request.get('params') or {})) if v is not None]
+        if query:
+            path = '{0}?{1}'.format(path, urlencode(query))
+        return {'method': method, 'path': path}
+
+    def _can_stream(self):
+        # the first page could be already fetched, e.g. by ``fetch_many``
+        return self._stream is not None and not self._template and self._initial_response is None
+
+    def _stream_iterator(self):
+        path = None
+        results = 0
+        while True:
+            response = self._stream_request(path)
+            parser = json_codec.PageParser(response.iter_content(self._stream))
+            objects = 0
+            try:
+                for o in parser:
+                    if self._limit and results >= self._limit:
+                        break
+
+                    objects += 1
+                    results += 1
+                    yield self.serialize(o)
+            finally:
+                response.close()
+
+            path = parser.fields.get('next')
+            if not objects or not path or (self._limit and results >= self._limit):
+                break
+
+    def _prefetch_iterator(self):
+        pages = queue.Queue()
+        slots = threading.Semaphore(self._prefetch)
+        stop = threading.Event()
+
+        controller = self.connection.get_concurrency_controller(self.properties.get('instance_name'))
+        thread = threading.Thread(target=self._prefetch_worker, args=(pages, slots, stop, controller))
+        thread.daemon = True
+        thread.start()
+
+        results = 0
+        try:
+            while True:
+                response, error = pages.get()
+                slots.release()
+                if error is not None:
+                    raise error
+                if response is None:
+                    return
+
+                for o in response.get('objects'):
+                    if self._limit and results >= self._limit:
+                        return
+
+                    results += 1
+                    yield self.serialize(o)
+        finally:
+            stop.set()
+            slots.release()  # wakes up the worker waiting for a free slot
+
+    def _prefetch_worker(self, pages, slots, stop, controller):
+        fetched = 0
+        next_url = None
+        try:
+            while True:
+                slots.acquire()
+                if stop.is_set():
+                    return
+
+                with controller.slot():
+                    response = self.request(path=next_url) if next_url else self._get_response()
+                objects = response.get('objects')
+                fetched += len(objects or ())
+                pages.put((response, None))
+
+                next_url = response.get('next')
+                # pages past the limit are never requested
+                if not objects or not next_url or (self._limit and fetched >= self._limit):
+                    break
+        except Exception as e:
+            pages.put((None, e))
+            return
+        pages.put((None, None))
+
+    def _stream_request(self, path=None):
+        request = {}
+        method, path = self._prepare_request(None, path, request)
+
+        try:
+            return self.connection.stream_request(method, path, **request)
+        except SyncanoRequestError as e:
+            self._handle_request_error(e, path)
+            raise
 
     def _get_instance(self, attrs):
         return self.model(**attrs)
@@ -890,10 +1214,6 @@ class ObjectManager(IncrementMixin, ArrayOperationsMixin, Manager):
         'ieq', 'near',
     ]
 
-    def __init__(self):
-        super(ObjectManager, self).__init__()
-        self._initial_response = None
-
     def serialize(self, data, model=None):
         model = model or self.model.get_subclass_model(**self.properties)
         return super(ObjectManager, self).serialize(data, model)
@@ -945,6 +1265,202 @@ class ObjectManager(IncrementMixin, ArrayOperationsMixin, Manager):
         return self, self._initial_response['objects_count']
 
     @clone
+    def parallel_scan(self, shards=4, ordered=False):
+        """
+        Scans the list with many concurrent requests: the id range of matching objects is probed
+        and split into ``shards`` equal id ranges, which are fetched in parallel, within
+        the adaptive concurrency limit of the instance.
+
+        Usage::
+
+            for book in Object.please.list('instance-name', 'books').filter(pages__gt=100).parallel_scan(shards=8):
+                ...
+
+        :type shards: int
+        :param shards: Number of id ranges fetched in parallel
+
+        :type ordered: bool
+        :param ordered: Yield objects ordered by id, otherwise as soon as their pages are downloaded
+
+        :rtype: generator
+        """
+        if not shards or not isinstance(shards, six.integer_types):
+            raise SyncanoValueError('shards value needs to be an int.')
+
+        low = self._get_boundary_id('id')
+        if low is None:
+            return
+        span = self._get_boundary_id('-id') + 1 - low
+        shards = min(shards, span)
+        bounds = [low + span * i // shards for i in range(shards + 1)]
+
+        # ordered scan reads shards one by one, others are downloaded in the background meanwhile
+        pages = [queue.Queue(maxsize=2) for _ in range(shards)] if ordered else [queue.Queue(maxsize=2 * shards)]
+        stop = threading.Event()
+        controller = self.connection.get_concurrency_controller(self.properties.get('instance_name'))
+        for i in range(shards):
+            thread = threading.Thread(target=self._scan_shard,
+                                      args=(bounds[i], bounds[i + 1], pages[i % len(pages)], stop, controller))
+            thread.daemon = True
+            thread.start()
+
+        results = 0
+        try:
+            for shard_pages in pages:
+                for obj in self._read_shard_pages(shard_pages, 1 if ordered else shards):
+                    if self._limit and results >= self._limit:
+                        return
+
+                    results += 1
+                    yield obj
+        finally:
+            stop.set()
+
+    def _get_boundary_id(self, order_by):
+        manager = self._clone()
+        manager.method = 'GET'
+        manager.endpoint = 'list'
+        manager.query.update({'order_by': order_by, 'page_size': 1})
+        objects = manager.request().get('objects')
+        return objects[0]['id'] if objects else None
+
+    def _scan_shard(self, start, end, pages, stop, controller):
+        manager = self._clone()
+        manager.method = 'GET'
+        manager.endpoint = 'list'
+
+        query = json_codec.loads(manager.query['query']) if manager.query.get('query') else {}
+        # the shard range is within the probed range, so it narrows other id lookups of the filter
+        query.setdefault('id', {}).update({'_gte': start, '_lt': end})
+        manager.query.update({'query': json_codec.dumps(query), 'order_by': 'id'})
+
+        next_url = None
+        try:
+            while not stop.is_set():
+                with controller.slot():
+                    response = manager.request(path=next_url)
+                objects = response.get('objects') or []
+                if not self._put_page(pages, ([manager.serialize(o) for o in objects], None), stop):
+                    return
+
+                next_url = response.get('next')
+                if not objects or not next_url:
+                    break
+        except Exception as e:
+            self._put_page(pages, (None, e), stop)
+            return
+        self._put_page(pages, (None, None), stop)
+
+    @classmethod
+    def _put_page(cls, pages, page, stop):
+        # gives up when the scan is abandoned, instead of blocking on the full queue forever
+        while not stop.is_set():
+            try:
+                pages.put(page, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @classmethod
+    def _read_shard_pages(cls, pages, shards):
+        while shards:
+            objects, error = pages.get()
+            if error is not None:
+                raise error
+            if objects is None:
+                shards -= 1
+                continue
+
+            for obj in objects:
+                yield obj
+
+    @clone
+    def new_update(self, **kwargs):
+        """
+        Updates all objects matching the :meth:`filter` query with the same values. Matching ids are listed page by page
+        and updated with concurrent batch requests of 50 objects, so objects are never held in memory.
+
+        Usage::
+
+            result = Object.please.list('instance-name', 'books').filter(year__lt=1900).update(classic=True)
+
+        The return value is a dict with a number of ``updated`` objects and ``failed`` dict of ids
+        and error responses of objects which couldn't be updated; in batch mode (``as_batch()``)
+        it is a list of batch requests, one per matching object.
+        """
+        if self._filter_kwargs:
+            return super(ObjectManager, self).new_update(**kwargs)
+
+        if self.query.get('query') is None:  # e.g. only page_size() was set, never update the whole class
+            raise SyncanoValueError('Updating objects by a query requires filter().')
+
+        model = self.model.get_subclass_model(**self.properties)
+        model_fields = [field.name for field in model._meta.fields if not field.has_endpoint_data]
+        for field_name in kwargs:
+            if field_name not in model_fields:
+                raise SyncanoValueError('This model has not field {}'.format(field_name))
+
+        serialized = model(**dict(self.properties, **kwargs)).to_native()
+        body = {k: v for k, v in six.iteritems(serialized) if k in kwargs}
+
+        self.endpoint = 'detail'
+        return self._bulk_operation(model, self.get_allowed_method('PATCH', 'PUT', 'POST'), body, 'updated')
+
+    def delete(self, *args, **kwargs):
+        """
+        Removes single object based on provided arguments or, after :meth:`filter`,
+        all objects matching the query, with concurrent batch requests of 50 objects.
+
+        Usage::
+
+            Object.please.delete(id=1, instance_name='instance-name', class_name='books')
+            result = Object.please.list('instance-name', 'books').filter(year__lt=1900).delete()
+
+        Deletion by a query returns a dict with a number of ``deleted`` objects and ``failed`` dict of ids
+        and error responses of objects which couldn't be deleted.
+        """
+        if args or kwargs or self.query.get('query') is None:
+            return super(ObjectManager, self).delete(*args, **kwargs)
+
+        model = self.model.get_subclass_model(**self.properties)
+        return self._bulk_operation(model, 'DELETE', {}, 'deleted')
+
+    def _bulk_operation(self, model, method, body, result_key):
+        requests = (model.batch_object(method=method, path=self._get_object_path(model, object_id), body=body,
+                                       properties=dict(self.properties, id=object_id))
+                    for object_id in self._iter_matching_ids())
+
+        if self.is_lazy:
+            return list(requests)
+
+        result = {result_key: 0, 'failed': {}}
+        bodies = (request['body'] for request in requests)
+        for _, chunk, response in self._send_batch_chunks(bodies, instance_name=self.properties.get('instance_name')):
+            for request, request_response in zip(chunk, response):
+                if request_response['code'] in (200, 201, 204):
+                    result[result_key] += 1
+                else:
+                    result['failed'][self._get_object_id(request['path'])] = request_response
+        return result
+
+    def _iter_matching_ids(self):
+        manager = self._clone()
+        manager.method = 'GET'
+        manager.endpoint = 'list'
+        manager.query['fields'] = 'id'  # keeps pages tiny
+        manager._serialize = False
+
+        for obj in manager.iterator():
+            yield obj['id']
+
+    def _get_object_path(self, model, object_id):
+        return model._meta.resolve_endpoint('detail', dict(self.properties, id=object_id))
+
+    @classmethod
+    def _get_object_id(cls, path):
+        return int(path.rstrip('/').rsplit('/', 1)[-1])
+
     def filter(self, **kwargs):
         """
         Special method just for data object :class:`~syncano.models.base.Object` model.
@@ -955,7 +1471,7 @@ class ObjectManager(IncrementMixin, ArrayOperationsMixin, Manager):
         """
 
         query = self._build_query(query_data=kwargs)
-        self.query['query'] = json.dumps(query)
+        self.query['query'] = json_codec.dumps(query)
         self.method = 'GET'
         self.endpoint = 'list'
         return self
@@ -1041,8 +1557,19 @@ class ObjectManager(IncrementMixin, ArrayOperationsMixin, Manager):
         """
         return ObjectBulkCreate(objects, self).process()
 
-    def _get_response(self):
-        return self._initial_response or self.request()
+    def iter_bulk_create(self, *objects):
+        """
+        Streaming variant of :meth:`bulk_create`, which yields created objects as soon as their chunk
+        of the batch completes.
+        Usage::
+
+            for index, book in Object.please.iter_bulk_create(*books):
+                ...
+
+        :param objects: a list of the instances of data objects to be created;
+        :return: a generator of ``(index, result)`` tuples, where ``index`` is the position of the related object;
+        """
+        return ObjectBulkCreate(objects, self).iter_process()
 
     def _get_instance(self, attrs):
         return self.model.get_subclass_model(**attrs)(**attrs)
@@ -1117,11 +1644,6 @@ class ObjectManager(IncrementMixin, ArrayOperationsMixin, Manager):
         self.query['order_by'] = field
         return self
 
-    def _clone(self):
-        manager = super(ObjectManager, self)._clone()
-        manager._initial_response = self._initial_response
-        return manager
-
 
 class SchemaManager(object):
     """
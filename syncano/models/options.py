@@ -33,6 +33,9 @@ class Options(ConnectionMixin):
 
         self.pk = None
 
+        # TTL of responses cached by :class:`~syncano.cache.ResponseCache`, ``None`` means the cache default
+        self.cache_ttl = None
+
         if meta:
             meta_attrs = meta.__dict__.copy()
             for name in meta.__dict__:
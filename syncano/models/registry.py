@@ -4,6 +4,7 @@ import re
 
 import six
 from syncano import logger
+from syncano.exceptions import SyncanoValueError
 
 
 class Registry(object):
@@ -101,6 +102,46 @@ class Registry(object):
     def set_default_connection(self, default_connection):
         self._default_connection = default_connection
 
+    def fetch_many(self, *managers):
+        """
+        Fetches the first pages of many list queries, e.g. of different classes, in a single batch request.
+
+        Usage::
+
+            books, authors, scripts = registry.fetch_many(
+                Object.please.list(class_name='books').filter(year__gte=2000),
+                Object.please.list(class_name='authors').page_size(10),
+                Script.please.list(),
+            )
+
+            for book in books:  # further pages are fetched lazily
+                ...
+
+        :param managers: List managers of a single instance, the batch request is sent through the first one
+        :return: a list with copies of the managers holding their first pages, which are iterated as usual;
+         a raw response from server is returned instead of a manager whose request failed
+        """
+        managers = [manager._clone() for manager in managers]
+        if not managers:
+            return []
+        if managers[0].is_async:
+            raise SyncanoValueError('fetch_many is not supported by asynchronous connections.')
+
+        instance_names = set(manager._get_endpoint_properties()[1].get('instance_name') for manager in managers)
+        if len(instance_names) != 1 or None in instance_names:
+            raise SyncanoValueError('fetch_many needs managers of a single instance.')
+        instance_name = instance_names.pop()
+
+        requests = [manager._get_page_request() for manager in managers]
+        results = list(managers)
+        for offset, _, chunk_response in managers[0]._send_batch_chunks(requests, instance_name=instance_name):
+            for index, response in enumerate(chunk_response, offset):
+                if response['code'] == 200:
+                    managers[index]._initial_response = response['content']
+                else:
+                    results[index] = response
+        return results
+
     @property
     def connection(self):
         if not self._default_connection:
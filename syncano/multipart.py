@@ -0,0 +1,148 @@
+import binascii
+import io
+import os
+
+import six
+from syncano import json_codec
+
+__all__ = ['MultipartEncoder', 'encode_field']
+
+
+def encode_field(value):
+    """Converts value of a JSON request field to a ``multipart/form-data`` field value."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (dict, list)):
+        return json_codec.dumps(value)
+    return six.text_type(value)
+
+
+class MultipartEncoder(object):
+    """Streaming ``multipart/form-data`` request body.
+
+    Files are read from disk in ``chunk_size`` blocks while the body is sent, instead of
+    being loaded into memory, and the total length is known upfront, so the body is sent
+    with ``Content-Length`` rather than chunked. The encoder is a file-like object accepted
+    by all transports; :meth:`reset` rewinds it, e.g. before a retry, without reopening files.
+
+    Usage::
+
+        body = MultipartEncoder({'name': 'test'}, {'logo': open('logo.png', 'rb')})
+        requests.post(url, data=body, headers={'content-type': body.content_type})
+
+    :ivar fields: Form fields, ``None`` values are skipped
+    :ivar files: Files, either file objects or ``(filename, file, content_type, headers)`` tuples
+    :ivar content_type: ``Content-Type`` header value of the body
+    :ivar callback: Optional progress callback, called with number of bytes read so far and the total length
+    """
+
+    def __init__(self, fields, files, boundary=None, chunk_size=64 * 1024, callback=None):
+        self.boundary = boundary or binascii.hexlify(os.urandom(16)).decode('ascii')
+        self.content_type = 'multipart/form-data; boundary={0}'.format(self.boundary)
+        self.chunk_size = chunk_size
+        self.callback = callback
+
+        self._parts = []
+        for name, value in six.iteritems(fields or {}):
+            if value is not None:
+                self._parts.append(self._get_header(name) + encode_field(value).encode('utf-8') + b'\r\n')
+
+        for name, value in six.iteritems(files):
+            self._parts.extend(self._get_file_parts(name, value))
+
+        self._parts.append('--{0}--\r\n'.format(self.boundary).encode('ascii'))
+        self._length = sum(len(part) if isinstance(part, bytes) else part[2] for part in self._parts)
+        self.reset()
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        self.reset()
+        return iter(lambda: self.read(self.chunk_size), b'')
+
+    def _get_header(self, name, filename=None, content_type=None, headers=None):
+        lines = ['--{0}'.format(self.boundary)]
+        disposition = 'Content-Disposition: form-data; name="{0}"'.format(name)
+        if filename is not None:
+            disposition = '{0}; filename="{1}"'.format(disposition, filename)
+        lines.append(disposition)
+
+        if content_type:
+            lines.append('Content-Type: {0}'.format(content_type))
+        for header in six.iteritems(headers or {}):
+            lines.append('{0}: {1}'.format(*header))
+
+        return '\r\n'.join(lines + ['', '']).encode('utf-8')
+
+    def _get_file_parts(self, name, value):
+        if isinstance(value, tuple):  # (filename, file, content_type, headers)
+            filename, file_object = os.path.basename(value[0]), value[1]
+            content_type = value[2] if len(value) > 2 else None
+            headers = value[3] if len(value) > 3 else None
+        else:
+            filename = getattr(value, 'name', None)
+            filename = os.path.basename(filename) if isinstance(filename, six.string_types) else name
+            file_object, content_type, headers = value, 'application/octet-stream', None
+
+        if isinstance(file_object, six.text_type):
+            file_object = file_object.encode('utf-8')
+        if isinstance(file_object, bytes):
+            file_object = io.BytesIO(file_object)
+
+        try:
+            offset = file_object.tell()
+            size = os.fstat(file_object.fileno()).st_size - offset
+        except (AttributeError, OSError, IOError, io.UnsupportedOperation):
+            try:
+                offset = file_object.tell()
+                file_object.seek(0, os.SEEK_END)
+                size = file_object.tell() - offset
+                file_object.seek(offset)
+            except (AttributeError, OSError, IOError, io.UnsupportedOperation):
+                # not seekable stream, it has to be read into memory
+                file_object = io.BytesIO(file_object.read())
+                offset, size = 0, len(file_object.getvalue())
+
+        return [self._get_header(name, filename, content_type, headers), (file_object, offset, size), b'\r\n']
+
+    def _iter_chunks(self):
+        for part in self._parts:
+            if isinstance(part, bytes):
+                yield part
+                continue
+
+            file_object, offset, size = part
+            file_object.seek(offset)
+            while size > 0:
+                chunk = file_object.read(min(self.chunk_size, size))
+                if not chunk:
+                    break
+                size -= len(chunk)
+                yield chunk
+
+    def reset(self):
+        """Rewinds the body to the beginning."""
+        self._chunks = self._iter_chunks()
+        self._buffer = bytearray()
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            data = bytes(self._buffer) + b''.join(self._chunks)
+            self._buffer = bytearray()
+        else:
+            while len(self._buffer) < size:
+                chunk = next(self._chunks, None)
+                if chunk is None:
+                    break
+                self._buffer += chunk
+
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+
+        if data:
+            self.bytes_read += len(data)
+            if self.callback is not None:
+                self.callback(self.bytes_read, self._length)
+        return data
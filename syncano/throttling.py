@@ -0,0 +1,235 @@
+import hashlib
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from syncano.exceptions import SyncanoValueError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+__all__ = ['ThrottleCoordinator', 'MemoryThrottleStore', 'FileThrottleStore', 'default_throttle',
+           'RateLimiter', 'INTERACTIVE', 'BULK', 'priority', 'get_priority']
+
+
+class MemoryThrottleStore(object):
+    """Keeps throttling state of API keys in memory, shared by all threads of the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states = {}
+
+    @contextmanager
+    def state(self, key):
+        """Locks and yields mutable ``{'paused_until': float, 'next_slot': float}`` state of the key."""
+        with self._lock:
+            state = self._states.setdefault(key, {'paused_until': 0.0, 'next_slot': 0.0})
+            yield state
+
+
+class FileThrottleStore(object):
+    """Keeps throttling state of API keys in files guarded by ``fcntl`` locks,
+    so it is shared by all processes which use the same directory.
+
+    :ivar path: Directory for state files
+    """
+
+    def __init__(self, path):
+        if fcntl is None:  # pragma: no cover
+            raise SyncanoValueError('FileThrottleStore requires fcntl module.')
+
+        self.path = path
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self._lock = threading.Lock()
+
+    def get_filename(self, key):
+        return os.path.join(self.path, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    @contextmanager
+    def state(self, key):
+        """Locks and yields mutable ``{'paused_until': float, 'next_slot': float}`` state of the key."""
+        # flock is per open file description, threads need an additional lock
+        with self._lock:
+            with open(self.get_filename(key), 'a+') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    values = f.read().split()
+                    state = {'paused_until': 0.0, 'next_slot': 0.0}
+                    if len(values) == 2:
+                        state['paused_until'], state['next_slot'] = float(values[0]), float(values[1])
+                    old_state = state.copy()
+
+                    yield state
+
+                    if state != old_state:
+                        f.seek(0)
+                        f.truncate()
+                        f.write('{paused_until!r} {next_slot!r}'.format(**state))
+                        f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class ThrottleCoordinator(object):
+    """Coordinates reactions to ``429 Too Many Requests`` responses of all requests
+    made with the same API key.
+
+    A throttled response pauses the whole key for ``retry-after`` seconds. When the pause
+    ends, waiting requests are released one by one, ``release_interval`` seconds apart
+    plus a random ``jitter``, instead of retrying all at the same moment.
+    A single request is retried at most ``max_retries`` times, then the 429 error is raised.
+
+    Usage::
+
+        # share throttling between worker processes
+        throttle = ThrottleCoordinator(store=FileThrottleStore('/tmp/syncano-throttle'))
+        connection = syncano.connect(api_key='', throttle=throttle)
+
+    :ivar store: :class:`~syncano.throttling.MemoryThrottleStore` or :class:`~syncano.throttling.FileThrottleStore`
+    :ivar max_retries: Retry budget of a single request
+    :ivar release_interval: Seconds between requests released after a pause
+    :ivar jitter: Upper bound of random seconds added to each delay
+    """
+
+    def __init__(self, store=None, max_retries=5, release_interval=0.05, jitter=0.1):
+        self.store = store or MemoryThrottleStore()
+        self.max_retries = max_retries
+        self.release_interval = release_interval
+        self.jitter = jitter
+
+    def reserve(self, key):
+        """Reserves a send slot for a request made with the given key.
+
+        :rtype: float
+        :return: Seconds to wait before the request can be sent
+        """
+        now = time.time()
+        with self.store.state(key or '') as state:
+            if now >= state['paused_until'] and now >= state['next_slot']:
+                return 0
+
+            slot = max(now, state['paused_until'], state['next_slot'])
+            state['next_slot'] = slot + self.release_interval
+        return slot - now + random.uniform(0, self.jitter)
+
+    def throttled(self, key, retry_after):
+        """Pauses all requests made with the given key.
+
+        :type retry_after: float
+        :param retry_after: Pause length in seconds, usually the ``retry-after`` header value
+        """
+        paused_until = time.time() + retry_after
+        with self.store.state(key or '') as state:
+            if paused_until > state['paused_until']:
+                state['paused_until'] = paused_until
+                state['next_slot'] = paused_until
+
+    def wait(self, key):
+        """Blocks the current thread until a request made with the given key can be sent."""
+        delay = self.reserve(key)
+        if delay > 0:
+            time.sleep(delay)
+
+
+# Shared by all connections of the process, unless other coordinator is passed to the connection;
+default_throttle = ThrottleCoordinator()
+
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+
+_priority = threading.local()
+
+
+@contextmanager
+def priority(value):
+    """Sets default priority class of requests made by the current thread.
+
+    Usage::
+
+        with priority(BULK):
+            for obj in Object.please.list(class_name='books'):
+                ...
+    """
+    previous = getattr(_priority, 'value', None)
+    _priority.value = value
+    try:
+        yield
+    finally:
+        _priority.value = previous
+
+
+def get_priority():
+    """Returns priority class set by :func:`~syncano.throttling.priority`, ``interactive`` by default."""
+    return getattr(_priority, 'value', None) or INTERACTIVE
+
+
+class RateLimiter(object):
+    """Client-side token bucket which keeps requests under ``rate`` requests per second,
+    with bursts of up to ``burst`` requests, separately for each API key and instance.
+
+    Requests of the ``bulk`` priority class additionally draw from their own bucket
+    refilled with ``bulk_share`` of the rate, so bulk jobs (exports, migrations)
+    always leave the rest of the budget to ``interactive`` requests.
+
+    Usage::
+
+        limiter = RateLimiter(rate=20, burst=40)
+        connection = syncano.connect(api_key='', rate_limiter=limiter)
+
+        with priority(BULK):
+            Object.please.list(class_name='books').delete()
+
+    :ivar rate: Requests per second
+    :ivar burst: Bucket size, defaults to ``rate``
+    :ivar bulk_share: Fraction of ``rate`` available to bulk requests
+    """
+
+    def __init__(self, rate, burst=None, bulk_share=0.8):
+        if rate <= 0:
+            raise SyncanoValueError('Rate limit needs to be positive.')
+
+        self.rate = float(rate)
+        self.burst = float(burst or rate)
+        self.bulk_share = bulk_share
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def _take(self, key, now, rate):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = {'tokens': self.burst, 'updated_at': now}
+
+        tokens = min(self.burst, bucket['tokens'] + (now - bucket['updated_at']) * rate) - 1
+        bucket['tokens'] = tokens
+        bucket['updated_at'] = now
+        return -tokens / rate if tokens < 0 else 0
+
+    def reserve(self, key, priority=None):
+        """Takes a token from the bucket of the given key.
+
+        :type priority: string
+        :param priority: ``interactive`` or ``bulk``, defaults to :func:`~syncano.throttling.get_priority`
+
+        :rtype: float
+        :return: Seconds to wait before the request can be sent
+        """
+        priority = priority or get_priority()
+        now = time.time()
+        with self._lock:
+            delay = self._take(key, now, self.rate)
+            if priority == BULK:
+                delay = max(delay, self._take((key, BULK), now, self.rate * self.bulk_share))
+        return delay
+
+    def wait(self, key, priority=None):
+        """Blocks the current thread until a request made with the given key can be sent."""
+        delay = self.reserve(key, priority)
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,331 @@
+import json
+import os
+import time
+
+import requests
+import six
+from requests.adapters import HTTPAdapter
+from syncano import json_codec
+
+try:
+    import urllib3
+except ImportError:  # pragma: no cover
+    from requests.packages import urllib3
+
+try:
+    import certifi
+except ImportError:  # pragma: no cover
+    certifi = None
+
+if six.PY3:
+    from urllib.parse import urlencode
+else:
+    from urllib import urlencode
+
+
+__all__ = ['Response', 'StreamedResponse', 'BaseTransport', 'PooledTransport', 'RequestsTransport', 'Urllib3Transport',
+           'InMemoryTransport']
+
+
+class Response(object):
+    """Minimal HTTP response returned by transports which are not based on ``requests``.
+
+    :ivar status_code: HTTP status code e.g: 200
+    :ivar headers: Response headers
+    :ivar content: Raw response body
+    """
+
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+        if isinstance(content, six.text_type):
+            content = content.encode('utf-8')
+        elif not isinstance(content, six.binary_type):
+            content = json.dumps(content).encode('utf-8')
+        self.content = content
+
+    def __repr__(self):  # pragma: no cover
+        return '<Response [{0}]>'.format(self.status_code)
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json_codec.loads(self.content)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class StreamedResponse(Response):
+    """Response of :class:`~syncano.transports.Urllib3Transport` sent with ``stream=True``,
+    its body is read from the socket by ``iter_content`` or on the first access to ``content``.
+    """
+
+    def __init__(self, status_code, raw, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.raw = raw
+        self._content = None
+
+    @property
+    def content(self):
+        if self._content is None:
+            self._content = self.raw.data
+            self.close()
+        return self._content
+
+    def iter_content(self, chunk_size=1):
+        if self._content is not None:
+            return super(StreamedResponse, self).iter_content(chunk_size)
+        return self.raw.stream(chunk_size)
+
+    def close(self):
+        self.raw.release_conn()
+
+
+class BaseTransport(object):
+    """Base class for all transports used by :class:`~syncano.connection.Connection`.
+
+    A transport sends a single HTTP request and returns an object which exposes
+    ``status_code``, ``headers``, ``content``, ``text`` and ``json()``
+    (see :class:`~syncano.transports.Response`).
+    """
+
+    METHODS = {'get', 'post', 'put', 'patch', 'delete', 'head', 'options'}
+
+    def request(self, method_name, url, **params):
+        """
+        :type method_name: string
+        :param method_name: HTTP request method e.g: GET
+
+        :type url: string
+        :param url: Full request URL
+
+        :param params: Request params built by :func:`~syncano.connection.Connection.build_params`
+
+        :return: HTTP response
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    def pool_stats(self):
+        """Reports utilisation of connection pools, one dict per host pool with
+        ``host``, ``port``, ``maxsize``, ``in_use``, ``idle``, ``utilisation`` (``in_use / maxsize``),
+        ``connections`` (opened so far) and ``requests`` (sent so far) keys.
+
+        :rtype: list
+        """
+        return []
+
+    def close(self):
+        """Releases all resources held by the transport."""
+
+
+class PooledTransport(BaseTransport):
+    """Base class for transports which keep HTTP connections alive in ``urllib3`` pools.
+
+    :ivar pool_connections: Number of per-host connection pools to cache
+    :ivar pool_maxsize: Maximum number of connections kept alive per host
+    :ivar pool_block: Wait for a free connection instead of opening a throwaway one when the pool is exhausted
+    :ivar keep_alive: Reuse connections between requests
+    :ivar idle_timeout: Seconds after which idle pooled connections are dropped instead of reused
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, keep_alive=True, idle_timeout=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.idle_timeout = idle_timeout
+        self._last_request_at = None
+
+    def get_pool_managers(self):
+        """Returns all ``urllib3.PoolManager`` instances used by the transport."""
+        raise NotImplementedError  # pragma: no cover
+
+    def clear_pools(self):
+        """Closes all pooled connections, new ones will be opened on demand."""
+        for pool_manager in self.get_pool_managers():
+            pool_manager.clear()
+
+    def expire_idle_connections(self):
+        """Drops pooled connections which were idle longer than ``idle_timeout``,
+        servers and load balancers close them anyway so reusing them ends with a reset.
+        """
+        now = time.time()
+        if self.idle_timeout is not None and self._last_request_at is not None:
+            if now - self._last_request_at > self.idle_timeout:
+                self.clear_pools()
+        self._last_request_at = now
+
+    def pool_stats(self):
+        stats = []
+        for pool_manager in self.get_pool_managers():
+            for key in pool_manager.pools.keys():
+                pool = pool_manager.pools.get(key)
+                if pool is None or pool.pool is None:
+                    continue
+
+                maxsize = pool.pool.maxsize
+                in_use = max(maxsize - pool.pool.qsize(), 0)
+                stats.append({
+                    'host': pool.host,
+                    'port': pool.port,
+                    'maxsize': maxsize,
+                    'in_use': in_use,
+                    'idle': len([conn for conn in list(pool.pool.queue) if conn is not None]),
+                    'utilisation': float(in_use) / maxsize if maxsize else 0.0,
+                    'connections': pool.num_connections,
+                    'requests': pool.num_requests,
+                })
+        return stats
+
+    def close(self):
+        self.clear_pools()
+
+
+class RequestsTransport(PooledTransport):
+    """Default transport based on ``requests.Session``.
+
+    Accepts the same pool options as :class:`~syncano.transports.PooledTransport`,
+    which are applied to ``http://`` and ``https://`` adapters of the session.
+    """
+
+    def __init__(self, session=None, **pool_options):
+        super(RequestsTransport, self).__init__(**pool_options)
+        self.session = session or requests.Session()
+
+        for prefix in ('http://', 'https://'):
+            adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize,
+                                  pool_block=self.pool_block)
+            self.session.mount(prefix, adapter)
+
+        if not self.keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+    def request(self, method_name, url, **params):
+        self.expire_idle_connections()
+        method = getattr(self.session, method_name.lower())
+        return method(url, **params)
+
+    def get_pool_managers(self):
+        return [adapter.poolmanager for adapter in self.session.adapters.values()
+                if getattr(adapter, 'poolmanager', None) is not None]
+
+    def close(self):
+        self.session.close()
+
+
+class Urllib3Transport(PooledTransport):
+    """Lean transport which talks to ``urllib3`` connection pools directly,
+    skipping ``requests`` hooks, adapters and cookie handling.
+
+    Accepts the same pool options as :class:`~syncano.transports.PooledTransport`,
+    any other keyword arguments are passed to ``urllib3.PoolManager``.
+    """
+
+    POOL_OPTIONS = ('pool_connections', 'pool_maxsize', 'pool_block', 'keep_alive', 'idle_timeout')
+
+    def __init__(self, **kwargs):
+        pool_options = {k: kwargs.pop(k) for k in self.POOL_OPTIONS if k in kwargs}
+        super(Urllib3Transport, self).__init__(**pool_options)
+        self.pool_kwargs = kwargs
+        self._pools = {}
+
+    def get_pool(self, verify):
+        """Returns ``urllib3.PoolManager`` with or without certificate verification."""
+        if verify not in self._pools:
+            pool_kwargs = {
+                'num_pools': self.pool_connections,
+                'maxsize': self.pool_maxsize,
+                'block': self.pool_block,
+            }
+            pool_kwargs.update(self.pool_kwargs)
+
+            if verify:
+                pool_kwargs['cert_reqs'] = 'CERT_REQUIRED'
+                if certifi is not None:
+                    pool_kwargs['ca_certs'] = certifi.where()
+            else:
+                pool_kwargs['cert_reqs'] = 'CERT_NONE'
+            self._pools[verify] = urllib3.PoolManager(**pool_kwargs)
+        return self._pools[verify]
+
+    def get_pool_managers(self):
+        return list(self._pools.values())
+
+    def request(self, method_name, url, **params):
+        self.expire_idle_connections()
+        headers = dict(params.get('headers', {}))
+        body = params.get('data')
+        query = params.get('params')
+        files = params.get('files')
+
+        if not self.keep_alive:
+            headers['Connection'] = 'close'
+
+        if query:
+            # requests skips None values
+            query = [(k, v) for k, v in six.iteritems(query) if v is not None]
+            url = '{0}{1}{2}'.format(url, '&' if '?' in url else '?', urlencode(query))
+
+        if files:
+            body, headers['content-type'] = urllib3.encode_multipart_formdata(self._get_file_fields(files))
+
+        pool = self.get_pool(params.get('verify', True))
+        if params.get('stream'):
+            response = pool.urlopen(method_name.upper(), url, body=body, headers=headers,
+                                    timeout=params.get('timeout'), retries=False, redirect=True, preload_content=False)
+            return StreamedResponse(response.status, response, response.headers)
+
+        response = pool.urlopen(method_name.upper(), url, body=body, headers=headers,
+                                timeout=params.get('timeout'), retries=False, redirect=True)
+        return Response(response.status, response.data, response.headers)
+
+    @classmethod
+    def _get_file_fields(cls, files):
+        fields = {}
+        for name, value in six.iteritems(files):
+            if isinstance(value, tuple):  # (filename, file, content_type, headers)
+                fields[name] = (value[0], value[1].read(), value[2])
+            else:
+                fields[name] = (os.path.basename(getattr(value, 'name', name)), value.read())
+        return fields
+
+    def close(self):
+        super(Urllib3Transport, self).close()
+        self._pools = {}
+
+
+class InMemoryTransport(BaseTransport):
+    """Transport which routes requests to a Python callable instead of the network.
+    Useful for tests and for benchmarking the library overhead.
+
+    The handler is called with ``(method_name, url, **params)`` and should return
+    a :class:`~syncano.transports.Response` or a ``(status_code, content)`` /
+    ``(status_code, content, headers)`` tuple, where ``content`` can be
+    a Python object which will be serialized to JSON.
+
+    Usage::
+
+        def handler(method_name, url, **params):
+            return 200, {'name': 'test-one'}
+
+        connection = Connection(api_key='test', transport=InMemoryTransport(handler))
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    def request(self, method_name, url, **params):
+        response = self.handler(method_name, url, **params)
+
+        if not isinstance(response, Response):
+            response = Response(*response)
+        return response
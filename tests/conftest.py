@@ -0,0 +1,4 @@
+import sys
+
+# syncano.aio uses async syntax, its tests can't run on older interpreters, see tests/test_aio.py
+collect_ignore = ['test_aio.py'] if sys.version_info < (3, 6) else []
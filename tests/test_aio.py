@@ -0,0 +1,211 @@
+import io
+import sys
+import unittest
+
+from syncano.exceptions import SyncanoRequestError, SyncanoValueError
+from syncano.models import Instance, registry
+from syncano.throttling import ThrottleCoordinator
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+try:
+    import asyncio
+    from syncano.aio import AsyncConnection, aiohttp
+except (ImportError, SyntaxError):  # Python 2
+    aiohttp = None
+
+skip_aio = unittest.skipIf(sys.version_info < (3, 6) or aiohttp is None, 'asyncio support requires aiohttp')
+
+
+def completed(value=None, exception=None):
+    future = asyncio.Future()
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(value)
+    return future
+
+
+@skip_aio
+class AsyncConnectionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.connection = AsyncConnection(api_key='test')
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.connection.close())
+        self.loop.close()
+
+    def run_coroutine(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    @mock.patch('syncano.aio.AsyncConnection._send')
+    def test_make_request(self, send_mock):
+        send_mock.return_value = completed((200, {}, {'ok': 'ok'}))
+
+        content = self.run_coroutine(self.connection.make_request('POST', 'test', data={'a': 1}))
+
+        self.assertEqual(content, {'ok': 'ok'})
+        method, url, params = send_mock.call_args[0]
+        self.assertEqual(method, 'POST')
+        self.assertEqual(url, self.connection.build_url('test'))
+        self.assertEqual(params['data'], '{"a": 1}')
+        self.assertEqual(params['headers']['Authorization'], 'token test')
+
+    @mock.patch('syncano.aio.AsyncConnection._send')
+    def test_multipart_request(self, send_mock):
+        send_mock.return_value = completed((201, {}, {'id': 1}))
+
+        content = self.run_coroutine(self.connection.make_request(
+            'POST', 'test', data={'name': 'test', 'logo': io.BytesIO(b'data')}, multipart=True))
+
+        self.assertEqual(content, {'id': 1})
+        self.assertEqual(send_mock.call_count, 1)
+        params = send_mock.call_args[0][2]
+        self.assertIsInstance(params['data'], aiohttp.FormData)
+        self.assertNotIn('content-type', params['headers'])
+        self.assertEqual([field[0]['name'] for field in params['data']._fields], ['name', 'logo'])
+
+    @mock.patch('syncano.aio.asyncio.sleep')
+    @mock.patch('syncano.aio.AsyncConnection._send')
+    def test_throttling(self, send_mock, sleep_mock):
+        self.connection.throttle = ThrottleCoordinator(jitter=0)
+        sleep_mock.return_value = completed()
+        send_mock.side_effect = [
+            completed((429, {'retry-after': '2'}, {})),
+            completed((200, {}, {'ok': 'ok'})),
+        ]
+
+        content = self.run_coroutine(self.connection.make_request('GET', 'test'))
+
+        self.assertEqual(content, {'ok': 'ok'})
+        self.assertEqual(send_mock.call_count, 2)
+        self.assertEqual(sleep_mock.call_count, 1)
+        self.assertAlmostEqual(sleep_mock.call_args[0][0], 2.0, places=1)
+
+    @mock.patch('syncano.aio.AsyncConnection._send')
+    def test_client_error(self, send_mock):
+        send_mock.return_value = completed((404, {}, {'detail': 'Not found.'}))
+
+        with self.assertRaises(SyncanoRequestError) as cm:
+            self.run_coroutine(self.connection.make_request('GET', 'test'))
+        self.assertEqual(cm.exception.status_code, 404)
+
+    def test_invalid_method_name(self):
+        with self.assertRaises(SyncanoValueError):
+            self.run_coroutine(self.connection.make_request('INVALID', 'test'))
+
+    @mock.patch('syncano.aio.AsyncConnection.make_request')
+    def test_request_authentication(self, make_request_mock):
+        make_request_mock.side_effect = [
+            completed({'account_key': 'account_key'}),
+            completed({'ok': 'ok'}),
+        ]
+        connection = AsyncConnection(email='dummy', password='dummy')
+
+        content = self.run_coroutine(connection.request('GET', 'test'))
+
+        self.assertEqual(content, {'ok': 'ok'})
+        self.assertEqual(connection.api_key, 'account_key')
+        self.assertEqual(make_request_mock.call_count, 2)
+
+    def test_aiohttp_params(self):
+        params = self.connection.build_params({'params': {'last_id': None, 'room': 'a'}})
+        params['verify'] = False
+
+        aiohttp_params = self.connection._get_aiohttp_params(params)
+
+        self.assertEqual(aiohttp_params['params'], {'room': 'a'})
+        self.assertFalse(aiohttp_params['ssl'])
+        self.assertEqual(aiohttp_params['timeout'].total, self.connection.timeout)
+
+
+@skip_aio
+class AsyncManagerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.connection = AsyncConnection(api_key='test')
+        self.manager = Instance.please.using(self.connection)
+
+    def tearDown(self):
+        self.loop.close()
+        registry.clear_used_instance()
+
+    def run_coroutine(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    @mock.patch('syncano.aio.AsyncConnection.request')
+    def test_get(self, request_mock):
+        request_mock.return_value = completed({'name': 'test-one'})
+
+        instance = self.run_coroutine(self.manager.get('test-one'))
+
+        self.assertIsInstance(instance, Instance)
+        self.assertEqual(instance.name, 'test-one')
+        request_mock.assert_called_once_with('GET', '/v1.1/instances/test-one/', headers={})
+
+    @mock.patch('syncano.aio.AsyncConnection.request')
+    def test_get_does_not_exist(self, request_mock):
+        request_mock.return_value = completed(exception=SyncanoRequestError(404, 'Not found.'))
+
+        with self.assertRaises(Instance.DoesNotExist):
+            self.run_coroutine(self.manager.get('test-one'))
+
+    @mock.patch('syncano.aio.AsyncConnection.request')
+    def test_iteration(self, request_mock):
+        request_mock.side_effect = [
+            completed({'objects': [{'name': 'a'}, {'name': 'b'}], 'next': '/v1.1/instances/?page=2'}),
+            completed({'objects': [{'name': 'c'}], 'next': None}),
+        ]
+        iterator = self.manager.list().__aiter__()
+        names = []
+
+        while True:
+            try:
+                names.append(self.run_coroutine(iterator.__anext__()).name)
+            except StopAsyncIteration:
+                break
+
+        self.assertEqual(names, ['a', 'b', 'c'])
+        self.assertEqual(request_mock.call_count, 2)
+
+    @mock.patch('syncano.aio.AsyncConnection.request')
+    def test_batch(self, request_mock):
+        registry.set_used_instance('test-one')
+        request_mock.return_value = completed([
+            {'code': 200, 'content': {'name': 'test-two'}},
+            {'code': 404, 'content': {'detail': 'Not found.'}},
+        ])
+
+        response = self.run_coroutine(self.manager.batch(
+            self.manager.as_batch().update(name='test-two', description='test'),
+            self.manager.as_batch().delete(name='test-three'),
+        ))
+
+        self.assertIsInstance(response[0], Instance)
+        self.assertEqual(response[1]['code'], 404)
+        request_mock.assert_called_once_with('POST', '/v1.1/instances/test-one/batch/', data=mock.ANY)
+
+    @mock.patch('syncano.aio.AsyncConnection.request')
+    def test_chunked_batch(self, request_mock):
+        registry.set_used_instance('test-one')
+        request_mock.side_effect = [
+            completed([{'code': 204, 'content': {}}] * 50),
+            completed(exception=SyncanoRequestError(400, 'Invalid batch.')),
+        ]
+
+        response = self.run_coroutine(self.manager.batch(
+            *[self.manager.as_batch().delete(name='test-{0}'.format(i)) for i in range(60)]
+        ))
+
+        self.assertEqual(request_mock.call_count, 2)
+        self.assertEqual(len(response), 60)
+        self.assertEqual(response[49]['code'], 204)
+        self.assertEqual(response[50], {'code': 400, 'content': {'detail': 'Invalid batch.'}})
@@ -0,0 +1,223 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from syncano.cache import MemoryCache, ResponseCache, SqliteCache, ValidatorCache
+from syncano.connection import Connection
+from syncano.transports import InMemoryTransport
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+class MemoryCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = MemoryCache(max_entries=2)
+
+    @mock.patch('syncano.cache.time.time', mock.MagicMock(return_value=100.0))
+    def test_lru(self):
+        self.cache.set('a', '/a/', '1', 200)
+        self.cache.set('b', '/b/', '2', 200)
+        self.assertEqual(self.cache.get('a'), '1')
+
+        self.cache.set('c', '/c/', '3', 200)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), '1')
+        self.assertEqual(self.cache.get('c'), '3')
+
+    @mock.patch('syncano.cache.time.time', mock.MagicMock(return_value=100.0))
+    def test_max_bytes(self):
+        self.cache.max_bytes = 5
+        self.cache.set('a', '/a/', '123', 200)
+        self.cache.set('b', '/b/', '456', 200)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.size, 3)
+
+    @mock.patch('syncano.cache.time.time')
+    def test_ttl(self, time_mock):
+        time_mock.return_value = 100.0
+        self.cache.set('a', '/a/', '1', 110.0)
+        self.assertEqual(self.cache.get('a'), '1')
+
+        time_mock.return_value = 110.0
+        self.assertIsNone(self.cache.get('a'))
+
+    @mock.patch('syncano.cache.time.time', mock.MagicMock(return_value=100.0))
+    def test_invalidate(self):
+        self.cache.max_entries = 10
+        self.cache.set('list', '/v1.1/instances/test/classes/', '1', 200)
+        self.cache.set('detail', '/v1.1/instances/test/classes/books/', '2', 200)
+        self.cache.set('sub', '/v1.1/instances/test/classes/books/objects/', '3', 200)
+        self.cache.set('other', '/v1.1/instances/test/classes/authors/', '4', 200)
+
+        self.cache.invalidate('/v1.1/instances/test/classes/books/')
+        self.assertIsNone(self.cache.get('list'))
+        self.assertIsNone(self.cache.get('detail'))
+        self.assertIsNone(self.cache.get('sub'))
+        self.assertEqual(self.cache.get('other'), '4')
+
+
+@mock.patch('syncano.cache.time.time', mock.MagicMock(return_value=100.0))
+class SqliteCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.filename = os.path.join(self.path, 'cache.db')
+        self.cache = SqliteCache(self.filename)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.path)
+
+    def test_set_get(self):
+        self.cache.set('a', '/a/', '1', 200)
+        self.assertEqual(self.cache.get('a'), '1')
+        self.assertIsNone(self.cache.get('b'))
+
+        other_cache = SqliteCache(self.filename)
+        self.assertEqual(other_cache.get('a'), '1')
+        other_cache.close()
+
+        self.cache.set('b', '/b/', '2', 50)
+        self.assertIsNone(self.cache.get('b'))
+
+    def test_invalidate(self):
+        self.cache.set('list', '/v1.1/instances/test/classes/', '1', 200)
+        self.cache.set('detail', '/v1.1/instances/test/classes/books/', '2', 200)
+        self.cache.set('other', '/v1.1/instances/test/classes/authors/', '3', 200)
+
+        self.cache.invalidate('/v1.1/instances/test/classes/books/')
+        self.assertIsNone(self.cache.get('list'))
+        self.assertIsNone(self.cache.get('detail'))
+        self.assertEqual(self.cache.get('other'), '3')
+
+
+class ConnectionCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.handler = mock.MagicMock(return_value=(200, {'name': 'books'}))
+        self.cache = ResponseCache(ttl=60, disk=SqliteCache(os.path.join(self.path, 'cache.db')))
+        self.connection = Connection(api_key='test', transport=InMemoryTransport(self.handler), cache=self.cache)
+        self.path_detail = 'v1.1/instances/test/classes/books/'
+
+    def tearDown(self):
+        self.cache.disk.close()
+        shutil.rmtree(self.path)
+
+    def test_get(self):
+        first = self.connection.request('GET', self.path_detail)
+        first['name'] = 'changed'
+
+        self.assertEqual(self.connection.request('GET', self.path_detail), {'name': 'books'})
+        self.assertEqual(self.handler.call_count, 1)
+
+        self.connection.request('GET', self.path_detail, params={'page_size': 10})
+        self.assertEqual(self.handler.call_count, 2)
+
+    def test_conditional_request_refreshes(self):
+        self.connection.request('GET', self.path_detail)
+        self.handler.return_value = (200, {'name': 'changed'})
+
+        self.assertEqual(self.connection.conditional_request(self.path_detail)[0], {'name': 'changed'})
+        self.assertEqual(self.handler.call_count, 2)
+        self.assertEqual(self.connection.request('GET', self.path_detail), {'name': 'changed'})
+        self.assertEqual(self.handler.call_count, 2)
+
+    def test_auth_identity(self):
+        other_connection = Connection(api_key='other', transport=InMemoryTransport(self.handler), cache=self.cache)
+
+        self.connection.request('GET', self.path_detail)
+        other_connection.request('GET', self.path_detail)
+        self.assertEqual(self.handler.call_count, 2)
+
+    def test_write_invalidates(self):
+        self.connection.request('GET', self.path_detail)
+        self.connection.request('PATCH', self.path_detail, data={'description': 'test'})
+        self.connection.request('GET', self.path_detail)
+        self.assertEqual(self.handler.call_count, 3)
+
+    def test_batch_invalidates(self):
+        self.connection.request('GET', self.path_detail)
+        self.handler.return_value = (200, [])
+        self.connection.request('POST', 'v1.1/instances/test/batch/', data={'requests': [
+            {'method': 'DELETE', 'path': '/' + self.path_detail},
+        ]})
+        self.connection.request('GET', self.path_detail)
+        self.assertEqual(self.handler.call_count, 3)
+
+    def test_ttl(self):
+        self.connection.request('GET', self.path_detail, cache_ttl=0)
+        self.connection.request('GET', self.path_detail)
+        self.assertEqual(self.handler.call_count, 2)
+        self.assertNotIn('cache_ttl', self.handler.call_args[1])
+
+    def test_errors_are_not_cached(self):
+        self.handler.return_value = (404, {'detail': 'Not found.'})
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                self.connection.request('GET', self.path_detail)
+        self.assertEqual(self.handler.call_count, 2)
+
+    def test_disk_tier(self):
+        self.connection.request('GET', self.path_detail)
+        self.cache.memory.clear()
+
+        self.assertEqual(self.connection.request('GET', self.path_detail), {'name': 'books'})
+        self.assertEqual(self.handler.call_count, 1)
+
+    def test_key(self):
+        params = {'params': {'a': 1}, 'headers': {'Authorization': 'token test'}}
+        key = ResponseCache.get_key('GET', 'https://api.syncano.io/v1.1/', params)
+        same_params = json.loads(json.dumps(params))
+        self.assertEqual(key, ResponseCache.get_key('get', 'https://api.syncano.io/v1.1/', same_params))
+        self.assertNotEqual(key, ResponseCache.get_key('GET', 'https://api.syncano.io/v1.2/', params))
+
+
+class ConditionalRequestTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = mock.MagicMock(return_value=(200, {'name': 'books'}, {'etag': '"1"'}))
+        self.validators = ValidatorCache(max_entries=2)
+        self.connection = Connection(api_key='test', transport=InMemoryTransport(self.handler),
+                                     validators=self.validators)
+        self.path = 'v1.1/instances/test/classes/books/'
+
+    def test_not_modified(self):
+        self.assertEqual(self.connection.request('GET', self.path), {'name': 'books'})
+        self.assertNotIn('If-None-Match', self.handler.call_args[1]['headers'])
+
+        self.handler.return_value = (304, '')
+        self.assertEqual(self.connection.request('GET', self.path), {'name': 'books'})
+        self.assertEqual(self.handler.call_args[1]['headers']['If-None-Match'], '"1"')
+
+    def test_last_modified(self):
+        last_modified = 'Wed, 21 Oct 2015 07:28:00 GMT'
+        self.handler.return_value = (200, {'name': 'books'}, {'last-modified': last_modified})
+        self.connection.request('GET', self.path)
+        self.connection.request('GET', self.path)
+        self.assertEqual(self.handler.call_args[1]['headers']['If-Modified-Since'], last_modified)
+
+    def test_writes_are_not_conditional(self):
+        self.connection.request('GET', self.path)
+        self.connection.request('PATCH', self.path, data={'description': 'test'})
+        self.assertNotIn('If-None-Match', self.handler.call_args[1]['headers'])
+
+    def test_conditional_request(self):
+        connection = Connection(api_key='test', transport=InMemoryTransport(self.handler))
+        self.assertEqual(connection.conditional_request(self.path), ({'name': 'books'}, '"1"'))
+
+        self.handler.return_value = (304, '')
+        self.assertEqual(connection.conditional_request(self.path, etag='"1"'), (None, '"1"'))
+        self.assertEqual(self.handler.call_args[1]['headers']['If-None-Match'], '"1"')
+
+    def test_lru(self):
+        for key in ('a', 'b', 'c'):
+            self.validators.set(key, key, None, '{}')
+        self.assertIsNone(self.validators.get('a'))
+        self.assertEqual(self.validators.get('c'), ('c', None, '{}'))
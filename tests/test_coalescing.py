@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+import unittest
+
+from syncano.coalescing import GetCoalescer
+from syncano.connection import Connection
+from syncano.exceptions import SyncanoRequestError, SyncanoValueError
+from syncano.models import Instance, Script
+from syncano.transports import InMemoryTransport
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+class GetCoalescerTestCase(unittest.TestCase):
+    BATCH_PATH = '/v1.1/instances/test/batch/'
+
+    def setUp(self):
+        self.handler = mock.MagicMock(side_effect=self._handler)
+        self.connection = Connection(api_key='test', transport=InMemoryTransport(self.handler))
+
+    @staticmethod
+    def _handler(method_name, url, **params):
+        if method_name == 'GET':
+            return 200, {'path': url}
+
+        response = []
+        for request in json.loads(params['data'])['requests']:
+            if request['path'].endswith('/404/'):
+                response.append({'code': 404, 'content': {'detail': 'Not found.'}})
+            else:
+                response.append({'code': 200, 'content': {'path': request['path']}})
+        return 200, response
+
+    def _get_concurrently(self, coalescer, paths):
+        results = [None] * len(paths)
+
+        def get(index, path):
+            try:
+                results[index] = coalescer.get(self.BATCH_PATH, path)
+            except SyncanoRequestError as e:
+                results[index] = e
+
+        threads = [threading.Thread(target=get, args=(index, path)) for index, path in enumerate(paths)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_batch(self):
+        coalescer = GetCoalescer(self.connection, window=0.5)
+        results = self._get_concurrently(coalescer, ['/1/', '/2/', '/1/', '/404/'])
+
+        self.assertEqual(self.handler.call_count, 1)
+        method_name, url = self.handler.call_args[0]
+        self.assertEqual(method_name, 'POST')
+        self.assertTrue(url.endswith(self.BATCH_PATH))
+        self.assertEqual(len(json.loads(self.handler.call_args[1]['data'])['requests']), 3)
+
+        self.assertEqual(results[0], {'path': '/1/'})
+        self.assertEqual(results[1], {'path': '/2/'})
+        # duplicated path gets its own copy of the response
+        self.assertEqual(results[2], results[0])
+        self.assertIsNot(results[2], results[0])
+        self.assertIsInstance(results[3], SyncanoRequestError)
+        self.assertEqual(results[3].status_code, 404)
+
+    def test_single_request(self):
+        coalescer = GetCoalescer(self.connection, window=0.001)
+        self.assertTrue(coalescer.get(self.BATCH_PATH, '/v1.1/instances/test/1/')['path'].endswith('/test/1/'))
+        self.assertEqual(self.handler.call_args[0][0], 'GET')
+
+    def test_max_size(self):
+        # the batch is full after two paths, so it is sent without waiting for the window
+        coalescer = GetCoalescer(self.connection, window=10, max_size=2)
+        self.assertEqual(self._get_concurrently(coalescer, ['/1/', '/2/']), [{'path': '/1/'}, {'path': '/2/'}])
+        self.assertEqual(self.handler.call_count, 1)
+
+        with self.assertRaises(SyncanoValueError):
+            GetCoalescer(self.connection, max_size=51)
+
+    def test_batch_error(self):
+        self.handler.side_effect = lambda method_name, url, **params: (500, {'detail': 'Server error.'})
+        coalescer = GetCoalescer(self.connection, window=10, max_size=2)
+        results = self._get_concurrently(coalescer, ['/1/', '/2/'])
+        self.assertTrue(all(isinstance(result, SyncanoRequestError) for result in results))
+
+
+class ManagerCoalescingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = mock.MagicMock(side_effect=GetCoalescerTestCase._handler)
+        self.connection = Connection(api_key='test', transport=InMemoryTransport(self.handler))
+        self.manager = Script.please.using(self.connection)
+
+    def test_get(self):
+        results = {}
+
+        def get(pk):
+            try:
+                results[pk] = self.manager.get(instance_name='test', id=pk)
+            except Script.DoesNotExist as e:
+                results[pk] = e
+
+        with self.connection.coalesce(window=10, max_size=2) as coalescer:
+            threads = [threading.Thread(target=coalescer.wrap(get), args=(pk,)) for pk in [1, 404]]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertIsNone(self.connection.coalescer)
+        self.assertEqual(self.handler.call_count, 1)
+        self.assertIsInstance(results[1], Script)
+        self.assertIsInstance(results[404], Script.DoesNotExist)
+
+    def test_not_coalesced(self):
+        with self.connection.coalesce(window=10):
+            # instances are not requested within an instance, so they can't be sent in a batch
+            Instance.please.using(self.connection).get(name='test')
+            self.assertEqual(self.handler.call_args[0][0], 'GET')
+
+    def test_thread_scopes(self):
+        entered = [threading.Event(), threading.Event()]
+        exit_first = threading.Event()
+        coalescers = {}
+
+        def scope(index):
+            with self.connection.coalesce() as coalescer:
+                coalescers[index] = (coalescer, self.connection.coalescer)
+                entered[index].set()
+                if index == 0:
+                    exit_first.wait()
+                else:
+                    entered[0].wait()
+                    exit_first.set()
+                    time.sleep(0.01)
+            coalescers[index] += (self.connection.coalescer,)
+
+        # scopes overlap: first thread enters, second enters, first exits, second exits
+        threads = [threading.Thread(target=scope, args=(index,)) for index in range(2)]
+        threads[0].start()
+        entered[0].wait()
+        threads[1].start()
+        for thread in threads:
+            thread.join()
+
+        for coalescer, active, after in coalescers.values():
+            self.assertIs(active, coalescer)
+            self.assertIsNone(after)
+        self.assertIsNot(coalescers[0][0], coalescers[1][0])
+        self.assertIsNone(self.connection.coalescer)
+
+        # threads which didn't join a scope are not coalesced
+        with self.connection.coalesce(window=10):
+            thread = threading.Thread(target=self.manager.get, kwargs={'instance_name': 'test', 'id': 1})
+            thread.start()
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+            self.assertEqual(self.handler.call_args[0][0], 'GET')
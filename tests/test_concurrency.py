@@ -0,0 +1,226 @@
+import threading
+import time
+import unittest
+
+from syncano.concurrency import AdaptiveConcurrency, ConcurrencyRegistry, SingleFlight
+from syncano.connection import Connection
+from syncano.exceptions import SyncanoRequestError, SyncanoValueError
+from syncano.transports import InMemoryTransport
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+@mock.patch('syncano.concurrency.time.time')
+class AdaptiveConcurrencyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = AdaptiveConcurrency(initial=4, minimum=1, maximum=6)
+
+    def test_additive_increase(self, time_mock):
+        time_mock.return_value = 100.0
+        for _ in range(5):
+            self.controller.release(self.controller.acquire())
+        self.assertEqual(self.controller.limit, 5)
+        self.assertEqual(self.controller.in_flight, 0)
+
+    def test_maximum(self, time_mock):
+        time_mock.return_value = 100.0
+        for _ in range(100):
+            self.controller.release(self.controller.acquire())
+        self.assertEqual(self.controller.limit, 6)
+
+    def test_multiplicative_decrease(self, time_mock):
+        time_mock.return_value = 100.0
+        started = [self.controller.acquire() for _ in range(3)]
+
+        time_mock.return_value = 101.0
+        for started_at in started:
+            self.controller.release(started_at, failed=True)
+
+        # requests started before the cut don't cut the limit again
+        self.assertEqual(self.controller.limit, 2)
+
+        self.controller.release(self.controller.acquire(), failed=True)
+        self.assertEqual(self.controller.limit, 1)
+
+        self.controller.release(self.controller.acquire(), failed=True)
+        self.assertEqual(self.controller.limit, 1)
+
+    def test_latency_spike(self, time_mock):
+        time_mock.return_value = 100.0
+        started_at = self.controller.acquire()
+        time_mock.return_value = 101.0
+        self.controller.release(started_at)
+        self.assertEqual(self.controller.latency, 1)
+
+        started_at = self.controller.acquire()
+        time_mock.return_value = 104.0
+        self.controller.release(started_at)
+        self.assertEqual(self.controller.limit, 2)
+
+    def test_slot(self, time_mock):
+        time_mock.return_value = 100.0
+        with self.assertRaises(SyncanoRequestError):
+            with self.controller.slot():
+                raise SyncanoRequestError(429, 'Too many requests.')
+        self.assertEqual(self.controller.limit, 2)
+
+        with self.assertRaises(SyncanoRequestError):
+            with self.controller.slot():
+                raise SyncanoRequestError(404, 'Not found.')
+        self.assertEqual(self.controller.in_flight, 0)
+
+    def test_invalid_options(self, time_mock):
+        with self.assertRaises(SyncanoValueError):
+            AdaptiveConcurrency(initial=10, maximum=5)
+        with self.assertRaises(SyncanoValueError):
+            AdaptiveConcurrency(decrease=1)
+
+
+class ImapTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = AdaptiveConcurrency(initial=2, maximum=4)
+
+    def test_ordered(self):
+        results = list(self.controller.imap(lambda x: x * 2, range(20)))
+        self.assertEqual(results, [(i, i * 2) for i in range(20)])
+
+    def test_unordered(self):
+        results = sorted(self.controller.imap(lambda x: x * 2, range(20), ordered=False))
+        self.assertEqual(results, [(i, i * 2) for i in range(20)])
+
+    def test_limit(self):
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+
+        def func(item):
+            with lock:
+                in_flight.append(item)
+                peak.append(len(in_flight))
+            with lock:
+                in_flight.remove(item)
+
+        list(self.controller.imap(func, range(50)))
+        self.assertLessEqual(max(peak), 4)
+
+    def test_error(self):
+        def func(item):
+            if item == 3:
+                raise SyncanoRequestError(400, 'Bad request.')
+            return item
+
+        with self.assertRaises(SyncanoRequestError):
+            list(self.controller.imap(func, range(10)))
+
+        def items():
+            yield 1
+            raise SyncanoValueError('Broken items.')
+
+        with self.assertRaises(SyncanoValueError):
+            list(self.controller.imap(lambda x: x, items()))
+
+    def test_reused_workers(self):
+        threads = set()
+
+        def func(item):
+            threads.add(threading.current_thread())
+            time.sleep(0.001)
+
+        list(self.controller.imap(func, range(20)))
+        workers = set(threads)
+        self.assertLessEqual(len(workers), 4)
+
+        # workers return to the controller right after their last result
+        while self.controller._idle_workers < len(workers):
+            time.sleep(0.001)
+        threads.clear()
+        list(self.controller.imap(func, range(20)))
+        self.assertTrue(threads <= workers)
+
+
+class ConcurrencyRegistryTestCase(unittest.TestCase):
+
+    def test_connection_controller(self):
+        registry = ConcurrencyRegistry(initial=2)
+        connection = Connection(api_key='test', concurrency=registry)
+        other_connection = Connection(api_key='test', concurrency=registry)
+
+        controller = connection.get_concurrency_controller('test-one')
+        self.assertEqual(controller.limit, 2)
+        self.assertIs(controller, other_connection.get_concurrency_controller('test-one'))
+        self.assertIsNot(controller, connection.get_concurrency_controller('test-two'))
+
+
+class SingleFlightTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.flights = SingleFlight()
+        self.release = threading.Event()
+        self.func = mock.MagicMock(side_effect=self._released({'items': [1]}))
+
+    def _released(self, result):
+        def func(*args, **kwargs):
+            self.release.wait()
+            return result
+        return func
+
+    def _do_concurrently(self, func, count=5):
+        results = [None] * count
+
+        def do(index):
+            try:
+                results[index] = func()
+            except SyncanoRequestError as e:
+                results[index] = e
+
+        threads = [threading.Thread(target=do, args=(index,)) for index in range(count)]
+        for thread in threads:
+            thread.start()
+        # wait until all calls joined the first one
+        while sum(flight.followers for flight in list(self.flights._flights.values())) < count - 1:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_shared_call(self):
+        results = self._do_concurrently(lambda: self.flights.do('key', self.func))
+
+        self.assertEqual(self.func.call_count, 1)
+        self.assertTrue(all(result == {'items': [1]} for result in results))
+        # every caller can change its result
+        results[0]['items'].append(2)
+        self.assertEqual(results[1], {'items': [1]})
+        self.assertEqual(len(set(id(result) for result in results)), 5)
+
+        self.flights.do('key', self.func)
+        self.assertEqual(self.func.call_count, 2)
+
+    def test_shared_error(self):
+        def func():
+            self.release.wait()
+            raise SyncanoRequestError(500, 'Server error.')
+
+        results = self._do_concurrently(lambda: self.flights.do('key', func))
+        self.assertTrue(all(isinstance(result, SyncanoRequestError) for result in results))
+        self.assertEqual(self.flights._flights, {})
+
+    def test_connection(self):
+        handler = mock.MagicMock(side_effect=self._released((200, {'id': 1})))
+        connection = Connection(api_key='test', transport=InMemoryTransport(handler))
+        connection.single_flight = self.flights
+        results = self._do_concurrently(lambda: connection.request('GET', 'test'))
+
+        self.assertEqual(handler.call_count, 1)
+        self.assertEqual(results, [{'id': 1}] * 5)
+
+        connection.request('POST', 'test')
+        self.assertEqual(self.flights._flights, {})
+        self.assertIsNone(Connection(api_key='test').single_flight)
+        self.assertIsInstance(Connection(api_key='test', single_flight=True).single_flight, SingleFlight)
@@ -1,12 +1,15 @@
 import json
 import tempfile
+import threading
 import unittest
+import zlib
 
 import six
 from syncano import connect
 from syncano.connection import Connection, ConnectionMixin
 from syncano.exceptions import SyncanoRequestError, SyncanoValueError
 from syncano.models.registry import registry
+from syncano.transports import InMemoryTransport, RequestsTransport, Urllib3Transport
 
 if six.PY3:
     from urllib.parse import urljoin
@@ -135,6 +138,50 @@ class ConnectionTestCase(unittest.TestCase):
 
         self.assertEqual(params['data'], {'a': 1})
 
+    def test_build_params_does_not_modify_input(self):
+        self.connection.api_key = 'test'
+        request = {'data': {'a': 1}, 'headers': {'X-TEMPLATE-RESPONSE': 'test'}}
+
+        params = self.connection.build_params(request)
+        params['headers'].pop('content-type')
+
+        self.assertEqual(request, {'data': {'a': 1}, 'headers': {'X-TEMPLATE-RESPONSE': 'test'}})
+        self.assertEqual(self.connection.build_params(request)['headers'], {
+            'X-TEMPLATE-RESPONSE': 'test',
+            'content-type': self.connection.CONTENT_TYPE,
+            'Authorization': 'token test',
+        })
+
+    def test_build_params_headers_precedence(self):
+        self.connection.api_key = 'test'
+        params = self.connection.build_params({'headers': {'Authorization': 'token other'}})
+        self.assertEqual(params['headers']['Authorization'], 'token other')
+
+        connection = Connection(api_key='api', user_key='user', instance_name='test')
+        params = connection.build_params({'headers': {'X-API-KEY': 'other'}})
+        self.assertEqual(params['headers']['X-API-KEY'], 'api')
+        self.assertEqual(params['headers']['X-USER-KEY'], 'user')
+        self.assertNotIn('Authorization', params['headers'])
+
+    def test_request_context_invalidation(self):
+        context = self.connection.get_request_context()
+        self.assertIs(self.connection.get_request_context(), context)
+        self.assertFalse(context['is_authenticated'])
+
+        self.connection.api_key = 'test'
+        context = self.connection.get_request_context()
+        self.assertTrue(context['is_authenticated'])
+        self.assertEqual(context['headers']['Authorization'], 'token test')
+
+        self.connection.timeout = 10
+        self.assertIs(self.connection.get_request_context(), context)
+
+        self.connection.user_key = 'user'
+        self.connection.instance_name = 'test'
+        context = self.connection.get_request_context()
+        self.assertTrue(context['is_user'])
+        self.assertEqual(context['forced_headers'], {'X-USER-KEY': 'user', 'X-API-KEY': 'test'})
+
     def test_build_url(self):
         result = urljoin(self.connection.host, 'test/')
         result += '?q=1'
@@ -143,6 +190,11 @@ class ConnectionTestCase(unittest.TestCase):
         self.assertEqual(self.connection.build_url('/test/?q=1'), result)
         self.assertEqual(self.connection.build_url(result), result)
 
+        self.assertEqual(self.connection.build_url('v1.1/instances'), urljoin(self.connection.host, 'v1.1/instances/'))
+        self.assertEqual(self.connection.build_url('//test'), urljoin(self.connection.host, '/test/'))
+        self.assertEqual(self.connection.build_url('a/../b'), urljoin(self.connection.host, 'b/'))
+        self.assertEqual(self.connection.build_url('test?q=a:b'), urljoin(self.connection.host, 'test/?q=a:b'))
+
         with self.assertRaises(SyncanoValueError):
             self.connection.build_url(True)
 
@@ -368,6 +420,111 @@ class ConnectionTestCase(unittest.TestCase):
             self.connection.get_user_info()
 
 
+class ConnectionTransportTestCase(unittest.TestCase):
+
+    def get_thread_transport(self, connection):
+        transports = []
+        thread = threading.Thread(target=lambda: transports.append(connection.transport))
+        thread.start()
+        thread.join()
+        return transports[0]
+
+    def test_per_thread_transport(self):
+        connection = Connection()
+        transport = connection.transport
+
+        self.assertIsInstance(transport, RequestsTransport)
+        self.assertIs(connection.transport, transport)
+        self.assertIs(connection.session, transport.session)
+
+        thread_transport = self.get_thread_transport(connection)
+        self.assertIsInstance(thread_transport, RequestsTransport)
+        self.assertIsNot(thread_transport, transport)
+        self.assertIn(transport, connection.get_transports())
+
+    def test_transport_factory(self):
+        connection = Connection(transport=Urllib3Transport)
+        self.assertIsInstance(connection.transport, Urllib3Transport)
+        self.assertIsNone(connection.session)
+        self.assertIsNot(self.get_thread_transport(connection), connection.transport)
+
+    def test_shared_transport(self):
+        transport = InMemoryTransport(lambda method_name, url, **params: (200, {}))
+        connection = Connection(transport=transport)
+
+        self.assertIs(connection.transport, transport)
+        self.assertIs(self.get_thread_transport(connection), transport)
+        self.assertEqual(connection.get_transports(), [transport])
+
+    @mock.patch('syncano.connection.os.getpid')
+    def test_fork(self, getpid_mock):
+        getpid_mock.return_value = 100
+        connection = Connection()
+        transport = connection.transport
+        self.assertIs(connection.transport, transport)
+
+        getpid_mock.return_value = 101
+        child_transport = connection.transport
+
+        self.assertIsNot(child_transport, transport)
+        self.assertEqual(connection.get_transports(), [child_transport])
+
+    @mock.patch('syncano.transports.RequestsTransport.close')
+    def test_close(self, close_mock):
+        connection = Connection()
+        transport = connection.transport
+
+        connection.close()
+
+        self.assertTrue(close_mock.called)
+        self.assertIsNot(connection.transport, transport)
+
+
+class ConnectionCompressionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = mock.MagicMock(return_value=(200, {}))
+        self.connection = Connection(api_key='test', transport=InMemoryTransport(self.handler),
+                                     compression='gzip', compression_threshold=100)
+        self.data = {'requests': [{'method': 'POST', 'path': '/test/', 'body': {'a': i}} for i in range(10)]}
+
+    def test_threshold(self):
+        self.connection.request('POST', 'test', data=self.data)
+        kwargs = self.handler.call_args[1]
+
+        self.assertEqual(kwargs['headers']['content-encoding'], 'gzip')
+        self.assertEqual(json.loads(zlib.decompress(kwargs['data'], 16 + zlib.MAX_WBITS).decode('utf-8')), self.data)
+
+        self.connection.request('POST', 'test', data={'a': 1})
+        kwargs = self.handler.call_args[1]
+        self.assertNotIn('content-encoding', kwargs['headers'])
+        self.assertEqual(json.loads(kwargs['data']), {'a': 1})
+
+    def test_override(self):
+        self.connection.request('POST', 'test', data=self.data, compress=False)
+        self.assertNotIn('content-encoding', self.handler.call_args[1]['headers'])
+
+        self.connection.request('POST', 'test', data={'a': 1}, compress='deflate')
+        kwargs = self.handler.call_args[1]
+        self.assertEqual(kwargs['headers']['content-encoding'], 'deflate')
+        self.assertEqual(json.loads(zlib.decompress(kwargs['data']).decode('utf-8')), {'a': 1})
+
+        with self.assertRaises(SyncanoValueError):
+            self.connection.request('POST', 'test', data={'a': 1}, compress='br')
+
+    def test_disabled_by_default(self):
+        connection = Connection(api_key='test', transport=InMemoryTransport(self.handler))
+        connection.request('POST', 'test', data=self.data)
+        self.assertNotIn('content-encoding', self.handler.call_args[1]['headers'])
+
+        connection.request('POST', 'test', data=self.data, compress=True)
+        self.assertEqual(self.handler.call_args[1]['headers']['content-encoding'], 'gzip')
+
+    def test_unsupported_compression(self):
+        with self.assertRaises(SyncanoValueError):
+            Connection(compression='br')
+
+
 class DefaultConnectionTestCase(unittest.TestCase):
 
     def setUp(self):
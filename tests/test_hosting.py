@@ -0,0 +1,153 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from syncano.connection import Connection
+from syncano.models import Hosting, HostingFile
+from syncano.transports import InMemoryTransport
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+class HostingUploadTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.bodies = []
+        self.responses = []
+        self.connection = Connection(api_key='test', transport=InMemoryTransport(self.handler))
+        self.model = Hosting(instance_name='test', id=1, links={'files': '/v1.1/instances/test/hosting/1/files/'})
+        self.file = io.BytesIO(b'body { color: red; }')
+
+        patcher = mock.patch('syncano.models.Hosting._get_connection', return_value=self.connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def handler(self, method_name, url, **params):
+        self.bodies.append((method_name, url, params['headers'], params['data'].read()))
+        if self.responses:
+            return self.responses.pop(0)
+        return 201, {'id': 2, 'path': 'styles/main.css', 'links': {'self': '/v1.1/instances/test/hosting/1/files/2/'}}
+
+    def test_upload_file(self):
+        progress = mock.Mock()
+        hosting_file = self.model.upload_file('styles/main.css', self.file, progress=progress)
+
+        self.assertIsInstance(hosting_file, HostingFile)
+        self.assertEqual(hosting_file.path, 'styles/main.css')
+
+        method_name, url, headers, body = self.bodies[0]
+        self.assertEqual(method_name, 'POST')
+        self.assertTrue(url.endswith('/v1.1/instances/test/hosting/1/files/'))
+        self.assertTrue(headers['content-type'].startswith('multipart/form-data; boundary='))
+        self.assertEqual(headers['content-length'], str(len(body)))
+        self.assertIn(b'name="path"\r\n\r\nstyles/main.css\r\n', body)
+        self.assertIn(b'\r\n\r\nbody { color: red; }\r\n', body)
+        progress.assert_called_with(len(body), len(body))
+
+    @mock.patch('syncano.models.hosting.time.sleep')
+    def test_upload_retry(self, sleep_mock):
+        self.responses = [(503, {'detail': 'Unavailable.'})]
+        hosting_file = self.model.upload_file('styles/main.css', self.file)
+
+        self.assertEqual(hosting_file.id, 2)
+        self.assertEqual(len(self.bodies), 2)
+        self.assertEqual(self.bodies[0][3], self.bodies[1][3])
+        sleep_mock.assert_called_once_with(1)
+
+    @mock.patch('syncano.models.hosting.time.sleep')
+    def test_upload_failure(self, sleep_mock):
+        self.responses = [(400, {'detail': 'Invalid path.'})]
+        self.assertIsNone(self.model.upload_file('styles/main.css', self.file))
+        self.assertEqual(len(self.bodies), 1)
+
+        self.responses = [(500, {})] * 3
+        self.assertIsNone(self.model.upload_file('styles/main.css', self.file, retries=2))
+        self.assertEqual(len(self.bodies), 4)
+        self.assertEqual(sleep_mock.call_count, 2)
+
+    @mock.patch('syncano.models.Hosting._get_files')
+    def test_update_file(self, get_files_mock):
+        get_files_mock.return_value = [
+            HostingFile(id=2, path='styles/main.css', links={'self': '/v1.1/instances/test/hosting/1/files/2/'})
+        ]
+        self.responses = [(200, {'id': 2, 'path': 'styles/main.css'})]
+
+        hosting_file = self.model.update_file('styles/main.css', self.file)
+
+        self.assertEqual(hosting_file.id, 2)
+        method_name, url, _, body = self.bodies[0]
+        self.assertEqual(method_name, 'PATCH')
+        self.assertTrue(url.endswith('/v1.1/instances/test/hosting/1/files/2/'))
+        self.assertNotIn(b'name="path"', body)
+
+
+class HostingSyncTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.local_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.local_dir)
+        os.makedirs(os.path.join(self.local_dir, 'styles'))
+        for path, content in [('index.html', b'<html></html>'), ('styles/main.css', b'body {}'),
+                              ('styles/new.css', b'p {}')]:
+            with open(os.path.join(self.local_dir, path), 'wb') as f:
+                f.write(content)
+
+        self.requests = []
+        self.connection = Connection(api_key='test', transport=InMemoryTransport(self.handler))
+        self.model = Hosting(instance_name='test', id=1, links={'files': '/v1.1/instances/test/hosting/1/files/'})
+
+        remote_files = [
+            HostingFile(id=1, path='index.html', checksum=hashlib.md5(b'<html></html>').hexdigest(),
+                        links={'self': '/v1.1/instances/test/hosting/1/files/1/'}),
+            HostingFile(id=2, path='styles/main.css', checksum=hashlib.md5(b'old').hexdigest(),
+                        links={'self': '/v1.1/instances/test/hosting/1/files/2/'}),
+            HostingFile(id=3, path='old.js', links={'self': '/v1.1/instances/test/hosting/1/files/3/'}),
+        ]
+        for target, kwargs in [('syncano.models.Hosting._get_connection', {'return_value': self.connection}),
+                               ('syncano.models.Hosting._get_files', {'return_value': remote_files})]:
+            patcher = mock.patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def handler(self, method_name, url, **params):
+        self.requests.append((method_name, url.split('/v1.1/instances/test/hosting/1')[1]))
+        if method_name == 'DELETE':
+            return 204, ''
+        return 201, {'id': 4}
+
+    def test_sync_directory(self):
+        summary = self.model.sync_directory(self.local_dir)
+
+        self.assertEqual(summary['created'], ['styles/new.css'])
+        self.assertEqual(summary['updated'], ['styles/main.css'])
+        self.assertEqual(summary['unchanged'], ['index.html'])
+        self.assertEqual(summary['deleted'], [])
+        self.assertEqual(summary['bytes_uploaded'], len(b'body {}') + len(b'p {}'))
+        self.assertEqual(summary['bytes_skipped'], len(b'<html></html>'))
+        self.assertEqual(summary['requests_saved'], 3)
+        self.assertEqual(sorted(self.requests), [('PATCH', '/files/2/'), ('POST', '/files/')])
+
+    @mock.patch('syncano.models.hosting.time.sleep')
+    def test_sync_directory_network_error(self, sleep_mock):
+        def handler(method_name, url, **params):
+            if method_name == 'PATCH':
+                raise IOError('Connection reset by peer.')
+            return self.handler(method_name, url, **params)
+        self.connection.transport = InMemoryTransport(handler)
+
+        summary = self.model.sync_directory(self.local_dir)
+
+        self.assertEqual(summary['failed'], ['styles/main.css'])
+        self.assertEqual(summary['created'], ['styles/new.css'])
+
+    def test_sync_directory_delete(self):
+        summary = self.model.sync_directory(self.local_dir, delete=True)
+
+        self.assertEqual(summary['deleted'], ['old.js'])
+        self.assertIn(('DELETE', '/files/3/'), self.requests)
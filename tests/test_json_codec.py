@@ -0,0 +1,122 @@
+import unittest
+
+from syncano import json_codec
+from syncano.connection import Connection
+from syncano.exceptions import SyncanoValueError
+from syncano.transports import InMemoryTransport, Response
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+class JSONCodecTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.codec = json_codec._codec
+
+    def tearDown(self):
+        json_codec._codec = self.codec
+
+    def test_default(self):
+        json_codec._codec = None
+        self.assertIs(type(json_codec.get_codec()), json_codec.JSONCodec)
+
+    def test_stdlib(self):
+        codec = json_codec.JSONCodec()
+        self.assertEqual(codec.dumps({'a': 1}), '{"a": 1}')
+        self.assertEqual(codec.loads('{"a": 1}'), {'a': 1})
+        self.assertEqual(codec.loads(b'{"a": 1}'), {'a': 1})
+        self.assertEqual(codec.load_response(Response(200, {'a': 1})), {'a': 1})
+
+    def test_set_codec(self):
+        json_codec.set_codec('auto')
+        self.assertTrue(json_codec.get_codec().is_available())
+
+        codec = json_codec.JSONCodec()
+        json_codec.set_codec(codec)
+        self.assertIs(json_codec.get_codec(), codec)
+
+        with self.assertRaises(SyncanoValueError):
+            json_codec.set_codec('unknown')
+
+    def test_fast_codecs(self):
+        for codec_class in (json_codec.OrjsonCodec, json_codec.RapidjsonCodec, json_codec.UjsonCodec):
+            if not codec_class.is_available():
+                continue
+
+            codec = codec_class()
+            value = {'a': [1, 2.5, None, True], 'b': u'ż/'}
+            self.assertEqual(codec.loads(codec.dumps(value)), value)
+            self.assertEqual(codec.loads(codec.dumps(value).encode('utf-8')), value)
+            self.assertEqual(codec.load_response(Response(200, value)), value)
+            with self.assertRaises(ValueError):
+                codec.loads('invalid')
+
+    def test_connection(self):
+        codec = mock.MagicMock(spec=json_codec.JSONCodec, wraps=json_codec.JSONCodec())
+        json_codec.set_codec(codec)
+        handler = mock.MagicMock(return_value=(200, {'id': 1}))
+        connection = Connection(api_key='test', transport=InMemoryTransport(handler))
+
+        self.assertEqual(connection.request('POST', 'test', data={'a': 1}), {'id': 1})
+        codec.dumps.assert_called_once_with({'a': 1})
+        self.assertTrue(codec.load_response.called)
+
+
+class PageParserTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.page = {
+            'next': '/v1.1/instances/?page_size=2',
+            'objects': [{'name': u'test-ż', 'stats': [1, 2.5, None]}, {'name': 'test-two', 'size': 12345}],
+            'prev': None,
+        }
+        self.body = json_codec.JSONCodec().dumps(self.page).encode('utf-8')
+
+    def chunks(self, size):
+        return [self.body[i:i + size] for i in range(0, len(self.body), size)]
+
+    def test_chunks(self):
+        for size in (1, 3, 16, len(self.body)):
+            parser = json_codec.PageParser(self.chunks(size))
+            self.assertEqual(list(parser), self.page['objects'])
+            self.assertEqual(parser.fields, {'next': self.page['next'], 'prev': None})
+
+    def test_incremental(self):
+        chunks = iter(self.chunks(8))
+        parser = iter(json_codec.PageParser(chunks))
+        self.assertEqual(next(parser), self.page['objects'][0])
+        self.assertTrue(list(chunks))
+
+    def test_empty(self):
+        self.assertEqual(list(json_codec.PageParser([b'{}'])), [])
+        self.assertEqual(list(json_codec.PageParser([b'{"objects": [], "next": null}'])), [])
+
+    def test_nested_values(self):
+        self.page['objects'] = [
+            {'text': u'"quoted" \\ {braces} [brackets] ż', 'nested': {'list': [[1, {'a': -1.5e3}], []], 'flag': True}},
+            u'string \\"',
+            12345,
+            None,
+        ]
+        self.body = json_codec.JSONCodec().dumps(self.page).encode('utf-8')
+        for size in (1, 2, 5, len(self.body)):
+            self.assertEqual(list(json_codec.PageParser(self.chunks(size))), self.page['objects'])
+
+        # a number can end with the page
+        parser = json_codec.PageParser([b'{"objects": [], "count": 1', b'2'])
+        with self.assertRaises(ValueError):
+            list(parser)
+        self.assertEqual(parser.fields, {'count': 12})
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            list(json_codec.PageParser([b'{"objects": [{"a": 1},']))
+        with self.assertRaises(ValueError):
+            list(json_codec.PageParser([b'[1, 2]']))
+        with self.assertRaises(ValueError):
+            list(json_codec.PageParser([b'{"objects": [{"a": "b}']))
+        with self.assertRaises(ValueError):
+            list(json_codec.PageParser([b'{"objects": [12a, 3]}']))
@@ -2,8 +2,11 @@ import json
 import unittest
 from datetime import datetime
 
+from syncano.concurrency import ConcurrencyRegistry
+from syncano.connection import Connection
 from syncano.exceptions import SyncanoDoesNotExist, SyncanoRequestError, SyncanoValueError
 from syncano.models import Instance, Object, Script, ScriptEndpoint, ScriptEndpointTrace, ScriptTrace, User, registry
+from syncano.transports import InMemoryTransport
 
 try:
     from unittest import mock
@@ -89,6 +92,153 @@ class ManagerTestCase(unittest.TestCase):
         self.assertEqual(update_mock.call_count, 1)
         self.assertEqual(create_mock.call_count, 1)
 
+    def test_chunked_batch(self):
+        registry.set_used_instance('test-one')
+        handler = mock.MagicMock(side_effect=self._batch_handler)
+        connection = Connection(api_key='test', transport=InMemoryTransport(handler))
+        manager = self.manager.using(connection)
+        requests = [Instance.batch_object(method='DELETE', path='/v1.1/instances/test-{0}/'.format(i), body={})
+                    for i in range(120)]
+
+        response = manager.batch(*requests)
+
+        self.assertEqual(handler.call_count, 3)
+        self.assertEqual(len(response), 120)
+        self.assertEqual(response[7]['content']['path'], '/v1.1/instances/test-7/')
+        self.assertEqual(response[119]['content']['path'], '/v1.1/instances/test-119/')
+        # the failed chunk is reported per request
+        self.assertEqual(response[50], {'code': 400, 'content': {'detail': 'Invalid batch.'}})
+        self.assertEqual(response[99]['code'], 400)
+
+        results = dict(manager.iter_batch(*requests))
+        self.assertEqual(sorted(results), list(range(120)))
+        self.assertEqual(results[100]['content']['path'], '/v1.1/instances/test-100/')
+
+    @staticmethod
+    def _batch_handler(method_name, url, **params):
+        requests = json.loads(params['data'])['requests']
+        if requests[0]['path'] == '/v1.1/instances/test-50/':
+            return 400, {'detail': 'Invalid batch.'}
+        return 200, [{'code': 204, 'content': {'path': request['path']}} for request in requests]
+
+    def test_iter_bulk_create(self):
+        registry.set_used_instance('test-one')
+        handler = mock.MagicMock(side_effect=self._bulk_create_handler)
+        connection = Connection(api_key='test', transport=InMemoryTransport(handler))
+        # objects are saved in batch mode with the default connection
+        patcher = mock.patch.object(registry, '_default_connection', lambda: connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        scripts = [Script(instance_name='test-one', label='script-{0}'.format(i), source='pass', runtime_name='python')
+                   for i in range(120)]
+
+        with mock.patch('syncano.models.manager.Manager._populate_batch_result',
+                        wraps=Script.please._populate_batch_result) as populate_mock:
+            results = Script.please.using(connection).iter_bulk_create(*scripts)
+            index, script = next(results)
+            # results are populated one by one
+            self.assertEqual(populate_mock.call_count, 1)
+            self.assertEqual(script.label, 'script-{0}'.format(index))
+
+            results = dict(results)
+
+        self.assertEqual(handler.call_count, 3)
+        self.assertEqual(len(results), 119)
+        self.assertEqual(results[119].label, 'script-119')
+        self.assertEqual(results[119].instance_name, 'test-one')
+
+    @staticmethod
+    def _bulk_create_handler(method_name, url, **params):
+        requests = json.loads(params['data'])['requests']
+        return 200, [{'code': 201, 'content': {'id': 1, 'label': request['body']['label']}} for request in requests]
+
+    def test_in_bulk(self):
+        registry.set_used_instance('test-one')
+        handler = mock.MagicMock(side_effect=self._in_bulk_handler)
+        connection = Connection(api_key='test', transport=InMemoryTransport(handler))
+        manager = self.manager.using(connection)
+        names = ['test-{0}'.format(i) for i in range(120)]
+
+        response = manager.in_bulk(names + ['test-1'])
+
+        self.assertEqual(handler.call_count, 3)
+        self.assertEqual(list(response.keys()), names)
+        self.assertIsInstance(response['test-1'], Instance)
+        self.assertEqual(response['test-1'].name, 'test-1')
+        self.assertEqual(response['test-7']['code'], 404)
+        self.assertEqual(response['test-9']['code'], 429)
+        self.assertEqual(len(response.found), 106)
+        self.assertEqual(set(response.missing), set('test-{0}'.format(i) for i in range(7, 120, 10)))
+        self.assertEqual(set(response.failed), {'test-9', 'test-119'})
+
+        response = manager.in_bulk(['test-1'], raw=True)
+        self.assertEqual(response, {'test-1': {'name': 'test-1'}})
+
+    @staticmethod
+    def _in_bulk_handler(method_name, url, **params):
+        requests = json.loads(params['data'])['requests']
+        response = []
+        for request in requests:
+            name = request['path'].split('/')[-2]
+            if name.endswith('7'):
+                response.append({'code': 404, 'content': {'detail': 'Not found.'}})
+            elif name in ('test-9', 'test-119'):
+                response.append({'code': 429, 'content': {'detail': 'Request was throttled.'}})
+            else:
+                response.append({'code': 200, 'content': {'name': name}})
+        return 200, response
+
+    def test_fetch_many(self):
+        registry.set_used_instance('test-one')
+        handler = mock.MagicMock(side_effect=self._fetch_many_handler)
+        connection = Connection(api_key='test', transport=InMemoryTransport(handler))
+
+        scripts, other_scripts, traces = registry.fetch_many(
+            Script.please.using(connection).list(instance_name='shop'),
+            Script.please.using(connection).list(instance_name='shop').page_size(10),
+            ScriptTrace.please.using(connection).list(instance_name='shop', script_id=404),
+        )
+
+        self.assertEqual(handler.call_count, 1)
+        # the batch is sent to the instance of the managers, not the default one
+        self.assertTrue(handler.call_args[0][1].endswith('/v1.1/instances/shop/batch/'))
+        requests = json.loads(handler.call_args[1]['data'])['requests']
+        self.assertEqual(requests[0], {'method': 'GET', 'path': '/v1.1/instances/shop/snippets/scripts/'})
+        self.assertEqual(requests[1], {'method': 'GET', 'path': '/v1.1/instances/shop/snippets/scripts/?page_size=10'})
+        self.assertEqual(traces['code'], 404)
+
+        self.assertEqual([script.id for script in other_scripts], [3])
+        self.assertEqual(handler.call_count, 1)
+        # the next page is fetched while iterating
+        self.assertEqual([script.id for script in scripts], [1, 2])
+        self.assertEqual(handler.call_count, 2)
+
+        # clones don't reuse the fetched first page
+        self.assertEqual([script.id for script in other_scripts.page_size(5)], [2])
+        self.assertEqual(handler.call_count, 3)
+
+        with self.assertRaises(SyncanoValueError):
+            registry.fetch_many(Script.please.using(connection).list().template('objects'))
+
+        with self.assertRaises(SyncanoValueError):
+            registry.fetch_many(
+                Script.please.using(connection).list(instance_name='shop'),
+                Script.please.using(connection).list(instance_name='other'),
+            )
+        self.assertEqual(handler.call_count, 3)
+
+    @staticmethod
+    def _fetch_many_handler(method_name, url, **params):
+        if method_name == 'GET':
+            return 200, {'objects': [{'id': 2}], 'next': None}
+
+        requests = json.loads(params['data'])['requests']
+        return 200, [
+            {'code': 200, 'content': {'objects': [{'id': 1}], 'next': '/v1.1/instances/shop/snippets/scripts/?p'}},
+            {'code': 200, 'content': {'objects': [{'id': 3}], 'next': None}},
+            {'code': 404, 'content': {'detail': 'Not found.'}},
+        ][:len(requests)]
+
     @mock.patch('syncano.models.archetypes.Model.batch_object')
     def test_batch_object(self, batch_mock):
         self.assertFalse(batch_mock.called)
@@ -445,6 +595,78 @@ class ManagerTestCase(unittest.TestCase):
         with self.assertRaises(SyncanoDoesNotExist):
             self.manager.request()
 
+    def test_stream(self):
+        pages = {
+            'https://api.syncano.io/v1.1/instances/': {
+                'objects': [{'name': 'test-one'}, {'name': 'test-two'}],
+                'next': '/v1.1/instances/?page=2',
+            },
+            'https://api.syncano.io/v1.1/instances/?page=2': {
+                'objects': [{'name': 'test-three'}],
+                'next': None,
+            },
+        }
+        handler = mock.MagicMock(side_effect=lambda method_name, url, **params: (200, pages[url]))
+
+        connection = Connection(api_key='test', transport=InMemoryTransport(handler))
+        manager = self.manager.using(connection).stream(chunk_size=16)
+
+        self.assertEqual([i.name for i in manager.all()], ['test-one', 'test-two', 'test-three'])
+        self.assertTrue(handler.call_args[1]['stream'])
+        self.assertEqual([i.name for i in manager.all().limit(2)], ['test-one', 'test-two'])
+
+        with self.assertRaises(SyncanoValueError):
+            self.manager.stream(chunk_size=0)
+
+    def test_prefetch(self):
+        pages = {
+            'https://api.syncano.io/v1.1/instances/': {
+                'objects': [{'name': 'test-one'}, {'name': 'test-two'}],
+                'next': '/v1.1/instances/?page=2',
+            },
+            'https://api.syncano.io/v1.1/instances/?page=2': {
+                'objects': [{'name': 'test-three'}],
+                'next': '/v1.1/instances/?page=3',
+            },
+            'https://api.syncano.io/v1.1/instances/?page=3': {
+                'objects': [{'name': 'test-four'}],
+                'next': None,
+            },
+        }
+        handler = mock.MagicMock(side_effect=lambda method_name, url, **params: (200, pages[url]))
+
+        connection = Connection(api_key='test', transport=InMemoryTransport(handler), concurrency=ConcurrencyRegistry())
+        manager = self.manager.using(connection).prefetch(pages=2)
+
+        self.assertEqual([i.name for i in manager.all()], ['test-one', 'test-two', 'test-three', 'test-four'])
+        self.assertEqual(handler.call_count, 3)
+        # pages are requested within slots of the concurrency controller
+        self.assertIsNotNone(connection.get_concurrency_controller(None).latency)
+
+        # the page past the limit is not requested
+        handler.reset_mock()
+        self.assertEqual([i.name for i in manager.all().limit(3)], ['test-one', 'test-two', 'test-three'])
+        self.assertEqual(handler.call_count, 2)
+
+        handler.side_effect = lambda method_name, url, **params: (500, {'detail': 'Server error.'})
+        with self.assertRaises(SyncanoRequestError):
+            list(manager.all())
+
+        with self.assertRaises(SyncanoValueError):
+            self.manager.prefetch(pages=0)
+
+    @mock.patch('syncano.models.manager.Manager.connection')
+    def test_request_cache_ttl(self, connection_mock):
+        request_mock = connection_mock.request
+        request_mock.return_value = {'next': 'url'}
+
+        with mock.patch.object(self.model._meta, 'cache_ttl', 600):
+            self.manager.request()
+            self.assertEqual(request_mock.call_args[1]['cache_ttl'], 600)
+
+            self.manager.request(method='POST')
+            self.assertNotIn('cache_ttl', request_mock.call_args[1])
+
         request_mock.side_effect = SyncanoRequestError(status_code=500, reason='404')
         with self.assertRaises(SyncanoRequestError):
             self.manager.request()
@@ -598,6 +820,48 @@ class ObjectManagerTestCase(unittest.TestCase):
         self.assertTrue(get_subclass_model_mock.called)
         get_subclass_model_mock.assert_called_once_with(instance_name='test', class_name='test')
 
+    @mock.patch('syncano.models.Object.get_subclass_model', return_value=mock.Mock)
+    def test_parallel_scan(self, get_subclass_model_mock):
+        ids = [1, 2, 5, 7, 8, 13, 21, 22, 30]
+
+        def handler(method_name, url, **params):
+            query = params['params']
+            if query.get('page_size') == 1:
+                return 200, {'objects': [{'id': min(ids) if query['order_by'] == 'id' else max(ids)}], 'next': None}
+
+            bounds = json.loads(query['query'])['id']
+            self.assertEqual(bounds['_gt'], 0)
+            after = int(url.split('after=')[1]) if 'after=' in url else 0
+            objects = [{'id': i} for i in ids if bounds['_gte'] <= i < bounds['_lt'] and i > after][:2]
+            next_url = '{0}?after={1}'.format(url.split('?')[0], objects[-1]['id']) if objects else None
+            return 200, {'objects': objects, 'next': next_url}
+
+        connection = Connection(api_key='test', transport=InMemoryTransport(handler))
+        manager = self.manager.list(instance_name='test', class_name='test').using(connection)
+        manager.query['query'] = json.dumps({'id': {'_gt': 0}})
+
+        self.assertEqual([o.id for o in manager.parallel_scan(shards=4, ordered=True)], ids)
+        self.assertEqual(sorted(o.id for o in manager.parallel_scan(shards=3)), ids)
+        self.assertEqual(len(list(manager.limit(4).parallel_scan(shards=3, ordered=True))), 4)
+
+        with self.assertRaises(SyncanoValueError):
+            list(manager.parallel_scan(shards=0))
+
+    @mock.patch('syncano.models.Object.get_subclass_model', return_value=mock.Mock)
+    def test_parallel_scan_errors(self, get_subclass_model_mock):
+        handler = mock.MagicMock(return_value=(200, {'objects': [], 'next': None}))
+        connection = Connection(api_key='test', transport=InMemoryTransport(handler))
+        manager = self.manager.list(instance_name='test', class_name='test').using(connection)
+
+        self.assertEqual(list(manager.parallel_scan()), [])
+        self.assertEqual(handler.call_count, 1)
+
+        handler.side_effect = [(200, {'objects': [{'id': 1}], 'next': None}),
+                               (200, {'objects': [{'id': 100}], 'next': None})] + \
+            [(400, {'detail': 'Bad request.'})] * 4
+        with self.assertRaises(SyncanoRequestError):
+            list(manager.parallel_scan())
+
     @mock.patch('syncano.models.manager.ObjectManager._clone')
     @mock.patch('syncano.models.Object.get_subclass_model')
     def test_filter(self, get_subclass_model_mock, clone_mock):
@@ -651,21 +915,65 @@ class ObjectManagerTestCase(unittest.TestCase):
             self.model
         )
 
-    @mock.patch('syncano.models.manager.Manager.request')
-    @mock.patch('syncano.models.manager.ObjectManager.serialize')
-    @mock.patch('syncano.models.manager.Manager.iterator')
-    def test_update_with_filter(self, iterator_mock, serialize_mock, request_mock):
-        iterator_mock.return_value = [Object(class_name='test', instance_name='test')]
-        serialize_mock.return_value = serialize_mock
-        self.assertFalse(serialize_mock.called)
+    def _get_bulk_manager(self, handler):
+        # batch requests are sent to the instance of the manager, not the default one
+        registry.set_used_instance('other')
+        self.addCleanup(registry.clear_used_instance)
+        model = Object.create_subclass('BulkTestObject', [{'name': 'title', 'type': 'string'}])
+        patcher = mock.patch('syncano.models.Object.get_subclass_model', return_value=model)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
-        self.model.please.list(class_name='test', instance_name='test').filter(id=20).update(channel=1, revision=None)
+        connection = Connection(api_key='test', transport=InMemoryTransport(handler))
+        manager = self.model.please.list(class_name='test', instance_name='test').using(connection)
+        return manager.filter(id__gte=1)
 
-        self.assertTrue(serialize_mock.called)
-        serialize_mock.assert_called_once_with(
-            {'channel': 1, 'revision': None},
-            self.model
-        )
+    @staticmethod
+    def _bulk_handler(method_name, url, **params):
+        if method_name == 'GET':
+            assert params['params']['fields'] == 'id'
+            return 200, {'objects': [{'id': 1}, {'id': 2}, {'id': 3}], 'next': None}
+
+        requests = json.loads(params['data'])['requests']
+        return 200, [{'code': 404 if request['path'].endswith('/3/') else request.get('code', 200),
+                      'content': {'detail': 'Not found.'}} for request in requests]
+
+    def test_update_with_filter(self):
+        handler = mock.MagicMock(side_effect=self._bulk_handler)
+        manager = self._get_bulk_manager(handler)
+
+        result = manager.update(title='test')
+
+        self.assertEqual(result, {'updated': 2, 'failed': {3: {'code': 404, 'content': {'detail': 'Not found.'}}}})
+        self.assertTrue(handler.call_args[0][1].endswith('/v1.1/instances/test/batch/'))
+        requests = json.loads(handler.call_args[1]['data'])['requests']
+        self.assertEqual(requests[0], {'method': 'PATCH', 'path': '/v1.1/instances/test/classes/test/objects/1/',
+                                       'body': {'title': 'test'}})
+
+        # batch mode returns a request per matching object
+        self.assertEqual(len(manager.as_batch().update(title='test')), 3)
+
+        with self.assertRaises(SyncanoValueError):
+            manager.update(unknown_field=1)
+
+        # a mass update needs an explicit filter
+        call_count = handler.call_count
+        with self.assertRaises(SyncanoValueError):
+            self.model.please.list(class_name='test', instance_name='test').using(manager.connection).page_size(
+                10).update(title='test')
+        self.assertEqual(handler.call_count, call_count)
+
+    def test_delete_with_filter(self):
+        handler = mock.MagicMock(side_effect=self._bulk_handler)
+        manager = self._get_bulk_manager(handler)
+
+        result = manager.delete()
+
+        self.assertEqual(result['deleted'], 2)
+        self.assertEqual(list(result['failed']), [3])
+        requests = json.loads(handler.call_args[1]['data'])['requests']
+        self.assertEqual([request['method'] for request in requests], ['DELETE'] * 3)
+        self.assertTrue(handler.call_args[0][1].endswith('/v1.1/instances/test/batch/'))
 
 
 # TODO
@@ -1,7 +1,9 @@
 import unittest
 
+from syncano.connection import Connection
 from syncano.exceptions import SyncanoValidationError
 from syncano.models import Instance, registry
+from syncano.transports import InMemoryTransport
 
 try:
     from unittest import mock
@@ -129,27 +131,55 @@ class ModelTestCase(unittest.TestCase):
     def test_reload(self, connection_mock):
         model = Instance(name='test', links={'self': '/v1.1/instances/test/'})
         connection_mock.return_value = connection_mock
-        connection_mock.request.return_value = {
+        connection_mock.conditional_request.return_value = ({
             'name': 'new_one',
             'description': 'dummy desc'
-        }
+        }, None)
 
         self.assertFalse(connection_mock.called)
-        self.assertFalse(connection_mock.request.called)
+        self.assertFalse(connection_mock.conditional_request.called)
         self.assertIsNone(model.description)
         model.reload()
         self.assertTrue(connection_mock.called)
-        self.assertTrue(connection_mock.request.called)
+        self.assertTrue(connection_mock.conditional_request.called)
         self.assertEqual(model.name, 'new_one')
         self.assertEqual(model.description, 'dummy desc')
 
         connection_mock.assert_called_once_with()
-        connection_mock.request.assert_called_once_with('GET', '/v1.1/instances/test/')
+        connection_mock.conditional_request.assert_called_once_with('/v1.1/instances/test/', etag=None)
 
         model = Instance()
         with self.assertRaises(SyncanoValidationError):
             model.delete()
 
+    def test_conditional_reload(self):
+        handler = mock.MagicMock(return_value=(200, {'name': 'test', 'description': 'one'}, {'etag': '"1"'}))
+        connection = Connection(api_key='test', transport=InMemoryTransport(handler))
+        model = Instance(name='test', links={'self': '/v1.1/instances/test/'})
+
+        model.reload(connection=connection)
+        self.assertEqual(model.description, 'one')
+        self.assertNotIn('If-None-Match', handler.call_args[1]['headers'])
+
+        handler.return_value = (304, '')
+        with mock.patch.object(model, 'to_python') as to_python_mock:
+            model.reload(connection=connection)
+            self.assertFalse(to_python_mock.called)
+        self.assertEqual(handler.call_args[1]['headers']['If-None-Match'], '"1"')
+
+        # local changes are discarded by reload
+        model.description = 'changed'
+        handler.return_value = (200, {'name': 'test', 'description': 'one', 'metadata': {'a': 1}}, {'etag': '"1"'})
+        model.reload(connection=connection)
+        self.assertNotIn('If-None-Match', handler.call_args[1]['headers'])
+        self.assertEqual(model.description, 'one')
+
+        # in-place changes too
+        model.metadata['a'] = 999
+        model.reload(connection=connection)
+        self.assertNotIn('If-None-Match', handler.call_args[1]['headers'])
+        self.assertEqual(model.metadata, {'a': 1})
+
     def test_validation(self):
         # More validation tests is present in test_fields.py
         Instance(name='test').validate()
@@ -0,0 +1,127 @@
+import io
+import os
+import tempfile
+import unittest
+
+from syncano.connection import Connection
+from syncano.multipart import MultipartEncoder, encode_field
+from syncano.throttling import ThrottleCoordinator
+from syncano.transports import InMemoryTransport
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+class MultipartEncoderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix='.png')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b'x' * 10000)
+        self.file = open(self.filename, 'rb')
+
+    def tearDown(self):
+        self.file.close()
+        os.remove(self.filename)
+
+    def test_encode_field(self):
+        self.assertEqual(encode_field(True), 'true')
+        self.assertEqual(encode_field(10), '10')
+        self.assertEqual(encode_field({'a': [1]}), '{"a": [1]}')
+
+    def test_body(self):
+        encoder = MultipartEncoder({'name': 'test', 'skipped': None}, {'logo': self.file}, boundary='b')
+        body = encoder.read()
+
+        self.assertEqual(encoder.content_type, 'multipart/form-data; boundary=b')
+        self.assertEqual(len(body), len(encoder))
+        self.assertTrue(body.startswith(b'--b\r\nContent-Disposition: form-data; name="name"\r\n\r\ntest\r\n'))
+        self.assertIn('name="logo"; filename="{0}"'.format(os.path.basename(self.filename)).encode('utf-8'), body)
+        self.assertIn(b'\r\n\r\n' + b'x' * 10000 + b'\r\n', body)
+        self.assertTrue(body.endswith(b'--b--\r\n'))
+        self.assertNotIn(b'skipped', body)
+
+    def test_chunked_read(self):
+        encoder = MultipartEncoder({}, {'logo': self.file}, chunk_size=1024)
+        with mock.patch.object(self.file, 'read', wraps=self.file.read) as read_mock:
+            chunks = list(iter(lambda: encoder.read(4096), b''))
+
+        self.assertEqual(sum(len(chunk) for chunk in chunks), len(encoder))
+        self.assertTrue(all(call[0][0] <= 1024 for call in read_mock.call_args_list))
+
+    def test_tuple_and_non_seekable_file(self):
+        stream = mock.Mock(spec=['read'])
+        stream.read.return_value = b'certificate'
+        encoder = MultipartEncoder({}, {'cert': ('cert.p12', stream, 'application/x-pkcs12', {'Expires': '0'})})
+        body = encoder.read()
+
+        self.assertEqual(len(body), len(encoder))
+        self.assertIn(b'filename="cert.p12"\r\nContent-Type: application/x-pkcs12\r\nExpires: 0\r\n\r\n'
+                      b'certificate\r\n', body)
+
+    def test_reset(self):
+        encoder = MultipartEncoder({'name': 'test'}, {'logo': io.BytesIO(b'data')})
+        body = encoder.read()
+        self.assertEqual(encoder.read(), b'')
+
+        encoder.reset()
+        self.assertEqual(encoder.read(), body)
+        self.assertEqual(b''.join(encoder), body)
+
+
+class ConnectionMultipartTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = mock.MagicMock(return_value=(201, {'id': 1}))
+        self.connection = Connection(api_key='test', transport=InMemoryTransport(self.handler),
+                                     multipart_uploads=True)
+
+    def test_single_request(self):
+        content = self.connection.request('POST', 'test', data={'name': 'test', 'logo': io.BytesIO(b'data')})
+
+        self.assertEqual(content, {'id': 1})
+        self.assertEqual(self.handler.call_count, 1)
+        method, url = self.handler.call_args[0]
+        kwargs = self.handler.call_args[1]
+        self.assertEqual(method, 'POST')
+        self.assertTrue(kwargs['headers']['content-type'].startswith('multipart/form-data; boundary='))
+
+        body = kwargs['data'].read()
+        self.assertEqual(kwargs['headers']['content-length'], str(len(body)))
+        self.assertIn(b'name="name"\r\n\r\ntest\r\n', body)
+        self.assertIn(b'\r\n\r\ndata\r\n', body)
+
+    def test_apns_certificates(self):
+        certificate = io.BytesIO(b'certificate')
+        certificate.name = 'cert.p12'
+        self.connection.request('PATCH', 'test', data={'production_certificate': certificate,
+                                                       'development_certificate': True})
+
+        body = self.handler.call_args[1]['data'].read()
+        self.assertIn(b'filename="cert.p12"\r\nContent-Type: application/x-pkcs12', body)
+        self.assertNotIn(b'name="development_certificate"; filename', body)
+
+    def test_retry_rewinds_body(self):
+        bodies = []
+
+        def handler(method_name, url, **params):
+            bodies.append(params['data'].read())
+            return (429, {}) if len(bodies) == 1 else (201, {'id': 1})
+
+        self.connection.transport = InMemoryTransport(handler)
+        self.connection.throttle = ThrottleCoordinator(jitter=0)
+        with mock.patch('syncano.throttling.time.sleep'):
+            self.connection.request('POST', 'test', data={'logo': io.BytesIO(b'data')})
+
+        self.assertEqual(len(bodies), 2)
+        self.assertEqual(bodies[0], bodies[1])
+
+    def test_override(self):
+        self.connection.request('POST', 'test', data={'logo': io.BytesIO(b'data')}, multipart=False)
+        self.assertEqual(self.handler.call_count, 2)
+
+        # requests without files are sent as JSON
+        self.connection.request('POST', 'test', data={'name': 'test'})
+        self.assertEqual(self.handler.call_args[1]['data'], '{"name": "test"}')
@@ -0,0 +1,194 @@
+import shutil
+import tempfile
+import unittest
+
+from syncano.connection import Connection
+from syncano.exceptions import SyncanoRequestError, SyncanoValueError
+from syncano.throttling import (
+    BULK,
+    INTERACTIVE,
+    FileThrottleStore,
+    RateLimiter,
+    ThrottleCoordinator,
+    get_priority,
+    priority
+)
+from syncano.transports import InMemoryTransport
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+@mock.patch('syncano.throttling.time.time', mock.MagicMock(return_value=100.0))
+class ThrottleCoordinatorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.throttle = ThrottleCoordinator(release_interval=0.5, jitter=0)
+
+    def test_not_throttled(self):
+        self.assertEqual(self.throttle.reserve('key'), 0)
+        self.assertEqual(self.throttle.reserve('key'), 0)
+
+    def test_gradual_release(self):
+        self.throttle.throttled('key', 2)
+
+        self.assertEqual(self.throttle.reserve('key'), 2)
+        self.assertEqual(self.throttle.reserve('key'), 2.5)
+        self.assertEqual(self.throttle.reserve('key'), 3)
+        self.assertEqual(self.throttle.reserve('other_key'), 0)
+
+    def test_shorter_pause_is_ignored(self):
+        self.throttle.throttled('key', 2)
+        self.throttle.throttled('key', 1)
+        self.assertEqual(self.throttle.reserve('key'), 2)
+
+    def test_jitter(self):
+        self.throttle.jitter = 0.1
+        self.throttle.throttled('key', 2)
+        delay = self.throttle.reserve('key')
+        self.assertTrue(2 <= delay <= 2.1)
+
+    @mock.patch('syncano.throttling.time.sleep')
+    def test_wait(self, sleep_mock):
+        self.throttle.wait('key')
+        self.assertFalse(sleep_mock.called)
+
+        self.throttle.throttled('key', 1)
+        self.throttle.wait('key')
+        sleep_mock.assert_called_once_with(1)
+
+
+@mock.patch('syncano.throttling.time.time', mock.MagicMock(return_value=100.0))
+class FileThrottleStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_shared_state(self):
+        throttle = ThrottleCoordinator(store=FileThrottleStore(self.path), release_interval=0.5, jitter=0)
+        other_throttle = ThrottleCoordinator(store=FileThrottleStore(self.path), release_interval=0.5, jitter=0)
+
+        self.assertEqual(other_throttle.reserve('key'), 0)
+        throttle.throttled('key', 2)
+
+        self.assertEqual(other_throttle.reserve('key'), 2)
+        self.assertEqual(throttle.reserve('key'), 2.5)
+        self.assertEqual(throttle.reserve('other_key'), 0)
+
+
+class ConnectionThrottlingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = mock.MagicMock(return_value=(429, {'detail': 'Too many requests.'}, {'retry-after': '3'}))
+        self.throttle = ThrottleCoordinator(max_retries=2)
+        self.connection = Connection(api_key='test', transport=InMemoryTransport(self.handler),
+                                     throttle=self.throttle)
+
+    @mock.patch('syncano.throttling.time.sleep')
+    def test_retry_budget(self, sleep_mock):
+        with self.assertRaises(SyncanoRequestError) as cm:
+            self.connection.request('GET', 'test')
+
+        self.assertEqual(cm.exception.status_code, 429)
+        self.assertEqual(self.handler.call_count, 3)
+        self.assertEqual(sleep_mock.call_count, 2)
+
+    @mock.patch('syncano.throttling.time.sleep')
+    def test_pause_is_shared(self, sleep_mock):
+        self.handler.side_effect = [
+            (429, '', {'retry-after': '3'}),
+            (200, {'id': 1}),
+            (200, {'id': 2}),
+        ]
+        other_connection = Connection(api_key='test', transport=InMemoryTransport(self.handler),
+                                      throttle=self.throttle)
+
+        self.assertEqual(self.connection.request('GET', 'test'), {'id': 1})
+        self.assertEqual(sleep_mock.call_count, 1)
+
+        # sleep is mocked, so the key is still paused
+        self.assertEqual(other_connection.request('GET', 'test'), {'id': 2})
+        self.assertEqual(sleep_mock.call_count, 2)
+
+
+class RateLimiterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.limiter = RateLimiter(rate=2, burst=2)
+
+    @mock.patch('syncano.throttling.time.time', mock.MagicMock(return_value=100.0))
+    def test_burst(self):
+        self.assertEqual(self.limiter.reserve('key'), 0)
+        self.assertEqual(self.limiter.reserve('key'), 0)
+        self.assertEqual(self.limiter.reserve('key'), 0.5)
+        self.assertEqual(self.limiter.reserve('key'), 1)
+        self.assertEqual(self.limiter.reserve('other_key'), 0)
+
+    @mock.patch('syncano.throttling.time.time')
+    def test_refill(self, time_mock):
+        time_mock.return_value = 100.0
+        self.limiter.reserve('key')
+        self.limiter.reserve('key')
+
+        time_mock.return_value = 100.5
+        self.assertEqual(self.limiter.reserve('key'), 0)
+        self.assertEqual(self.limiter.reserve('key'), 0.5)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(SyncanoValueError):
+            RateLimiter(rate=0)
+
+    @mock.patch('syncano.throttling.time.time')
+    def test_bulk_leaves_room_for_interactive(self, time_mock):
+        limiter = RateLimiter(rate=10, burst=10, bulk_share=0.5)
+        time_mock.return_value = 100.0
+        for _ in range(10):
+            limiter.reserve('key', BULK)
+
+        # bulk bucket refills at 5 rps while the shared one refills at 10 rps
+        time_mock.return_value = 101.0
+        self.assertEqual(limiter.reserve('key', BULK), 0)
+        for _ in range(4):
+            limiter.reserve('key', BULK)
+        self.assertGreater(limiter.reserve('key', BULK), 0)
+        self.assertEqual(limiter.reserve('key', INTERACTIVE), 0)
+
+    @mock.patch('syncano.throttling.time.time', mock.MagicMock(return_value=100.0))
+    def test_priority_context(self):
+        limiter = RateLimiter(rate=10, burst=10, bulk_share=0.1)
+        self.assertEqual(get_priority(), INTERACTIVE)
+
+        with priority(BULK):
+            self.assertEqual(get_priority(), BULK)
+            limiter.reserve('key')
+        self.assertEqual(get_priority(), INTERACTIVE)
+
+        self.assertIn(('key', BULK), limiter._buckets)
+
+
+class ConnectionRateLimitTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = mock.MagicMock(return_value=(200, {'id': 1}))
+        self.limiter = mock.MagicMock(wraps=RateLimiter(rate=1))
+        self.connection = Connection(api_key='test', transport=InMemoryTransport(self.handler),
+                                     throttle=ThrottleCoordinator(), rate_limiter=self.limiter)
+
+    def test_request(self):
+        self.connection.request('GET', 'v1.1/instances/test-one/classes/', priority=BULK)
+        self.limiter.wait.assert_called_once_with('test:test-one', BULK)
+        self.assertNotIn('priority', self.handler.call_args[1])
+
+    @mock.patch('syncano.throttling.time.sleep')
+    def test_limit(self, sleep_mock):
+        self.connection.request('GET', 'v1.1/instances/test-one/')
+        self.connection.request('GET', 'v1.1/instances/test-two/')
+        self.assertFalse(sleep_mock.called)
+
+        self.connection.request('GET', 'v1.1/instances/test-one/')
+        self.assertTrue(sleep_mock.called)
@@ -0,0 +1,190 @@
+import json
+import unittest
+
+from syncano.connection import Connection
+from syncano.exceptions import SyncanoRequestError, SyncanoValueError
+from syncano.transports import InMemoryTransport, RequestsTransport, Response, Urllib3Transport
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+
+class ResponseTestCase(unittest.TestCase):
+
+    def test_json_content(self):
+        response = Response(200, {'a': 1})
+        self.assertEqual(response.content, b'{"a": 1}')
+        self.assertEqual(response.json(), {'a': 1})
+
+    def test_text_content(self):
+        response = Response(400, u'Bad request')
+        self.assertEqual(response.text, u'Bad request')
+        with self.assertRaises(ValueError):
+            response.json()
+
+
+class RequestsTransportTestCase(unittest.TestCase):
+
+    @mock.patch('requests.Session.get')
+    def test_request(self, get_mock):
+        transport = RequestsTransport()
+        transport.request('GET', 'http://localhost/test/', timeout=1)
+        get_mock.assert_called_once_with('http://localhost/test/', timeout=1)
+
+    def test_connection_session(self):
+        connection = Connection()
+        self.assertIsInstance(connection.transport, RequestsTransport)
+        self.assertEqual(connection.session, connection.transport.session)
+
+    def test_pool_options(self):
+        connection = Connection(pool_connections=2, pool_maxsize=20, pool_block=True, keep_alive=False)
+        adapter = connection.session.get_adapter('https://api.syncano.io/')
+
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 20)
+        self.assertTrue(adapter._pool_block)
+        self.assertEqual(connection.session.headers['Connection'], 'close')
+
+    def test_pool_stats(self):
+        connection = Connection(pool_maxsize=4)
+        self.assertEqual(connection.pool_stats(), [])
+
+        adapter = connection.session.get_adapter('https://api.syncano.io/')
+        pool = adapter.poolmanager.connection_from_url('https://api.syncano.io/')
+        conn = pool._get_conn()
+
+        stats = connection.pool_stats()
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]['host'], 'api.syncano.io')
+        self.assertEqual(stats[0]['maxsize'], 4)
+        self.assertEqual(stats[0]['in_use'], 1)
+        self.assertEqual(stats[0]['utilisation'], 0.25)
+
+        pool._put_conn(conn)
+        self.assertEqual(connection.pool_stats()[0]['in_use'], 0)
+
+    @mock.patch('syncano.transports.time.time')
+    @mock.patch('requests.Session.get')
+    def test_idle_timeout(self, get_mock, time_mock):
+        transport = RequestsTransport(idle_timeout=10)
+
+        with mock.patch.object(transport, 'clear_pools') as clear_mock:
+            time_mock.return_value = 100
+            transport.request('GET', 'http://localhost/test/')
+            time_mock.return_value = 105
+            transport.request('GET', 'http://localhost/test/')
+            self.assertFalse(clear_mock.called)
+
+            time_mock.return_value = 120
+            transport.request('GET', 'http://localhost/test/')
+            self.assertTrue(clear_mock.called)
+
+
+class Urllib3TransportTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = Urllib3Transport()
+        self.pool_mock = mock.MagicMock()
+        self.pool_mock.urlopen.return_value = mock.MagicMock(status=200, data=b'{"a": 1}', headers={})
+        self.transport._pools = {True: self.pool_mock, False: self.pool_mock}
+
+    def test_request(self):
+        response = self.transport.request('post', 'http://localhost/test/', data='{}', timeout=5,
+                                          headers={'content-type': 'application/json'},
+                                          params={'page_size': 10, 'room': None})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'a': 1})
+        self.pool_mock.urlopen.assert_called_once_with(
+            'POST', 'http://localhost/test/?page_size=10', body='{}',
+            headers={'content-type': 'application/json'}, timeout=5, retries=False, redirect=True)
+
+    def test_files(self):
+        file_mock = mock.MagicMock()
+        file_mock.name = '/tmp/logo.png'
+        file_mock.read.return_value = b'logo'
+
+        self.transport.request('PATCH', 'http://localhost/test/', files={'logo': file_mock}, headers={})
+
+        kwargs = self.pool_mock.urlopen.call_args[1]
+        self.assertIn(b'filename="logo.png"', kwargs['body'])
+        self.assertTrue(kwargs['headers']['content-type'].startswith('multipart/form-data'))
+
+    def test_get_pool(self):
+        transport = Urllib3Transport(pool_maxsize=2, pool_block=True)
+        self.assertIs(transport.get_pool(True), transport.get_pool(True))
+        self.assertIsNot(transport.get_pool(True), transport.get_pool(False))
+
+        pool = transport.get_pool(True).connection_from_url('https://api.syncano.io/')
+        self.assertEqual(pool.pool.maxsize, 2)
+        self.assertTrue(pool.block)
+
+    def test_stream(self):
+        raw = self.pool_mock.urlopen.return_value
+        raw.stream.return_value = iter([b'{"a"', b': 1}'])
+
+        response = self.transport.request('GET', 'http://localhost/test/', headers={}, stream=True)
+        self.assertEqual(self.pool_mock.urlopen.call_args[1]['preload_content'], False)
+        self.assertEqual(list(response.iter_content(2)), [b'{"a"', b': 1}'])
+        raw.stream.assert_called_once_with(2)
+
+        response.close()
+        self.assertTrue(raw.release_conn.called)
+
+    def test_keep_alive(self):
+        self.transport.keep_alive = False
+        self.transport.request('GET', 'http://localhost/test/', headers={})
+        self.assertEqual(self.pool_mock.urlopen.call_args[1]['headers'], {'Connection': 'close'})
+
+
+class InMemoryTransportTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = mock.MagicMock(return_value=(200, {'name': 'test-one'}))
+        self.connection = Connection(api_key='test', transport=InMemoryTransport(self.handler))
+
+    def test_request(self):
+        content = self.connection.request('POST', 'v1.1/instances/', data={'name': 'test-one'})
+
+        self.assertEqual(content, {'name': 'test-one'})
+        self.assertTrue(self.handler.called)
+        args, kwargs = self.handler.call_args
+        self.assertEqual(args, ('POST', self.connection.build_url('v1.1/instances/')))
+        self.assertEqual(json.loads(kwargs['data']), {'name': 'test-one'})
+        self.assertEqual(kwargs['headers']['Authorization'], 'token test')
+
+    def test_response_instance(self):
+        self.handler.return_value = Response(201, {'name': 'test-one'})
+        self.assertEqual(self.connection.request('GET', 'test'), {'name': 'test-one'})
+
+    def test_error(self):
+        self.handler.return_value = (404, {'detail': 'Not found.'})
+        with self.assertRaises(SyncanoRequestError) as cm:
+            self.connection.request('GET', 'test')
+        self.assertEqual(cm.exception.status_code, 404)
+
+    def test_throttling(self):
+        self.handler.side_effect = [
+            (429, '', {'retry-after': 0}),
+            (200, {'name': 'test-one'}),
+        ]
+        self.assertEqual(self.connection.request('GET', 'test'), {'name': 'test-one'})
+        self.assertEqual(self.handler.call_count, 2)
+
+    def test_stream_request(self):
+        self.handler.return_value = (200, {'objects': []})
+        response = self.connection.stream_request('GET', 'v1.1/instances/')
+
+        self.assertTrue(self.handler.call_args[1]['stream'])
+        self.assertEqual(list(response.iter_content(5)), [b'{"obj', b'ects"', b': []}'])
+
+        self.handler.return_value = (404, {'detail': 'Not found.'})
+        with self.assertRaises(SyncanoRequestError):
+            self.connection.stream_request('GET', 'v1.1/instances/')
+
+    def test_invalid_method_name(self):
+        with self.assertRaises(SyncanoValueError):
+            self.connection.request('INVALID', 'test')
+        self.assertFalse(self.handler.called)